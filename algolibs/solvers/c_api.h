@@ -11,6 +11,13 @@
 #include "maze_graph.h"
 #include "solvers.h"
 
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <memory>
+#include <thread>
+#include <vector>
+
 extern "C" {
 struct CLocation {
     short row;
@@ -49,6 +56,13 @@ struct CSearchStatus {
     bool search_terminated;
 };
 
+struct CSearchInstance {
+    struct CGraph graph;
+    struct CPlayerLocations player_locations;
+    unsigned int objective_id;
+    struct CLocation previous_shift_location;
+};
+
 PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
                                       struct CPlayerLocations* c_player_locations,
                                       unsigned int objective_id,
@@ -57,6 +71,103 @@ PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
 PUBLIC_API void abort_search();
 
 PUBLIC_API struct CSearchStatus get_status();
+
+// Reentrant interface. Each search context holds the abort flag and the status of one search at a time,
+// so searches with different contexts can run concurrently, and abort_search_with_context only affects its own search.
+// The abort flag is never reset: a search with an aborted context returns as soon as possible, even if it was
+// aborted before it started. Hence, a context is meant to be created for each search.
+struct CSearchContext;
+
+PUBLIC_API struct CSearchContext* create_search_context();
+
+PUBLIC_API struct CAction find_action_with_context(struct CSearchContext* c_context,
+                                                   struct CGraph* c_graph,
+                                                   struct CPlayerLocations* c_player_locations,
+                                                   unsigned int objective_id,
+                                                   struct CLocation* c_previous_shift_location);
+
+// Same as find_action_with_context, but the search stops after time_budget_ms milliseconds, as if it was aborted.
+// The deadline only applies to this search, later searches with the same context are not limited.
+// The solvers check the deadline between expansions of game states. Iterative searches return the best action of
+// their deepest completed iteration, exhaustive searches return an error action if they have not reached the objective.
+PUBLIC_API struct CAction find_action_with_time_budget(struct CSearchContext* c_context,
+                                                       struct CGraph* c_graph,
+                                                       struct CPlayerLocations* c_player_locations,
+                                                       unsigned int objective_id,
+                                                       struct CLocation* c_previous_shift_location,
+                                                       unsigned long time_budget_ms);
+
+// Sets the number of threads which the searches with the given context use, 0 for one per hardware thread.
+// By default, a search uses one thread.
+PUBLIC_API void set_search_threads(struct CSearchContext* c_context, unsigned long num_threads);
+
+PUBLIC_API void abort_search_with_context(struct CSearchContext* c_context);
+
+PUBLIC_API struct CSearchStatus get_status_with_context(struct CSearchContext* c_context);
+
+PUBLIC_API void destroy_search_context(struct CSearchContext* c_context);
+
+// Batch interface. Solves num_instances instances on num_threads threads (0 for one thread per hardware thread),
+// and writes the action for instances[i] to actions[i], and its final status to statuses[i] if statuses is not NULL.
+// Each instance is searched with its own search context. If c_batch_context is not NULL, aborting it aborts all
+// running and remaining searches of the batch. Remaining searches return immediately, with error actions for minimax.
+// In contrast to single searches, the abort flag of c_batch_context is reset at the start of each batch,
+// so that a batch context can be reused after an abort.
+PUBLIC_API void find_actions_batch(struct CSearchContext* c_batch_context,
+                                   const struct CSearchInstance* instances,
+                                   unsigned long num_instances,
+                                   unsigned long num_threads,
+                                   struct CAction* actions,
+                                   struct CSearchStatus* statuses);
+
+// Anytime interface of iterative searches, only exported by the minimax libraries.
+// Returns the best action of the deepest search iteration completed so far, which can be queried while the search
+// is running or has been aborted. If no iteration has completed, the action's locations are (-1, -1).
+PUBLIC_API struct CAction get_best_action();
+
+PUBLIC_API struct CAction get_best_action_with_context(struct CSearchContext* c_context);
+}
+
+struct CSearchContext {
+    labyrinth::solvers::SearchContext context;
+};
+
+PUBLIC_API struct CSearchContext* create_search_context() {
+    return new CSearchContext{};
+}
+
+PUBLIC_API struct CAction find_action_with_time_budget(struct CSearchContext* c_context,
+                                                       struct CGraph* c_graph,
+                                                       struct CPlayerLocations* c_player_locations,
+                                                       unsigned int objective_id,
+                                                       struct CLocation* c_previous_shift_location,
+                                                       unsigned long time_budget_ms) {
+    using Clock = labyrinth::solvers::SearchContext::Clock;
+    c_context->context.setDeadline(Clock::now() + std::chrono::milliseconds{time_budget_ms});
+    auto action =
+        find_action_with_context(c_context, c_graph, c_player_locations, objective_id, c_previous_shift_location);
+    c_context->context.clearDeadline();
+    return action;
+}
+
+PUBLIC_API void set_search_threads(struct CSearchContext* c_context, unsigned long num_threads) {
+    if (num_threads == 0) {
+        num_threads = std::max(std::thread::hardware_concurrency(), 1u);
+    }
+    c_context->context.num_threads = num_threads;
+}
+
+PUBLIC_API void abort_search_with_context(struct CSearchContext* c_context) {
+    c_context->context.abort();
+}
+
+PUBLIC_API struct CSearchStatus get_status_with_context(struct CSearchContext* c_context) {
+    struct CSearchStatus search_status = {c_context->context.current_depth, c_context->context.is_terminal};
+    return search_status;
+}
+
+PUBLIC_API void destroy_search_context(struct CSearchContext* c_context) {
+    delete c_context;
 }
 
 labyrinth::Location mapLocation(const struct CLocation& location) noexcept {
@@ -112,8 +223,76 @@ struct CAction actionToCAction(const labyrinth::solvers::PlayerAction& action) {
     return c_action;
 }
 
+void resetSearchStatus(labyrinth::solvers::SearchContext& context) noexcept {
+    context.current_depth = 0;
+    context.is_terminal = false;
+}
+
 struct CAction errorAction() {
     struct CLocation error_location = {-1, -1};
     struct CAction c_action = {error_location, 0, error_location};
     return c_action;
 }
+
+/**
+ * Implements find_actions_batch with the given function, which solves one instance with a given search context.
+ * Worker threads take the next unsolved instance until all are solved. With a batch context, the calling thread
+ * watches it and forwards an abort to the contexts of all instances. Otherwise, the calling thread is a worker as well.
+ */
+template <typename SolveFunction>
+void solveBatch(struct CSearchContext* c_batch_context,
+                const struct CSearchInstance* instances,
+                unsigned long num_instances,
+                unsigned long num_threads,
+                struct CAction* actions,
+                struct CSearchStatus* statuses,
+                SolveFunction solve) {
+    using labyrinth::solvers::SearchContext;
+    if (num_instances == 0) {
+        return;
+    }
+    if (c_batch_context) {
+        c_batch_context->context.is_aborted = false;
+    }
+    if (num_threads == 0) {
+        num_threads = std::max(std::thread::hardware_concurrency(), 1u);
+    }
+    num_threads = std::max(std::min(num_threads, num_instances), 1ul);
+    std::unique_ptr<SearchContext[]> contexts{new SearchContext[num_instances]};
+    std::atomic<unsigned long> next_index{0};
+    std::atomic<unsigned long> num_solved{0};
+    auto work = [&]() {
+        for (auto index = next_index++; index < num_instances; index = next_index++) {
+            auto& context = contexts[index];
+            actions[index] = solve(instances[index], context);
+            if (statuses) {
+                statuses[index] = {context.current_depth, context.is_terminal};
+            }
+            ++num_solved;
+        }
+    };
+    const auto num_additional_threads = c_batch_context ? num_threads : num_threads - 1;
+    std::vector<std::thread> threads;
+    threads.reserve(num_additional_threads);
+    for (unsigned long i = 0; i < num_additional_threads; ++i) {
+        threads.emplace_back(work);
+    }
+    if (c_batch_context) {
+        using namespace std::chrono_literals;
+        bool is_aborted = false;
+        while (num_solved < num_instances && !is_aborted) {
+            std::this_thread::sleep_for(1ms);
+            is_aborted = c_batch_context->context.is_aborted;
+        }
+        if (is_aborted) {
+            for (unsigned long index = 0; index < num_instances; ++index) {
+                contexts[index].abort();
+            }
+        }
+    } else {
+        work();
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+}
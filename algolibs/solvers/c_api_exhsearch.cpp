@@ -2,17 +2,20 @@
 #include "exhsearch.h"
 #include <iostream>
 
-PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
-                                      struct CPlayerLocations* c_player_locations,
-                                      unsigned int objective_id,
-                                      struct CLocation* c_previous_shift_location) {
-    labyrinth::solvers::SolverInstance solver_instance{mapGraph(*c_graph),
-                                                       mapLocationAtIndex(*c_player_locations, 0),
-                                                       labyrinth::Location{-1, -1},
-                                                       objective_id,
-                                                       mapLocation(*c_previous_shift_location)};
-    auto best_actions = labyrinth::solvers::exhsearch::findBestActions(solver_instance);
+namespace {
 
+labyrinth::solvers::SolverInstance createSolverInstance(const struct CGraph* c_graph,
+                                                        const struct CPlayerLocations* c_player_locations,
+                                                        unsigned int objective_id,
+                                                        const struct CLocation* c_previous_shift_location) {
+    return labyrinth::solvers::SolverInstance{mapGraph(*c_graph),
+                                              mapLocationAtIndex(*c_player_locations, 0),
+                                              labyrinth::Location{-1, -1},
+                                              objective_id,
+                                              mapLocation(*c_previous_shift_location)};
+}
+
+struct CAction firstAction(const std::vector<labyrinth::solvers::PlayerAction>& best_actions) {
     if (best_actions.empty()) {
         return errorAction();
     } else {
@@ -20,6 +23,42 @@ PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
     }
 }
 
+} // namespace
+
+PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
+                                      struct CPlayerLocations* c_player_locations,
+                                      unsigned int objective_id,
+                                      struct CLocation* c_previous_shift_location) {
+    auto solver_instance = createSolverInstance(c_graph, c_player_locations, objective_id, c_previous_shift_location);
+    return firstAction(labyrinth::solvers::exhsearch::findBestActions(solver_instance));
+}
+
+PUBLIC_API struct CAction find_action_with_context(struct CSearchContext* c_context,
+                                                   struct CGraph* c_graph,
+                                                   struct CPlayerLocations* c_player_locations,
+                                                   unsigned int objective_id,
+                                                   struct CLocation* c_previous_shift_location) {
+    auto solver_instance = createSolverInstance(c_graph, c_player_locations, objective_id, c_previous_shift_location);
+    resetSearchStatus(c_context->context);
+    return firstAction(labyrinth::solvers::exhsearch::findBestActions(solver_instance, c_context->context));
+}
+
+PUBLIC_API void find_actions_batch(struct CSearchContext* c_batch_context,
+                                   const struct CSearchInstance* instances,
+                                   unsigned long num_instances,
+                                   unsigned long num_threads,
+                                   struct CAction* actions,
+                                   struct CSearchStatus* statuses) {
+    solveBatch(c_batch_context, instances, num_instances, num_threads, actions, statuses,
+               [](const struct CSearchInstance& instance, labyrinth::solvers::SearchContext& context) {
+                   auto solver_instance = createSolverInstance(&instance.graph,
+                                                               &instance.player_locations,
+                                                               instance.objective_id,
+                                                               &instance.previous_shift_location);
+                   return firstAction(labyrinth::solvers::exhsearch::findBestActions(solver_instance, context));
+               });
+}
+
 PUBLIC_API void abort_search() {
     labyrinth::solvers::exhsearch::abortComputation();
 }
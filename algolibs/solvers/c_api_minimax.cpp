@@ -9,28 +9,77 @@
 namespace solvers = labyrinth::solvers;
 namespace mm = solvers::minimax;
 
-PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
-                                      struct CPlayerLocations* c_player_locations,
-                                      unsigned int objective_id,
-                                      struct CLocation* c_previous_shift_location) {
-    solvers::SolverInstance solver_instance{mapGraph(*c_graph),
-                                        mapLocationAtIndex(*c_player_locations, 0),
-                                        mapLocationAtIndex(*c_player_locations, 1),
-                                        objective_id,
-                                        mapLocation(*c_previous_shift_location)};
+namespace {
+
+solvers::SolverInstance createSolverInstance(const struct CGraph* c_graph,
+                                             const struct CPlayerLocations* c_player_locations,
+                                             unsigned int objective_id,
+                                             const struct CLocation* c_previous_shift_location) {
+    return solvers::SolverInstance{mapGraph(*c_graph),
+                                   mapLocationAtIndex(*c_player_locations, 0),
+                                   mapLocationAtIndex(*c_player_locations, 1),
+                                   objective_id,
+                                   mapLocation(*c_previous_shift_location)};
+}
+
+std::unique_ptr<mm::Evaluator> createEvaluator(const solvers::SolverInstance& solver_instance) {
 #if defined MINIMAX_WIN_EVALUATOR
-    auto best_action = mm::iterateMinimax(solver_instance, mm::factories::createWinEvaluator(solver_instance));
+    return mm::factories::createWinEvaluator(solver_instance);
 #elif defined MINIMAX_REACHABLE_HEURISTIC
-    auto best_action = mm::iterateMinimax(solver_instance, mm::factories::createWinAndReachableLocationsEvaluator(solver_instance));
+    return mm::factories::createWinAndReachableLocationsEvaluator(solver_instance);
 #elif defined MINIMAX_DISTANCE_HEURISTIC
-    auto best_action = mm::iterateMinimax(solver_instance, mm::factories::createWinAndObjectiveDistanceEvaluator(solver_instance));
+    return mm::factories::createWinAndObjectiveDistanceEvaluator(solver_instance);
 #else
-    auto best_action = mm::iterateMinimax(solver_instance, std::make_unique<mm::WinEvaluator>(solver_instance));
+    return std::make_unique<mm::WinEvaluator>(solver_instance);
 #endif
+}
+
+struct CAction bestActionToCAction(const solvers::PlayerAction& action) {
+    if (action.move_location == solvers::error_player_action.move_location) {
+        return errorAction();
+    }
+    return actionToCAction(action);
+}
+
+} // namespace
+
+PUBLIC_API struct CAction find_action(struct CGraph* c_graph,
+                                      struct CPlayerLocations* c_player_locations,
+                                      unsigned int objective_id,
+                                      struct CLocation* c_previous_shift_location) {
+    auto solver_instance = createSolverInstance(c_graph, c_player_locations, objective_id, c_previous_shift_location);
+    auto best_action = mm::iterateMinimax(solver_instance, createEvaluator(solver_instance));
+    return actionToCAction(best_action);
+}
 
+PUBLIC_API struct CAction find_action_with_context(struct CSearchContext* c_context,
+                                                   struct CGraph* c_graph,
+                                                   struct CPlayerLocations* c_player_locations,
+                                                   unsigned int objective_id,
+                                                   struct CLocation* c_previous_shift_location) {
+    auto solver_instance = createSolverInstance(c_graph, c_player_locations, objective_id, c_previous_shift_location);
+    resetSearchStatus(c_context->context);
+    auto best_action = mm::iterateMinimax(solver_instance, createEvaluator(solver_instance), c_context->context);
     return actionToCAction(best_action);
 }
 
+PUBLIC_API void find_actions_batch(struct CSearchContext* c_batch_context,
+                                   const struct CSearchInstance* instances,
+                                   unsigned long num_instances,
+                                   unsigned long num_threads,
+                                   struct CAction* actions,
+                                   struct CSearchStatus* statuses) {
+    solveBatch(c_batch_context, instances, num_instances, num_threads, actions, statuses,
+               [](const struct CSearchInstance& instance, solvers::SearchContext& context) {
+                   auto solver_instance = createSolverInstance(&instance.graph,
+                                                               &instance.player_locations,
+                                                               instance.objective_id,
+                                                               &instance.previous_shift_location);
+                   return bestActionToCAction(
+                       mm::iterateMinimax(solver_instance, createEvaluator(solver_instance), context));
+               });
+}
+
 PUBLIC_API void abort_search() {
     mm::abortComputation();
 }
@@ -40,3 +89,11 @@ PUBLIC_API struct CSearchStatus get_status() {
     struct CSearchStatus search_status = {status.current_depth, status.is_terminal};
     return search_status;
 }
+
+PUBLIC_API struct CAction get_best_action() {
+    return bestActionToCAction(mm::getBestAction());
+}
+
+PUBLIC_API struct CAction get_best_action_with_context(struct CSearchContext* c_context) {
+    return bestActionToCAction(c_context->context.getBestAction());
+}
@@ -6,8 +6,9 @@
 #include "maze_graph.h"
 
 #include <algorithm>
+#include <atomic>
 #include <memory>
-#include <queue>
+#include <optional>
 #include <vector>
 
 // The algorithm searches for a path reaching the objective in a tree of game states.
@@ -16,6 +17,11 @@
 // Each other game state is reached from its parent game state with a GameStateTransition,
 // i.e. with a shift action and the set of then-reachable nodes.
 
+// The game tree is searched level by level, and the states of a level are expanded in parallel
+// by the number of threads given in the search context. The search returns the first state reaching the objective
+// in the order of a sequential breadth-first search. Once a state of the level has a child reaching the objective,
+// the states after it are not expanded anymore.
+
 // To be able to reconstruct the player actions,
 // the reachable nodes have to include their source node in the previous game state
 // Therefore, they are computed and stored as pairs, where the second entry is the NodeId of the reached node,
@@ -46,8 +52,6 @@ struct GameStateNode {
     bool isRoot() const noexcept { return parent == nullptr; }
 };
 
-using QueueType = std::queue<std::shared_ptr<GameStateNode>>;
-
 MazeGraph createGraphFromState(const MazeGraph& base_graph, StatePtr current_state) {
     MazeGraph graph{base_graph};
     std::vector<ShiftAction> shifts;
@@ -119,49 +123,92 @@ MazeGraph shiftedGraph(const MazeGraph& base_graph, const ShiftAction& shift_act
     return graph;
 }
 
+struct FoundObjective {
+    StatePtr state;
+    size_t reachable_index;
+};
+
+/** Appends the children of a state to children, in the order of the search.
+ * If a child reaches the objective, returns it instead, and the remaining children are not created. */
+std::optional<FoundObjective> expandState(StatePtr current_state,
+                                          const SolverInstance& solver_instance,
+                                          std::vector<StatePtr>& children) {
+    const auto objective_id = solver_instance.objective_id;
+    MazeGraph current_graph = createGraphFromState(solver_instance.graph, current_state);
+    auto shift_locations = current_graph.getShiftLocations();
+    auto invalid_shift_location = opposingShiftLocation(current_state->shift.location, current_graph.getExtent());
+    for (const auto& shift_location : shift_locations) {
+        if (shift_location == invalid_shift_location) {
+            continue;
+        }
+        auto rotations = determineRotations(current_graph.getLeftover());
+        for (RotationDegreeType rotation : rotations) {
+            const ShiftAction shift_action{shift_location, rotation};
+            const MazeGraph shifted_graph = shiftedGraph(current_graph, shift_action);
+            auto new_state = createNewState(shifted_graph, shift_action, current_state);
+            auto found_objective =
+                std::find_if(new_state->reached_nodes.begin(),
+                             new_state->reached_nodes.end(),
+                             [objective_id, &shifted_graph](auto& reached_node) {
+                                 return shifted_graph.getNode(reached_node.reached_location).node_id == objective_id;
+                             });
+            if (found_objective != new_state->reached_nodes.end()) {
+                const size_t reachable_index = found_objective - new_state->reached_nodes.begin();
+                return FoundObjective{new_state, reachable_index};
+            }
+            children.push_back(new_state);
+        }
+    }
+    return std::nullopt;
+}
+
+/** Sets value to bound if bound is lower */
+void lowerTo(std::atomic<size_t>& value, size_t bound) {
+    auto current = value.load();
+    while (bound < current && !value.compare_exchange_weak(current, bound)) {
+    }
+}
+
+SearchContext default_context{};
+
 } // anonymous namespace
 
 void abortComputation() {
-    is_aborted = true;
+    default_context.abort();
 }
 
 std::vector<PlayerAction> findBestActions(const SolverInstance& solver_instance) {
+    default_context.is_aborted = false;
+    return findBestActions(solver_instance, default_context);
+}
+
+std::vector<PlayerAction> findBestActions(const SolverInstance& solver_instance, SearchContext& context) {
     // invariant: GameStateNode contains reachable nodes after shift has been carried out.
-    is_aborted = false;
-    auto objective_id = solver_instance.objective_id;
-    QueueType state_queue;
     StatePtr root = std::make_shared<GameStateNode>();
     root->reached_nodes.emplace_back(0, solver_instance.player_location);
     root->shift = ShiftAction{solver_instance.previous_shift_location, RotationDegreeType::_0};
-    state_queue.push(root);
-    while (!state_queue.empty() && !is_aborted) {
-        auto current_state = state_queue.front();
-        state_queue.pop();
-        MazeGraph current_graph = createGraphFromState(solver_instance.graph, current_state);
-        auto shift_locations = current_graph.getShiftLocations();
-        auto invalid_shift_location = opposingShiftLocation(current_state->shift.location, current_graph.getExtent());
-        for (const auto& shift_location : shift_locations) {
-            if (shift_location == invalid_shift_location) {
-                continue;
-            }
-            auto rotations = determineRotations(current_graph.getLeftover());
-            for (RotationDegreeType rotation : rotations) {
-                const ShiftAction shift_action{shift_location, rotation};
-                const MazeGraph shifted_graph = shiftedGraph(current_graph, shift_action);
-                auto new_state = createNewState(shifted_graph, shift_action, current_state);
-                auto found_objective =
-                    std::find_if(new_state->reached_nodes.begin(),
-                                 new_state->reached_nodes.end(),
-                                 [objective_id, &shifted_graph](auto& reached_node) {
-                                     return shifted_graph.getNode(reached_node.reached_location).node_id == objective_id;
-                                 });
-                if (found_objective != new_state->reached_nodes.end()) {
-                    const size_t reachable_index = found_objective - new_state->reached_nodes.begin();
-                    return reconstructActions(new_state, reachable_index);
-                } else {
-                    state_queue.push(new_state);
+    std::vector<StatePtr> level{root};
+    for (size_t depth = 1; !level.empty() && !context.isStopped(); ++depth) {
+        context.current_depth = depth;
+        std::vector<std::vector<StatePtr>> children(level.size());
+        std::vector<std::optional<FoundObjective>> found(level.size());
+        std::atomic<size_t> next_index{0};
+        std::atomic<size_t> found_index{level.size()};
+        runInParallel(std::min(context.num_threads, level.size()), [&]() {
+            for (auto index = next_index++; index < found_index && !context.isStopped(); index = next_index++) {
+                found[index] = expandState(level[index], solver_instance, children[index]);
+                if (found[index]) {
+                    lowerTo(found_index, index);
                 }
             }
+        });
+        if (found_index < level.size()) {
+            context.is_terminal = true;
+            return reconstructActions(found[found_index]->state, found[found_index]->reachable_index);
+        }
+        level.clear();
+        for (auto& state_children : children) {
+            level.insert(level.end(), state_children.begin(), state_children.end());
         }
     }
     return std::vector<PlayerAction>{};
@@ -8,17 +8,22 @@ namespace labyrinth {
 namespace solvers {
 namespace exhsearch {
 
-static std::atomic_bool is_aborted = false;
-
 /** Aborts the current computation. This is only safe to use if findBestActions is called from a single thread.
  * Otherwise, this will abort all currently running computations in the best case, and might not have any effect at all
- * in the worst case.
+ * in the worst case. Use the overload of findBestActions with a SearchContext to run concurrent searches.
  */
 void abortComputation();
 
 /** Searches for the lowest number of actions which lead to the objective. */
 std::vector<PlayerAction> findBestActions(const SolverInstance& solver_instance);
 
+/** Searches for the lowest number of actions which lead to the objective.
+ * The search stops as soon as it is aborted via the given context, or the context's deadline has passed.
+ * The current depth of the context is the number of actions of the states which are currently expanded.
+ * The states of each depth are expanded by the number of threads given in the context.
+ */
+std::vector<PlayerAction> findBestActions(const SolverInstance& solver_instance, SearchContext& context);
+
 } // namespace exhsearch
 } // namespace solvers
 } // namespace labyrinth
@@ -7,9 +7,12 @@
 #include "maze_graph.h"
 
 #include <algorithm>
-#include <list>
+#include <atomic>
+#include <limits>
 #include <memory>
+#include <mutex>
 #include <optional>
+#include <utility>
 
 /**
  * The minimax algorithm searches for the optimal action to play in a two-player zero-sum game.
@@ -21,6 +24,11 @@
  * - The Evaluator determines a value for a given GameTreeNode.
  * - The negamax implementation in MinimaxRunner traverses the game tree by creating GameTreeNodes.
  * - The iterative deepening algorithm iteratively calls the minimax algorithm with increasing depths.
+ *
+ * If the search context allows for more than one thread, the root's shift actions are split across the threads.
+ * Each thread searches on its own copy of the maze. The threads share the best value found at the root,
+ * which serves as alpha for all further root moves. Ties are broken in favour of the move which comes first in the
+ * order of the sequential search, so that the result does not depend on the number of threads.
  */
 
 namespace labyrinth {
@@ -165,6 +173,54 @@ private:
     std::vector<Location>::const_iterator current_move_location_;
 };
 
+/**
+ * The best root move of a search which is split across threads.
+ *
+ * Root moves are ordered by the index of their shift action and the index of their move location.
+ * A root move which comes before the current best move is searched with an alpha one below the best value,
+ * so that it replaces the best move if it is as good.
+ * As in the sequential search, a root move has to exceed the initial value to become the best move.
+ * If no move does, the bound keeps the initial value and action.
+ */
+class RootBound {
+public:
+    using Order = std::pair<size_t, size_t>;
+
+    explicit RootBound(Evaluation initial_value, const PlayerAction& initial_action) :
+        value_{initial_value}, action_{initial_action} {}
+
+    Evaluation alphaFor(const Order& order) const {
+        std::lock_guard<std::mutex> lock{mutex_};
+        if (order < best_order_) {
+            return Evaluation{value_.value - 1};
+        }
+        return value_;
+    }
+
+    void update(const Order& order, const Evaluation& value, const PlayerAction& action) {
+        std::lock_guard<std::mutex> lock{mutex_};
+        const bool has_best_move = best_order_ != no_order;
+        if (value.value > value_.value || (has_best_move && value.value == value_.value && order < best_order_)) {
+            value_ = value;
+            best_order_ = order;
+            action_ = action;
+        }
+    }
+
+    MinimaxResult result() const {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return MinimaxResult{action_, value_};
+    }
+
+private:
+    static constexpr Order no_order{std::numeric_limits<size_t>::max(), std::numeric_limits<size_t>::max()};
+
+    mutable std::mutex mutex_;
+    Evaluation value_;
+    Order best_order_{no_order};
+    PlayerAction action_;
+};
+
 /**
  * Encapsulates the negamax implementation with its required data.
  * Is able to store data between consecutive negamax runs.
@@ -174,12 +230,16 @@ public:
     constexpr static Evaluation::ValueType inf_value{10000};
     constexpr static Evaluation infinity{inf_value};
 
-    explicit MinimaxRunner(std::unique_ptr<Evaluator> evaluator, const SolverInstance& solver_instance, size_t max_depth) :
+    explicit MinimaxRunner(std::unique_ptr<Evaluator> evaluator,
+                           const SolverInstance& solver_instance,
+                           size_t max_depth,
+                           const SearchContext& context) :
         evaluator_{std::move(evaluator)},
         win_evaluator_{solver_instance},
         solver_instance_{solver_instance},
         max_depth_{max_depth},
-        best_action_{error_player_action} {}
+        best_action_{error_player_action},
+        context_{context} {}
 
     MinimaxResult runMinimax() {
         MazeGraph graph_copy{solver_instance_.graph};
@@ -187,6 +247,9 @@ public:
                           solver_instance_.player_location,
                           solver_instance_.opponent_location,
                           solver_instance_.previous_shift_location};
+        if (context_.num_threads > 1 && max_depth_ > 0 && !win_evaluator_.evaluate(root).is_terminal) {
+            return runParallelRoot();
+        }
         const auto& evaluation = negamax(root);
         return MinimaxResult{best_action_, evaluation};
     }
@@ -218,18 +281,79 @@ private:
                     best_action_ = child_iterator.getPlayerAction();
                 }
             }
-            if (is_aborted) {
+            if (context_.isStopped()) {
                 break;
             }
         }
         return alpha;
     }
 
+    MinimaxResult runParallelRoot() {
+        const auto root_shifts = rootShifts();
+        RootBound bound{-infinity, best_action_};
+        std::atomic<size_t> next_index{0};
+        runInParallel(std::min(context_.num_threads, root_shifts.size()), [&]() {
+            MazeGraph graph{solver_instance_.graph};
+            for (auto index = next_index++; index < root_shifts.size(); index = next_index++) {
+                searchRootShift(graph, root_shifts[index], index, bound);
+                if (context_.isStopped()) {
+                    break;
+                }
+            }
+        });
+        const auto result = bound.result();
+        best_action_ = result.player_action;
+        return result;
+    }
+
+    /** Returns the shift actions of the root, in the order of ChildIterator */
+    std::vector<ShiftAction> rootShifts() const {
+        const auto& graph = solver_instance_.graph;
+        const auto invalid_shift_location =
+            opposingShiftLocation(solver_instance_.previous_shift_location, graph.getExtent());
+        const auto max_rotation = determineMaxRotation(graph.getLeftover().out_paths);
+        std::vector<ShiftAction> shifts;
+        for (const auto& shift_location : graph.getShiftLocations()) {
+            if (shift_location == invalid_shift_location) {
+                continue;
+            }
+            auto rotation = RotationDegreeType::_0;
+            shifts.push_back(ShiftAction{shift_location, rotation});
+            while (rotation < max_rotation) {
+                rotation = nextRotation(rotation);
+                shifts.push_back(ShiftAction{shift_location, rotation});
+            }
+        }
+        return shifts;
+    }
+
+    /** Searches all moves following a root shift on the given graph, which is restored afterwards */
+    void searchRootShift(MazeGraph& graph, const ShiftAction& shift, size_t shift_index, RootBound& bound) {
+        const auto extent = graph.getExtent();
+        graph.shift(shift.location, shift.rotation);
+        const auto pushed_out_rotation = graph.getLeftover().rotation;
+        const auto player_location = translateLocationByShift(solver_instance_.player_location, shift.location, extent);
+        const auto opponent_location =
+            translateLocationByShift(solver_instance_.opponent_location, shift.location, extent);
+        const auto move_locations = reachable::reachableLocations(graph, player_location);
+        for (size_t move_index = 0; move_index < move_locations.size(); ++move_index) {
+            const RootBound::Order order{shift_index, move_index};
+            GameTreeNode child_node{graph, opponent_location, move_locations[move_index], shift.location};
+            auto negamax_value = -negamax(child_node, -infinity, -bound.alphaFor(order), 1);
+            bound.update(order, negamax_value, PlayerAction{shift, move_locations[move_index]});
+            if (context_.isStopped()) {
+                break;
+            }
+        }
+        graph.shift(opposingShiftLocation(shift.location, extent), pushed_out_rotation);
+    }
+
     std::unique_ptr<Evaluator> evaluator_;
     WinEvaluator win_evaluator_;
     const SolverInstance& solver_instance_;
     size_t max_depth_;
     PlayerAction best_action_;
+    const SearchContext& context_;
 };
 
 /**
@@ -237,39 +361,43 @@ private:
  */
 class IterativeDeepening {
 public:
-    IterativeDeepening(std::unique_ptr<Evaluator> evaluator, const SolverInstance& solver_instance) :
+    IterativeDeepening(std::unique_ptr<Evaluator> evaluator,
+                       const SolverInstance& solver_instance,
+                       SearchContext& context) :
         max_depth_{0},
-        runner_{std::move(evaluator), solver_instance, max_depth_},
-        minimax_result_{error_player_action, -MinimaxRunner::infinity} {}
+        runner_{std::move(evaluator), solver_instance, max_depth_, context},
+        minimax_result_{error_player_action, -MinimaxRunner::infinity},
+        context_{context} {}
 
     PlayerAction iterateMinimax() {
-        is_aborted = false;
         max_depth_ = 0;
         minimax_result_ = {error_player_action, -MinimaxRunner::infinity};
+        context_.is_terminal = false;
+        context_.setBestAction(error_player_action);
+        bool is_stopped = false;
         do {
             ++max_depth_;
+            context_.current_depth = max_depth_;
             runner_.setMaxDepth(max_depth_);
             auto new_result = runner_.runMinimax();
-            if (!is_aborted || max_depth_ == 1) {
+            is_stopped = context_.isStopped();
+            if (!is_stopped || max_depth_ == 1) {
                 minimax_result_ = new_result;
+                context_.is_terminal = minimax_result_.evaluation.is_terminal;
+                context_.setBestAction(minimax_result_.player_action);
             }
-        } while (!minimax_result_.evaluation.is_terminal && !is_aborted);
+        } while (!minimax_result_.evaluation.is_terminal && !is_stopped);
         return minimax_result_.player_action;
     }
 
-    size_t getCurrentSearchDepth() { return max_depth_; }
-
-    bool currentResultIsTerminal() { return minimax_result_.evaluation.is_terminal; }
-
 private:
     size_t max_depth_;
     MinimaxRunner runner_;
     MinimaxResult minimax_result_;
+    SearchContext& context_;
 };
 
-std::list<IterativeDeepening> iterative_deepening_searches{};
-
-SearchStatus last_search_status{0, false};
+SearchContext default_context{};
 
 } // namespace
 
@@ -296,31 +424,40 @@ Evaluation operator*(const Evaluation& evaluation, Evaluation::ValueType factor)
 MinimaxResult findBestAction(const SolverInstance& solver_instance,
                              std::unique_ptr<Evaluator> evaluator,
                              const size_t max_depth) {
-    is_aborted = false;
-    MinimaxRunner runner{std::move(evaluator), solver_instance, max_depth};
+    default_context.is_aborted = false;
+    return findBestAction(solver_instance, std::move(evaluator), max_depth, default_context);
+}
+
+MinimaxResult findBestAction(const SolverInstance& solver_instance,
+                             std::unique_ptr<Evaluator> evaluator,
+                             const size_t max_depth,
+                             SearchContext& context) {
+    MinimaxRunner runner{std::move(evaluator), solver_instance, max_depth, context};
     return runner.runMinimax();
 }
 
 PlayerAction iterateMinimax(const SolverInstance& solver_instance, std::unique_ptr<Evaluator> evaluator) {
-    auto iterative_deepening =
-        iterative_deepening_searches.emplace(iterative_deepening_searches.end(), std::move(evaluator), solver_instance);
-    auto result = iterative_deepening->iterateMinimax();
-    last_search_status = SearchStatus{iterative_deepening->getCurrentSearchDepth(), iterative_deepening->currentResultIsTerminal()};
-    iterative_deepening_searches.erase(iterative_deepening);
-    return result;
+    default_context.is_aborted = false;
+    return iterateMinimax(solver_instance, std::move(evaluator), default_context);
+}
+
+PlayerAction iterateMinimax(const SolverInstance& solver_instance,
+                            std::unique_ptr<Evaluator> evaluator,
+                            SearchContext& context) {
+    IterativeDeepening iterative_deepening{std::move(evaluator), solver_instance, context};
+    return iterative_deepening.iterateMinimax();
 }
 
 void abortComputation() {
-    is_aborted = true;
+    default_context.abort();
 }
 
 SearchStatus getSearchStatus() {
-    if (!iterative_deepening_searches.empty()) {
-        auto& search = iterative_deepening_searches.back();
-        return SearchStatus{search.getCurrentSearchDepth(), search.currentResultIsTerminal()};
-    } else {
-        return last_search_status;
-    }
+    return SearchStatus{default_context.current_depth, default_context.is_terminal};
+}
+
+PlayerAction getBestAction() {
+    return default_context.getBestAction();
 }
 
 } // namespace minimax
@@ -94,25 +94,43 @@ public:
     virtual Evaluation evaluate(const GameTreeNode& node) const = 0;
 };
 
-static std::atomic_bool is_aborted = false;
-
 /** Aborts the current computation. This is only safe to use if one algorithm (findBestAction or iterateMinimax) is
  * called from a single thread. Otherwise, this will abort all currently running computations in the best case, and
- * might not have any effect at all in the worst case.
+ * might not have any effect at all in the worst case. Use the overloads with a SearchContext to run concurrent searches.
  */
 void abortComputation();
 
 /** Searches for the minimax action, up to a given depth */
 MinimaxResult findBestAction(const SolverInstance& solver_instance, std::unique_ptr<Evaluator> evaluator, const size_t max_depth);
 
+/** Searches for the minimax action, up to a given depth, until it is aborted via the given context. */
+MinimaxResult findBestAction(const SolverInstance& solver_instance,
+                             std::unique_ptr<Evaluator> evaluator,
+                             const size_t max_depth,
+                             SearchContext& context);
+
 /** Searches for a minimax action, with increasing depths.
  * The algorithm will run until either it is aborted or it finds a terminating result,
  * i.e. one of the players is guaranteed to reach the objective.
  */
 PlayerAction iterateMinimax(const SolverInstance& solver_instance, std::unique_ptr<Evaluator> evaluator);
 
+/** Searches for a minimax action, with increasing depths, until it is aborted via the given context,
+ * the context's deadline has passed, or it finds a terminating result.
+ * When stopped, it returns the action of the deepest completed iteration. The context reflects the current search depth and if the result is terminal.
+ */
+PlayerAction iterateMinimax(const SolverInstance& solver_instance,
+                            std::unique_ptr<Evaluator> evaluator,
+                            SearchContext& context);
+
+/** Returns the status of the current or last search which was started without a SearchContext. */
 SearchStatus getSearchStatus();
 
+/** Returns the best action of the deepest completed iteration of the current or last search which was started
+ * without a SearchContext, or error_player_action if no iteration has completed yet.
+ */
+PlayerAction getBestAction();
+
 } // namespace minimax
 } // namespace solvers
 } // namespace labyrinth
\ No newline at end of file
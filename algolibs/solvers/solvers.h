@@ -4,7 +4,12 @@
  */
 #include "maze_graph.h"
 
+#include <atomic>
+#include <chrono>
+#include <mutex>
 #include <ostream>
+#include <thread>
+#include <vector>
 
 namespace labyrinth {
 
@@ -29,6 +34,66 @@ struct PlayerAction {
 };
 
 static const PlayerAction error_player_action = PlayerAction{ShiftAction{}, Location{-1, -1}};
+
+/**
+ * The state of one search which is shared with other threads.
+ *
+ * While a search is running, it can be aborted and its progress can be queried via its context.
+ * A search can also be given a deadline, which the solvers check between expansions of game states,
+ * and the number of threads it uses, which has to be set before it starts.
+ * Contexts of different searches are independent, so multiple searches can run concurrently.
+ * Iterative searches additionally publish the best action of their deepest completed iteration,
+ * so that an aborted search yields a usable action even before it has returned.
+ */
+struct SearchContext {
+    using Clock = std::chrono::steady_clock;
+
+    std::atomic_bool is_aborted{false};
+    std::atomic<size_t> current_depth{0};
+    std::atomic_bool is_terminal{false};
+    size_t num_threads{1};
+
+    void abort() noexcept { is_aborted = true; }
+
+    /** Sets the point in time at which the search stops, as if it was aborted */
+    void setDeadline(Clock::time_point deadline) noexcept { deadline_ = deadline.time_since_epoch().count(); }
+
+    void clearDeadline() noexcept { setDeadline(Clock::time_point::max()); }
+
+    /** Returns true if the search has been aborted or its deadline has passed */
+    bool isStopped() const noexcept { return is_aborted || Clock::now().time_since_epoch().count() >= deadline_; }
+
+    void setBestAction(const PlayerAction& action) {
+        std::lock_guard<std::mutex> lock{best_action_mutex_};
+        best_action_ = action;
+    }
+
+    /** Returns the best action found so far, or error_player_action if there is none */
+    PlayerAction getBestAction() const {
+        std::lock_guard<std::mutex> lock{best_action_mutex_};
+        return best_action_;
+    }
+
+private:
+    std::atomic<Clock::rep> deadline_{Clock::time_point::max().time_since_epoch().count()};
+    mutable std::mutex best_action_mutex_;
+    PlayerAction best_action_{error_player_action};
+};
+
+/** Runs work on num_threads threads, one of them being the calling thread, and waits until all have returned */
+template <typename Work>
+void runInParallel(size_t num_threads, Work work) {
+    std::vector<std::thread> threads;
+    threads.reserve(num_threads > 1 ? num_threads - 1 : 0);
+    for (size_t i = 1; i < num_threads; ++i) {
+        threads.emplace_back(work);
+    }
+    work();
+    for (auto& thread : threads) {
+        thread.join();
+    }
+}
+
 } // namespace solvers
 } // namespace labyrinth
 
@@ -234,7 +234,7 @@ TEST_F(ExhaustiveSearchTest, depth4Instance_whenAborted_shouldReturnQuicklyWitho
     solvers::SolverInstance solver_instance{graph_, player_location, Location{-1, -1}, objective_id, previous_shift};
 
     const auto start = std::chrono::steady_clock::now();
-    auto future_actions = std::async(std::launch::async, exh::findBestActions, solver_instance);
+    auto future_actions = std::async(std::launch::async, [&solver_instance]() { return exh::findBestActions(solver_instance); });
     std::this_thread::sleep_for(1ms);
     exh::abortComputation();
     auto actions = future_actions.get();
@@ -245,6 +245,72 @@ TEST_F(ExhaustiveSearchTest, depth4Instance_whenAborted_shouldReturnQuicklyWitho
     ASSERT_THAT(actions, testing::IsEmpty());
 }
 
+TEST_F(ExhaustiveSearchTest, depth4Instance_withContexts_abortsOnlyOwnSearch) {
+    SCOPED_TRACE("depth4Instance_withContexts_abortsOnlyOwnSearch");
+    buildGraph(mazes::exh_depth_4_maze, {OutPaths::North, OutPaths::East});
+    auto objective_id = graph_.getNode(Location{6, 7}).node_id;
+    Location player_location{4, 2};
+    Location previous_shift{-1, -1};
+    solvers::SolverInstance solver_instance{graph_, player_location, Location{-1, -1}, objective_id, previous_shift};
+    solvers::SearchContext aborted_context{};
+    solvers::SearchContext running_context{};
+    aborted_context.abort();
+
+    auto running_actions = std::async(std::launch::async, [&solver_instance, &running_context]() {
+        return exh::findBestActions(solver_instance, running_context);
+    });
+    auto aborted_actions = exh::findBestActions(solver_instance, aborted_context);
+    auto actions = running_actions.get();
+
+    ASSERT_THAT(aborted_actions, testing::IsEmpty());
+    ASSERT_THAT(actions, testing::SizeIs(4));
+    ASSERT_TRUE(running_context.is_terminal);
+    ASSERT_THAT(running_context.current_depth.load(), testing::Eq(4u));
+}
+
+TEST_F(ExhaustiveSearchTest, depth4Instance_withDeadline_shouldReturnQuicklyAfterDeadlineWithoutResult) {
+    SCOPED_TRACE("depth4Instance_withDeadline_shouldReturnQuicklyAfterDeadlineWithoutResult");
+    using namespace std::chrono_literals;
+    buildGraph(mazes::exh_depth_4_maze, {OutPaths::North, OutPaths::East});
+    auto objective_id = graph_.getNode(Location{6, 7}).node_id;
+    Location player_location{4, 2};
+    Location previous_shift{-1, -1};
+    solvers::SolverInstance solver_instance{graph_, player_location, Location{-1, -1}, objective_id, previous_shift};
+    solvers::SearchContext context{};
+
+    const auto start = std::chrono::steady_clock::now();
+    context.setDeadline(start + 1ms);
+    auto actions = exh::findBestActions(solver_instance, context);
+    const std::chrono::duration<double> duration = std::chrono::steady_clock::now() - start;
+
+    ASSERT_THAT(duration.count(), testing::Lt(0.01));
+    ASSERT_THAT(actions, testing::IsEmpty());
+    ASSERT_FALSE(context.is_terminal);
+}
+
+TEST_F(ExhaustiveSearchTest, depth4Instance_withThreads_returnsActionsOfSequentialSearch) {
+    SCOPED_TRACE("depth4Instance_withThreads_returnsActionsOfSequentialSearch");
+    buildGraph(mazes::exh_depth_4_maze, {OutPaths::North, OutPaths::East});
+    auto objective_id = graph_.getNode(Location{6, 7}).node_id;
+    Location player_location{4, 2};
+    Location previous_shift{-1, -1};
+    solvers::SolverInstance solver_instance{graph_, player_location, Location{-1, -1}, objective_id, previous_shift};
+    solvers::SearchContext context{};
+    context.num_threads = 4;
+
+    auto actions = exh::findBestActions(solver_instance, context);
+    auto sequential_actions = exh::findBestActions(solver_instance);
+
+    ASSERT_THAT(actions, testing::SizeIs(4));
+    ASSERT_TRUE(isCorrectPlayerActionSequence(actions, graph_, player_location));
+    ASSERT_TRUE(context.is_terminal);
+    for (size_t index = 0; index < actions.size(); ++index) {
+        EXPECT_THAT(actions[index].shift.location, testing::Eq(sequential_actions[index].shift.location));
+        EXPECT_THAT(actions[index].shift.rotation, testing::Eq(sequential_actions[index].shift.rotation));
+        EXPECT_THAT(actions[index].move_location, testing::Eq(sequential_actions[index].move_location));
+    }
+}
+
 TEST_F(ExhaustiveSearchTest, depth4Instance_whenAborted_runsFineAfterwards) {
     SCOPED_TRACE("depth4Instance_whenAborted_runsFineAfterwards");
     buildGraph(mazes::exh_depth_4_maze, {OutPaths::North, OutPaths::East});
@@ -253,7 +319,7 @@ TEST_F(ExhaustiveSearchTest, depth4Instance_whenAborted_runsFineAfterwards) {
     Location previous_shift{-1, -1};
     solvers::SolverInstance solver_instance{graph_, player_location, Location{-1, -1}, objective_id, previous_shift};
 
-    auto future_actions = std::async(exh::findBestActions, solver_instance);
+    auto future_actions = std::async([&solver_instance]() { return exh::findBestActions(solver_instance); });
     exh::abortComputation();
     auto actions = future_actions.get();
 
@@ -38,6 +38,12 @@ using EvaluatorFactory = std::unique_ptr<mm::Evaluator> (*)(solvers::SolverInsta
 const std::vector<EvaluatorFactory> evaluator_factories = {&mm::factories::createWinEvaluator, &mm::factories::createWinAndReachableLocationsEvaluator, &mm::factories::createWinAndObjectiveDistanceEvaluator};
 const std::vector<std::string> names = {"OnlyWin", "WinAndReachedLocations", "WinAndObjectiveDistance"};
 
+/** Evaluates every position as won by the player to move, so that every root move of a search with depth 1 is lost */
+class PlayerToMoveWinsEvaluator : public mm::Evaluator {
+public:
+    mm::Evaluation evaluate(const mm::GameTreeNode&) const override { return mm::Evaluation{10000, true}; }
+};
+
 class MinimaxTest : public SolversTest, public ::testing::WithParamInterface<size_t> {
 private:
     using duration_clock = std::chrono::steady_clock;
@@ -49,8 +55,9 @@ protected:
         solvers::SolverInstance solver_instance{
             graph, player_location, opponent_location, objective_id, previous_shift_location};
         start = duration_clock::now();
-        future_action = std::async(
-            std::launch::async, mm::iterateMinimax, solver_instance, std::make_unique<mm::WinEvaluator>(solver_instance));
+        future_action = std::async(std::launch::async, [solver_instance]() {
+            return mm::iterateMinimax(solver_instance, std::make_unique<mm::WinEvaluator>(solver_instance));
+        });
     }
 
     void givenSleepFor(duration_clock::duration duration) { std::this_thread::sleep_for(duration); }
@@ -69,6 +76,26 @@ protected:
         result = minimax_result.player_action;
     }
 
+    void whenFindBestActionWithDepthAndThreads(size_t depth, size_t num_threads) {
+        solvers::SolverInstance solver_instance{
+            graph, player_location, opponent_location, objective_id, previous_shift_location};
+        solvers::SearchContext context{};
+        context.num_threads = num_threads;
+        minimax_result = mm::findBestAction(solver_instance, getEvaluator(solver_instance), depth, context);
+        result = minimax_result.player_action;
+    }
+
+    void whenFindBestActionWithEvaluatorAndThreads(std::unique_ptr<mm::Evaluator> evaluator,
+                                                   size_t depth,
+                                                   size_t num_threads) {
+        solvers::SolverInstance solver_instance{
+            graph, player_location, opponent_location, objective_id, previous_shift_location};
+        solvers::SearchContext context{};
+        context.num_threads = num_threads;
+        minimax_result = mm::findBestAction(solver_instance, std::move(evaluator), depth, context);
+        result = minimax_result.player_action;
+    }
+
     void whenComputationIsAborted() {
         mm::abortComputation();
         result = future_action.get();
@@ -250,6 +277,56 @@ TEST_P(MinimaxTest, findBestAction__opponentAndObjectiveOppositeOfBoardButPreven
     thenOpponentCannotReachObjective();
 }
 
+TEST_P(MinimaxTest, findBestAction__withThreads__returnsResultOfSequentialSearch) {
+    givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::East});
+    givenPlayerLocations(Location{6, 6}, Location{0, 0});
+    givenObjectiveAt(Location{0, 6});
+    givenPreviousShift(Location{0, 3});
+    whenFindBestActionWithDepth(2);
+    const auto sequential_result = minimax_result;
+
+    whenFindBestActionWithDepthAndThreads(2, 4);
+
+    thenActionIsValid();
+    thenShiftLocationIsNot(Location{6, 3});
+    EXPECT_THAT(minimax_result.evaluation.value, testing::Eq(sequential_result.evaluation.value));
+    thenShiftLocationIs(sequential_result.player_action.shift.location);
+    EXPECT_THAT(result.shift.rotation, testing::Eq(sequential_result.player_action.shift.rotation));
+    thenMoveLocationIs(sequential_result.player_action.move_location);
+}
+
+TEST_P(MinimaxTest, findBestAction__withThreadsAndEveryMoveLoses__returnsResultOfSequentialSearch) {
+    givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::South});
+    givenPlayerLocations(Location{3, 2}, Location{0, 4});
+    givenObjectiveAt(Location{0, 5});
+    whenFindBestActionWithDepth(2);
+    const auto sequential_result = minimax_result;
+
+    whenFindBestActionWithDepthAndThreads(2, 4);
+
+    thenActionIsValid();
+    thenMinimaxResultShouldBeTerminal();
+    EXPECT_THAT(minimax_result.evaluation.value, testing::Eq(sequential_result.evaluation.value));
+    thenShiftLocationIs(sequential_result.player_action.shift.location);
+    EXPECT_THAT(result.shift.rotation, testing::Eq(sequential_result.player_action.shift.rotation));
+    thenMoveLocationIs(sequential_result.player_action.move_location);
+}
+
+TEST_P(MinimaxTest, findBestAction__withThreadsAndEveryMoveScoredMinusInfinity__returnsResultOfSequentialSearch) {
+    givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::East});
+    givenPlayerLocations(Location{6, 6}, Location{0, 0});
+    givenObjectiveAt(Location{0, 6});
+    whenFindBestActionWithEvaluatorAndThreads(std::make_unique<PlayerToMoveWinsEvaluator>(), 1, 1);
+    const auto sequential_result = minimax_result;
+
+    whenFindBestActionWithEvaluatorAndThreads(std::make_unique<PlayerToMoveWinsEvaluator>(), 1, 4);
+
+    EXPECT_THAT(minimax_result.evaluation.value, testing::Eq(sequential_result.evaluation.value));
+    EXPECT_THAT(minimax_result.evaluation.is_terminal, testing::Eq(sequential_result.evaluation.is_terminal));
+    thenShiftLocationIs(sequential_result.player_action.shift.location);
+    thenMoveLocationIs(sequential_result.player_action.move_location);
+}
+
 TEST_F(MinimaxTest, findBestAction__whenAborted__shouldReturnQuicklyWithResult) {
     givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::East});
     givenPlayerLocations(Location{6, 6}, Location{0, 0});
@@ -263,6 +340,73 @@ TEST_F(MinimaxTest, findBestAction__whenAborted__shouldReturnQuicklyWithResult)
     thenActionIsValid();
 }
 
+TEST_F(MinimaxTest, iterateMinimax__withContexts__abortsOnlyOwnSearch) {
+    givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::East});
+    givenPlayerLocations(Location{6, 6}, Location{0, 0});
+    givenObjectiveAt(Location{0, 6});
+    solvers::SolverInstance solver_instance{
+        graph, player_location, opponent_location, objective_id, previous_shift_location};
+    solvers::SearchContext aborted_context{};
+    solvers::SearchContext running_context{};
+    auto search = [&solver_instance](solvers::SearchContext& context) {
+        return mm::iterateMinimax(solver_instance, std::make_unique<mm::WinEvaluator>(solver_instance), context);
+    };
+    auto aborted_action = std::async(std::launch::async, search, std::ref(aborted_context));
+    auto running_action = std::async(std::launch::async, search, std::ref(running_context));
+    givenSleepFor(20ms);
+
+    aborted_context.abort();
+    result = aborted_action.get();
+
+    thenActionIsValid();
+    EXPECT_THAT(aborted_context.getBestAction().move_location, testing::Eq(result.move_location));
+    EXPECT_THAT(aborted_context.getBestAction().shift.location, testing::Eq(result.shift.location));
+    EXPECT_THAT(running_action.wait_for(20ms), testing::Eq(std::future_status::timeout));
+    EXPECT_THAT(running_context.current_depth.load(), testing::Gt(0u));
+    running_context.abort();
+    result = running_action.get();
+    thenActionIsValid();
+}
+
+TEST_F(MinimaxTest, iterateMinimax__whileRunning__providesBestActionOfCompletedIteration) {
+    givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::East});
+    givenPlayerLocations(Location{6, 6}, Location{0, 0});
+    givenObjectiveAt(Location{0, 6});
+    solvers::SolverInstance solver_instance{
+        graph, player_location, opponent_location, objective_id, previous_shift_location};
+    solvers::SearchContext context{};
+    auto search = std::async(std::launch::async, [&solver_instance, &context]() {
+        return mm::iterateMinimax(solver_instance, std::make_unique<mm::WinEvaluator>(solver_instance), context);
+    });
+    givenSleepFor(20ms);
+
+    result = context.getBestAction();
+
+    thenActionIsValid();
+    context.abort();
+    search.get();
+}
+
+TEST_F(MinimaxTest, iterateMinimax__withDeadline__returnsBestActionOfCompletedIterationAtDeadline) {
+    givenGraph(mazes::big_component_maze, {OutPaths::North, OutPaths::East});
+    givenPlayerLocations(Location{6, 6}, Location{0, 0});
+    givenObjectiveAt(Location{0, 6});
+    solvers::SolverInstance solver_instance{
+        graph, player_location, opponent_location, objective_id, previous_shift_location};
+    solvers::SearchContext context{};
+
+    const auto start = std::chrono::steady_clock::now();
+    context.setDeadline(start + 20ms);
+    result = mm::iterateMinimax(solver_instance, std::make_unique<mm::WinEvaluator>(solver_instance), context);
+    const auto duration = std::chrono::steady_clock::now() - start;
+
+    EXPECT_THAT(duration, testing::Ge(20ms));
+    EXPECT_THAT(duration, testing::Lt(30ms));
+    EXPECT_FALSE(context.is_aborted);
+    thenActionIsValid();
+    EXPECT_THAT(context.getBestAction().move_location, testing::Eq(result.move_location));
+}
+
 INSTANTIATE_TEST_SUITE_P(,
                          MinimaxTest,
                          ::testing::Values(0, 1, 2),
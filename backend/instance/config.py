@@ -13,3 +13,40 @@ OVERDUE_PLAYER_TIMEDELTA_S = os.environ.get("OVERDUE_PLAYER_TIMEDELTA_S", defaul
 OVERDUE_PLAYER_REMOVAL_INTERVAL_S = os.environ.get("OVERDUE_PLAYER_REMOVAL_INTERVAL_S", default=15)
 UNOBSERVED_GAMES_TIMEDELTA_S = os.environ.get("UNOBSERVED_GAMES_TIMEDELTA_S", default=3600)
 UNOBSERVED_GAMES_REMOVE_INTERVAL_S = os.environ.get("UNOBSERVED_GAMES_REMOVE_INTERVAL_S", default=1800)
+
+""" Number of pre-generated boards kept ready per maze size, as comma-separated pairs <size>:<number>. """
+BOARD_POOL_SIZES = {int(size): int(capacity) for size, capacity in
+                    (entry.split(":") for entry in os.environ.get("BOARD_POOL_SIZES", default="7:4").split(",")
+                     if entry)}
+
+""" Set RESCAN_LIBRARY_PATH to False if the library folder does not change while the server is running.
+Otherwise, the folder is scanned again whenever its modification time has changed. """
+RESCAN_LIBRARY_PATH = os.environ.get("RESCAN_LIBRARY_PATH", default="True").lower() in ("true", "1", "t")
+
+""" Number of solver results kept in memory (0 disables the cache), and an optional SQLite file
+to which all results are written. """
+SOLVER_CACHE_SIZE = int(os.environ.get("SOLVER_CACHE_SIZE", default=4096))
+SOLVER_CACHE_DATABASE = os.environ.get("SOLVER_CACHE_DATABASE", default=None)
+
+""" Set ENABLE_SOLVER_SERVICE to run bot computations in a pool of worker processes, which is started with the app.
+The number of processes defaults to the number of available cores. """
+ENABLE_SOLVER_SERVICE = os.environ.get("ENABLE_SOLVER_SERVICE", default="False").lower() in ("true", "1", "t")
+SOLVER_SERVICE_PROCESSES = int(os.environ["SOLVER_SERVICE_PROCESSES"]) if "SOLVER_SERVICE_PROCESSES" in os.environ \
+    else None
+
+""" Number of likely positions on which bots search speculatively while their opponent moves (0 disables pondering).
+Speculative searches run on a separate thread, or on a separate worker process of the solver service,
+each with lower scheduling priority. """
+BOT_PONDERING_POSITIONS = int(os.environ.get("BOT_PONDERING_POSITIONS", default=0))
+
+""" Set ADAPTIVE_TIME_BUDGET to False to give every bot search the same time of 3 seconds.
+Otherwise, the time budget depends on the maze size, the observed search times, and the number of waiting searches.
+It does not exceed MAX_TIME_BUDGET_S, nor the time a bot has left before it is removed after
+OVERDUE_PLAYER_TIMEDELTA_S. """
+ADAPTIVE_TIME_BUDGET = os.environ.get("ADAPTIVE_TIME_BUDGET", default="True").lower() in ("true", "1", "t")
+MAX_TIME_BUDGET_S = float(os.environ.get("MAX_TIME_BUDGET_S", default=10))
+
+""" Number of threads of each bot search (0 for one per hardware thread). The exhaustive search expands the states of
+each depth in parallel, minimax splits the first shift actions across the threads. As searches of different games
+already run in parallel, more than one thread only pays off if there are more cores than concurrent searches. """
+SOLVER_SEARCH_THREADS = int(os.environ.get("SOLVER_SEARCH_THREADS", default=1))
@@ -31,7 +31,17 @@ def create_app(test_config=None):
         ENABLE_INFLUXDB_LOGGING=False,
         JSON_SORT_KEYS=False,
         DATABASE=os.path.join(app.instance_path, 'labyrinth.sqlite'),
-        LIBRARY_PATH=os.path.join(app.instance_path, 'lib')
+        LIBRARY_PATH=os.path.join(app.instance_path, 'lib'),
+        BOARD_POOL_SIZES={7: 4},
+        RESCAN_LIBRARY_PATH=True,
+        SOLVER_CACHE_SIZE=4096,
+        SOLVER_CACHE_DATABASE=None,
+        ENABLE_SOLVER_SERVICE=False,
+        SOLVER_SERVICE_PROCESSES=None,
+        BOT_PONDERING_POSITIONS=0,
+        ADAPTIVE_TIME_BUDGET=True,
+        MAX_TIME_BUDGET_S=10,
+        SOLVER_SEARCH_THREADS=1
     )
 
     if test_config is None:
@@ -67,6 +77,8 @@ def create_app(test_config=None):
     from . import game_management
     app.register_blueprint(game_management.GAME_MANAGEMENT)
 
+    _init_extensions(app)
+
     from labyrinth.database import DatabaseGateway
     app.before_first_request(lambda: DatabaseGateway.init_database())
     app.teardown_request(lambda exc: DatabaseGateway.close_database())
@@ -84,3 +96,60 @@ def create_app(test_config=None):
         return version_info._asdict()
 
     return app
+
+
+def shutdown(app):
+    """ Stops the background thread of the board pool and the worker processes of the solver service.
+    This happens at the latest when the app is garbage collected, or when the interpreter exits. """
+    _shutdown_extensions(app.extensions)
+
+
+def _shutdown_extensions(extensions):
+    extensions["board_pool"].stop()
+    if "solver_service" in extensions:
+        extensions["solver_service"].shutdown()
+
+
+def _init_extensions(app):
+    """ creates the shared model components, which are stored in app.extensions """
+    import weakref
+    from labyrinth.model.board_pool import BoardPool
+    app.extensions["board_pool"] = BoardPool(app.config["BOARD_POOL_SIZES"])
+    app.extensions["board_pool"].start()
+    weakref.finalize(app, _shutdown_extensions, app.extensions)
+
+    from labyrinth.model.external_library import library_registry
+    library_registry().rescan = app.config["RESCAN_LIBRARY_PATH"]
+
+    if app.config["SOLVER_CACHE_SIZE"]:
+        from labyrinth.model.solver_cache import SolverCache
+        app.extensions["solver_cache"] = SolverCache(app.config["SOLVER_CACHE_SIZE"],
+                                                     database_path=app.config["SOLVER_CACHE_DATABASE"])
+
+    if app.config["ENABLE_SOLVER_SERVICE"]:
+        from labyrinth.model.solver_service import SolverService
+        library_paths = sorted(library_registry().library_filenames(app.config["LIBRARY_PATH"], ".so") +
+                               library_registry().library_filenames(app.config["LIBRARY_PATH"], ".dll"))
+        app.extensions["solver_service"] = SolverService(library_paths,
+                                                         max_workers=app.config["SOLVER_SERVICE_PROCESSES"],
+                                                         search_threads=app.config["SOLVER_SEARCH_THREADS"])
+        app.extensions["solver_service"].start()
+
+    if app.config["ADAPTIVE_TIME_BUDGET"]:
+        _init_time_budget_manager(app)
+
+
+def _init_time_budget_manager(app):
+    from datetime import timedelta
+    from labyrinth.model.time_budget import TimeBudgetManager
+    from labyrinth.model.bots import shared_runtime
+    solver_service = app.extensions.get("solver_service")
+    if solver_service is not None:
+        def queue_depth():
+            return solver_service.metrics()["queue_depth"]
+    else:
+        queue_depth = shared_runtime().queue_depth
+    player_timeout = timedelta(seconds=int(app.config.get("OVERDUE_PLAYER_TIMEDELTA_S", 30)))
+    app.extensions["time_budget_manager"] = TimeBudgetManager(
+        max_budget=timedelta(seconds=float(app.config["MAX_TIME_BUDGET_S"])), player_timeout=player_timeout,
+        queue_depth=queue_depth)
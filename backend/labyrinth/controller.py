@@ -85,7 +85,7 @@ def change_game(game_id, game_request_dto):
     _ = interactors.OverduePlayerInteractor(game_repository(), logging.get_logger())
     _ = interactors.UpdateOnTurnChangeInteractor(game_repository())
     game = _load_game_or_throw(game_id)
-    new_board = _try(lambda: factory.create_board(maze_size=new_size))
+    new_board = _try(lambda: _board_pool().take(maze_size=new_size))
     _try(lambda: game.restart(new_board))
     DatabaseGateway.get_instance().update_game(game_id, game)
     DatabaseGateway.get_instance().commit()
@@ -158,12 +158,16 @@ def _get_or_create_game(game_id):
 
 
 def _create_game(game_id):
-    game = factory.create_game(game_id=game_id)
+    game = factory.create_game(game_id=game_id, board=_board_pool().take())
     DatabaseGateway.get_instance().create_game(game, game_id)
     logging.get_logger().add_game(game_id)
     return game
 
 
+def _board_pool():
+    return current_app.extensions["board_pool"]
+
+
 def _load_game_or_throw(game_id, for_update=False):
     game = DatabaseGateway.get_instance().load_game(game_id, for_update=for_update)
     if game is None:
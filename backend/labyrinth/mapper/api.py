@@ -7,10 +7,12 @@ which in turn are automatically translatable to structured text (JSON or XML)
 from datetime import timedelta
 from labyrinth.model.game import Game, Turns, Player
 import labyrinth.model.bots
-from labyrinth.mapper.shared import _objective_to_dto, _dto_to_board_location, _board_location_to_dto, _board_to_dto
+from labyrinth.mapper.shared import (_objective_to_dto, _dto_to_board_location, _board_location_to_dto, _board_to_dto,
+                                     _path_to_dto)
 from labyrinth.mapper.constants import (ID, OBJECTIVE, PLAYERS, MAZE, NEXT_ACTION, ENABLED_SHIFT_LOCATIONS, LOCATION,
                                         MAZE_CARD_ID, LEFTOVER_ROTATION, KEY, MESSAGE, ACTION, PLAYER_ID,
-                                        MAZE_SIZE, SCORE, PIECE_INDEX, IS_BOT, COMPUTATION_METHOD, PLAYER_NAME)
+                                        MAZE_SIZE, SCORE, PIECE_INDEX, IS_BOT, COMPUTATION_METHOD, PLAYER_NAME,
+                                        PREVIOUS_MOVE_PATH)
 
 
 def game_state_to_dto(game: Game, remaining: timedelta):
@@ -30,7 +32,8 @@ def game_state_to_dto(game: Game, remaining: timedelta):
         PLAYERS: [player_to_dto(player) for player in game.players],
         MAZE: _board_to_dto(game.board),
         NEXT_ACTION: player_action_dto,
-        ENABLED_SHIFT_LOCATIONS: _enabled_shift_locations_to_dto(game)
+        ENABLED_SHIFT_LOCATIONS: _enabled_shift_locations_to_dto(game),
+        PREVIOUS_MOVE_PATH: _path_to_dto(game.board.previous_move_path)
     }
 
 
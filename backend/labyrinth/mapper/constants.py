@@ -22,6 +22,7 @@ IS_BOT = "isBot"
 SHIFT_URL = "shiftApiUrl"
 MOVE_URL = "moveApiUrl"
 PREVIOUS_SHIFT_LOCATION = "previousShiftLocation"
+PREVIOUS_MOVE_PATH = "previousMovePath"
 ENABLED_SHIFT_LOCATIONS = "enabledShiftLocations"
 SCORE = "score"
 MAZE_SIZE = "mazeSize"
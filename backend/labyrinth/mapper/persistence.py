@@ -8,11 +8,12 @@ from datetime import timedelta
 
 from labyrinth.model.game import Game, Board, Piece, MazeCard, Turns, Maze, Player, PlayerAction
 import labyrinth.model.bots as bots
-from labyrinth.mapper.shared import _objective_to_dto, _dto_to_board_location, _board_location_to_dto, _board_to_dto
+from labyrinth.mapper.shared import (_objective_to_dto, _dto_to_board_location, _board_location_to_dto, _board_to_dto,
+                                     _path_to_dto, _dto_to_path)
 from labyrinth.mapper.constants import (ID, OBJECTIVE, PLAYERS, MAZE, NEXT_ACTION, LOCATION, MAZE_CARDS, SHIFT_URL,
                                         PREVIOUS_SHIFT_LOCATION, MAZE_CARD_ID, ACTION, MOVE_URL, OUT_PATHS, ROTATION,
                                         PLAYER_ID, MAZE_SIZE, SCORE, PIECE_INDEX, IS_BOT, COMPUTATION_METHOD,
-                                        TURN_PREPARE_DELAY, LIBRARY_PATH, PLAYER_NAME)
+                                        TURN_PREPARE_DELAY, LIBRARY_PATH, PLAYER_NAME, PREVIOUS_MOVE_PATH)
 
 
 def game_to_dto(game: Game):
@@ -28,7 +29,8 @@ def game_to_dto(game: Game):
         NEXT_ACTION: _turns_to_next_action_dto(game.turns),
         TURN_PREPARE_DELAY: _timedelta_to_dto_(game.turns.prepare_delay),
         OBJECTIVE: _objective_to_dto(game.board.objective_maze_card),
-        PREVIOUS_SHIFT_LOCATION: _board_location_to_dto(game.previous_shift_location)
+        PREVIOUS_SHIFT_LOCATION: _board_location_to_dto(game.previous_shift_location),
+        PREVIOUS_MOVE_PATH: _path_to_dto(game.board.previous_move_path)
     }
 
 
@@ -50,6 +52,7 @@ def dto_to_game(game_dto):
     maze, leftover_card, maze_card_by_id = _dto_to_maze_cards_and_dictionary(game_dto[MAZE])
     objective_maze_card = maze_card_by_id[game_dto[OBJECTIVE]]
     board = Board(maze, leftover_card, objective_maze_card=objective_maze_card)
+    board.previous_move_path = _dto_to_path(game_dto.get(PREVIOUS_MOVE_PATH))
     players = [_dto_to_player(player_dto, board, maze_card_by_id)
                for player_dto in game_dto[PLAYERS]]
     board._pieces = [player.piece for player in players]
@@ -39,6 +39,28 @@ def _dto_to_board_location(board_location_dto):
     return BoardLocation(board_location_dto[ROW], board_location_dto[COLUMN])
 
 
+def _path_to_dto(path):
+    """ Maps a path to a DTO
+
+    :param path: a list of BoardLocations, or None
+    :return: a list of board location DTOs, or None
+    """
+    if path is None:
+        return None
+    return [_board_location_to_dto(location) for location in path]
+
+
+def _dto_to_path(path_dto):
+    """ Maps a DTO to a path
+
+    :param path_dto: a list of board location DTOs, or None, as created by _path_to_dto
+    :return: a list of BoardLocations, or None
+    """
+    if path_dto is None:
+        return None
+    return [_dto_to_board_location(location_dto) for location_dto in path_dto]
+
+
 def _maze_card_to_dto(maze_card: MazeCard, location: BoardLocation = None):
     """ Maps a maze card to a DTO
 
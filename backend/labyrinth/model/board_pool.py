@@ -0,0 +1,117 @@
+""" This module provides a pool of pre-generated boards.
+
+Generating a random board is expensive for large mazes. The pool keeps a number of ready boards for each
+configured maze size, and refills them in a background thread whenever boards are taken.
+"""
+import collections
+import threading
+
+import labyrinth.model.factories as factory
+
+
+class BoardPool:
+    """ A pool of pre-generated boards, one queue per maze size.
+
+    Taking a board from a non-empty queue is a hit. Otherwise, it is a miss,
+    and the board is generated synchronously.
+    Sizes without a configured capacity are never pooled, so that each request for them is a miss.
+    """
+
+    def __init__(self, capacities=None, board_factory=factory.create_board):
+        """
+        :param capacities: a dictionary from maze size to the number of boards kept ready for this size
+        :param board_factory: a function which creates a board, given the maze size as keyword argument maze_size
+        """
+        self._capacities = dict(capacities or {})
+        self._board_factory = board_factory
+        self._boards = {maze_size: collections.deque() for maze_size in self._capacities}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        """ The number of boards taken from the pool """
+        return self._hits
+
+    @property
+    def misses(self):
+        """ The number of boards which had to be generated on request """
+        return self._misses
+
+    @property
+    def capacities(self):
+        """ Returns a copy of the capacities per maze size """
+        return dict(self._capacities)
+
+    def available(self, maze_size):
+        """ Returns the number of ready boards of the given size """
+        with self._condition:
+            return len(self._boards.get(maze_size, ()))
+
+    def take(self, maze_size=7):
+        """ Returns a newly generated board of the given size.
+
+        If there is a ready board in the pool, it is returned without delay, and the refill thread is notified.
+        :raises InvalidSizeException: if the size is not supported by the board factory
+        """
+        with self._condition:
+            boards = self._boards.get(maze_size)
+            if boards:
+                self._hits += 1
+                self._condition.notify()
+                return boards.popleft()
+            self._misses += 1
+            self._condition.notify()
+        return self._board_factory(maze_size=maze_size)
+
+    def fill(self):
+        """ Fills all queues of the pool up to their capacity, in the calling thread """
+        maze_size = self._next_deficient_size()
+        while maze_size is not None:
+            self._add_board(maze_size)
+            maze_size = self._next_deficient_size()
+
+    def start(self):
+        """ Starts the background thread which keeps the pool filled """
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._refill, name="board-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stops the background thread, and waits for it to finish """
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopped = True
+            self._condition.notify()
+        if thread is not None:
+            thread.join()
+
+    def _refill(self):
+        while True:
+            with self._condition:
+                maze_size = self._next_deficient_size()
+                while maze_size is None and not self._stopped:
+                    self._condition.wait()
+                    maze_size = self._next_deficient_size()
+                if self._stopped:
+                    return
+            self._add_board(maze_size)
+
+    def _add_board(self, maze_size):
+        """ Generates a board outside of the lock, and adds it if the queue has not been filled in the meantime """
+        board = self._board_factory(maze_size=maze_size)
+        with self._condition:
+            boards = self._boards[maze_size]
+            if len(boards) < self._capacities[maze_size]:
+                boards.append(board)
+
+    def _next_deficient_size(self):
+        with self._condition:
+            return next((maze_size for maze_size, capacity in self._capacities.items()
+                         if len(self._boards[maze_size]) < capacity), None)
@@ -3,25 +3,36 @@
 Bot is a subclass of model.game.Player, which handles board state and time-keeping.
 The computation of player actions is performed by external shared libraries (LibraryBinding).
 Clients should use the factory method create_bot() to create a Bot instance.
+
+Bots do not own threads. All bots share one BotRuntime: computations and API requests are submitted to
+bounded executors, and timeouts and idle times are delayed calls on the shared DelayScheduler.
+If the app has a SolverService, computations are submitted to its worker processes instead (ServiceBinding).
+If the app has a SolverCache, both bindings look up the action in the cache before searching.
+If the app has a TimeBudgetManager, it determines the time budget of each search, and learns from finished searches.
+
+Optionally, bots ponder: while the opponent before them moves, they search speculatively on the opponent's likely
+positions (see Ponderer). If the actual position at the start of the bot's turn is one of them, the bot continues
+this search instead of starting a new one.
 """
 
-import copy
+from concurrent.futures import Future, ThreadPoolExecutor
 import functools
-import glob
 from datetime import timedelta
 import os
 from random import choice
+import threading
 import time
-from threading import Thread
+import traceback
 import platform
 
-from flask import current_app
+from flask import current_app, has_app_context
 import requests
 
 import labyrinth.mapper.api
 import labyrinth.model.external_library as extlib
 from labyrinth.model import exceptions
-from .reachable import Graph
+from labyrinth.model.solver_cache import SolverCache
+from labyrinth.model.timers import shared_scheduler
 from .game import Player, Turns, PlayerAction
 
 
@@ -41,6 +52,9 @@ def create_bot(player_id, compute_method, full_path=None,
     :raises InvalidComputeMethodException: if compute_method cannot identify an existing library.
     """
     library_binding_factory = _create_library_binding_factory(expected_library=compute_method, full_path=full_path)
+    if has_app_context():
+        kwargs.setdefault("pondering_positions", current_app.config.get("BOT_PONDERING_POSITIONS", 0))
+    kwargs.setdefault("time_budget_manager", _app_extension("time_budget_manager"))
     return Bot(library_binding_factory, url_supplier=url_supplier,
                shift_url=shift_url, move_url=move_url,
                identifier=player_id, **kwargs)
@@ -59,37 +73,247 @@ def get_available_computation_methods():
     return [extract_basename(filename) for filename in filenames]
 
 
-class Bot(Player, Thread):
+class BotRuntime:
+    """ The execution resources shared by bots.
+
+    Computations run on an executor with at most max_computations threads,
+    API requests on an executor with at most max_requests threads.
+    Speculative computations run on a separate executor with at most max_speculations threads of lower priority,
+    so that they neither delay nor slow down the computations of bots whose turn it is.
+    The executors are created on first use.
+    Delayed calls are scheduled on the given DelayScheduler, by default the shared one.
+    """
+
+    def __init__(self, max_computations=4, max_requests=2, max_speculations=1, delay_scheduler=None):
+        self._max_computations = max_computations
+        self._max_requests = max_requests
+        self._max_speculations = max_speculations
+        self._delay_scheduler = delay_scheduler or shared_scheduler()
+        self._computation_executor = None
+        self._request_executor = None
+        self._speculation_executor = None
+        self._pending_computations = 0
+        self._lock = threading.Lock()
+
+    def submit_computation(self, function, *args):
+        """ Submits a computation, returns a Future """
+        with self._lock:
+            if self._computation_executor is None:
+                self._computation_executor = ThreadPoolExecutor(max_workers=self._max_computations,
+                                                                thread_name_prefix="bot-computation")
+            self._pending_computations += 1
+        future = self._submit(self._computation_executor, function, *args)
+        future.add_done_callback(self._on_computation_finished)
+        return future
+
+    def submit_speculation(self, function, *args):
+        """ Submits a speculative computation, returns a Future.
+        Speculative computations are not counted by queue_depth() """
+        with self._lock:
+            if self._speculation_executor is None:
+                self._speculation_executor = ThreadPoolExecutor(max_workers=self._max_speculations,
+                                                                thread_name_prefix="bot-speculation",
+                                                                initializer=_lower_thread_priority)
+        return self._submit(self._speculation_executor, function, *args)
+
+    def queue_depth(self):
+        """ Returns the number of submitted computations which wait for a free thread """
+        with self._lock:
+            return max(self._pending_computations - self._max_computations, 0)
+
+    def submit_request(self, function, *args):
+        """ Submits a function performing API requests, returns a Future """
+        with self._lock:
+            if self._request_executor is None:
+                self._request_executor = ThreadPoolExecutor(max_workers=self._max_requests,
+                                                            thread_name_prefix="bot-request")
+        return self._submit(self._request_executor, function, *args)
+
+    def call_later(self, delay, function, *args):
+        """ Schedules a call of function after the given delay, returns a DelayedCall """
+        return self._delay_scheduler.call_later(delay, function, *args)
+
+    def _on_computation_finished(self, _):
+        with self._lock:
+            self._pending_computations -= 1
+
+    @staticmethod
+    def _submit(executor, function, *args):
+        future = executor.submit(function, *args)
+        future.add_done_callback(_print_exception)
+        return future
+
+
+def _lower_thread_priority():
+    """ Lowers the scheduling priority of the calling thread, where the platform supports this per thread """
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+def _print_exception(future):
+    if not future.cancelled() and future.exception() is not None:
+        exception = future.exception()
+        traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+
+_SHARED_RUNTIME = BotRuntime()
+
+
+def shared_runtime():
+    """ Returns the BotRuntime shared by all bots by default """
+    return _SHARED_RUNTIME
+
+
+class _Speculation:
+    """ A search which was started on a likely position, identified by its position key """
+
+    __slots__ = ("position_key", "compute_method", "computation")
+
+    def __init__(self, position_key, compute_method, computation):
+        self.position_key = position_key
+        self.compute_method = compute_method
+        self.computation = computation
+
+    def abort(self):
+        if not self.computation.cancel():
+            self.compute_method.abort_search()
+
+
+class Ponderer:
+    """ Keeps the speculative searches of bots, which run during the turns of their opponents.
+
+    Bots are recreated whenever their game is loaded. Hence, speculations are not kept by the bot,
+    but here, by owner, i.e. the pair of game and player identifiers.
+    """
+
+    def __init__(self):
+        self._speculations = {}
+        self._lock = threading.Lock()
+
+    def replace(self, owner, speculations):
+        """ Stores the speculations of an owner, and aborts its previous speculations """
+        with self._lock:
+            previous = self._speculations.get(owner, [])
+            self._speculations[owner] = speculations
+        for speculation in previous:
+            speculation.abort()
+
+    def take(self, owner):
+        """ Removes and returns the speculations of an owner """
+        with self._lock:
+            return self._speculations.pop(owner, [])
+
+    def expire(self, owner, speculations):
+        """ Aborts the given speculations of an owner, if they have not been taken or replaced in the meantime """
+        with self._lock:
+            if self._speculations.get(owner) is not speculations:
+                return
+            del self._speculations[owner]
+        for speculation in speculations:
+            speculation.abort()
+
+
+_SHARED_PONDERER = Ponderer()
+
+
+class IdlePacing:
+    """ The minimum times a bot idles before its actions, so that human players can follow the game.
+
+    The shift idle time is measured from the start of the bot's turn, the move idle time from its shift.
+    Independent of the pacing, a bot always waits for the prepare delay of the turn progression.
+    """
+
+    def __init__(self, shift_idle_time=timedelta(seconds=1), move_idle_time=timedelta(seconds=2)):
+        self.shift_idle_time = shift_idle_time
+        self.move_idle_time = move_idle_time
+
+
+class _BotTurn:
+    """ The state of a bot's computation during one turn.
+
+    The computation is running, then possibly aborting, and finally the bot plays the computed actions.
+    Completion, timeout and end of the grace period race for the transitions, so these are guarded by a lock.
+    """
+    COMPUTING, ABORTING, PLAYING = range(3)
+
+    def __init__(self, compute_method):
+        self.compute_method = compute_method
+        self.start_time = time.monotonic()
+        self.computation = None
+        self.deadline = None
+        self.is_speculative = False
+        self._phase = self.COMPUTING
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return timedelta(seconds=time.monotonic() - self.start_time)
+
+    def transition(self, from_phases, to_phase):
+        """ Changes the phase to to_phase, if the current phase is one of from_phases.
+        Returns True iff the phase was changed. """
+        with self._lock:
+            if self._phase in from_phases:
+                self._phase = to_phase
+                return True
+            return False
+
+
+class Bot(Player):
     """ This class represents an artifical player.
 
-    If the bot is requested to make its action, it starts a thread for time keeping,
-    and a thread for letting the compute method determine the next shift and move action.
+    If the bot is requested to make its action, it submits the computation of the next shift and move action
+    to the runtime, and schedules the abort of the computation.
     Computation methods are time-restricted. After the computation timeout, they will be asked to abort.
-    They will then receive a short grace period to finish their current work and return a result.
+    If the computation method already provides a best action found so far, the bot plays it without further waiting.
+    Otherwise, it will receive a short grace period to finish its current work and return a result,
+    unless the computation method returns its best action as result after an abort (RESULT_FOLLOWS_ABORT).
+    Then, the bot waits for this result.
+    As soon as the computation has finished, the bot plays the actions, paced by its IdlePacing.
+    Random actions are only played if there is neither a result nor a best action found so far.
     :param library_binding_factory: a method creating a LibraryBinding,
         It is expected to take a board, a piece, and a game as its parameters.
+    :param runtime: the BotRuntime executing computations, requests and delayed calls.
+        By default, the runtime shared by all bots.
+    :param pacing: an instance of IdlePacing. By default, DEFAULT_PACING.
+    :param pondering_positions: the maximum number of likely positions the bot searches on speculatively,
+        while the opponent before it moves. 0 disables pondering. Speculative searches run on the runtime's
+        speculation executor without time budget, so that they search as deep as possible. They are aborted after
+        PONDERING_TIMEOUT, unless the bot continues one of them in its turn. Then, the computation timeout applies.
+    :param ponderer: the Ponderer keeping the speculative searches. By default, the one shared by all bots.
+    :param time_budget_manager: a TimeBudgetManager, which determines the computation timeout.
+        By default, the computation timeout is COMPUTATION_TIMEOUT.
     :param kwargs: keyword arguments, which are passed to the Player initializer. game must not be
         contained in kwargs. Set the game afterwards via set_game instead.
      """
 
     COMPUTATION_TIMEOUT = timedelta(seconds=3)
     WAIT_FOR_RESULT = timedelta(milliseconds=100)
-    MOVE_ACTION_IDLE_TIME = timedelta(seconds=2)
+    DEFAULT_PACING = IdlePacing()
+    PONDERING_TIMEOUT = timedelta(seconds=30)
 
-    def __init__(self, library_binding_factory, url_supplier=None, shift_url=None, move_url=None, **kwargs):
+    def __init__(self, library_binding_factory, url_supplier=None, shift_url=None, move_url=None, runtime=None,
+                 pacing=None, pondering_positions=0, ponderer=None, time_budget_manager=None, **kwargs):
         Player.__init__(self, **kwargs)
-        Thread.__init__(self)
         self._library_binding_factory = library_binding_factory
         self._shift_url = shift_url
         self._move_url = move_url
         self._url_supplier = url_supplier
         self._prepare_delay = timedelta(seconds=0)
+        self._runtime = runtime or _SHARED_RUNTIME
+        self._pacing = pacing or self.DEFAULT_PACING
+        self._pondering_positions = pondering_positions
+        self._ponderer = ponderer or _SHARED_PONDERER
+        self._time_budget_manager = time_budget_manager
 
     def register_in_turns(self, turns: Turns):
         """ Registers itself in a Turns manager.
         Overwrites superclass method. """
         self._prepare_delay = turns.prepare_delay
         turns.add_player(self, turn_callback=self.notify_turn_change)
+        if self._pondering_positions:
+            turns.register_turn_changed_listener(functools.partial(self._on_turn_changed, turns))
 
     def set_game(self, game):
         """ Sets the API urls.
@@ -99,23 +323,122 @@ class Bot(Player, Thread):
 
     def notify_turn_change(self, action):
         if action is PlayerAction.PREPARE_SHIFT:
-            self.start()
-
-    def run(self):
-        compute_method = self._library_binding_factory(self._board, self._piece, self._game)
-        compute_method.start()
-        time.sleep(max(self.COMPUTATION_TIMEOUT, self._prepare_delay).total_seconds())
-        compute_method.abort_search()
-        time.sleep(self.WAIT_FOR_RESULT.total_seconds())
+            self._start_computation()
+
+    def _on_turn_changed(self, turns):
+        player_action = turns.next_player_action()
+        if player_action and player_action.action is PlayerAction.MOVE_ACTION and player_action.player != self \
+                and turns.player_after(player_action.player) == self:
+            self._ponder(player_action.player.piece)
+
+    def _ponder(self, opponent_piece):
+        speculations = []
+        for board in _likely_boards(self._board, opponent_piece, self._pondering_positions):
+            piece = board.pieces[self._board.pieces.index(self._piece)]
+            compute_method = self._library_binding_factory(board, piece, self._game)
+            speculations.append(_Speculation(_position_key(board, piece), compute_method,
+                                             compute_method.submit(self._runtime, speculative=True)))
+        owner = self._pondering_owner()
+        self._ponderer.replace(owner, speculations)
+        if speculations:
+            self._runtime.call_later(self.PONDERING_TIMEOUT, self._ponderer.expire, owner, speculations)
+
+    def _take_speculation(self):
+        """ Returns the speculation on the current position, if there is one. Aborts all other speculations. """
+        if not self._pondering_positions:
+            return None
+        position_key = _position_key(self._board, self._piece)
+        matching = None
+        for speculation in self._ponderer.take(self._pondering_owner()):
+            if matching is None and speculation.position_key == position_key:
+                matching = speculation
+            else:
+                speculation.abort()
+        return matching
+
+    def _pondering_owner(self):
+        return self._game.identifier, self.identifier
+
+    def _start_computation(self):
+        speculation = self._take_speculation()
+        if speculation is not None:
+            turn = _BotTurn(speculation.compute_method)
+            turn.computation = speculation.computation
+            turn.is_speculative = True
+        else:
+            turn = _BotTurn(self._library_binding_factory(self._board, self._piece, self._game))
+        timeout = self._computation_timeout(turn)
+        turn.deadline = self._runtime.call_later(timeout, self._on_computation_timeout, turn)
+        if turn.computation is None:
+            turn.computation = turn.compute_method.submit(self._runtime, timeout)
+        turn.computation.add_done_callback(lambda _: self._on_computation_done(turn))
+
+    def _computation_timeout(self, turn):
+        return max(self._time_budget(turn), self._prepare_delay)
+
+    def _time_budget(self, turn):
+        if self._time_budget_manager is None:
+            return self.COMPUTATION_TIMEOUT
+        return self._time_budget_manager.budget(self._compute_method_name(), self._board.maze.maze_size,
+                                                remaining_time=self._remaining_time(turn))
+
+    def _remaining_time(self, turn):
+        """ Returns the time left for the search of the turn, before the bot is removed for being overdue.
+        After the search, the bot may wait for the grace period, and waits for the move idle time before it moves. """
+        after_search = self.WAIT_FOR_RESULT + max(self._pacing.move_idle_time, self._prepare_delay)
+        return self._time_budget_manager.player_timeout - turn.elapsed() - after_search
+
+    def _record_search(self, turn):
+        """ Reports the duration and status of a finished search to the TimeBudgetManager.
+        The duration is measured by the binding from the start of the search, so it excludes the time the
+        computation has waited for a thread or worker. Speculative searches are not reported, as they run with
+        lower priority. Neither are cancelled computations and cached actions, which have not searched. """
+        if self._time_budget_manager is None or turn.is_speculative or turn.computation.cancelled():
+            return
+        search_duration = turn.compute_method.search_duration
+        if search_duration is not None:
+            self._time_budget_manager.record(self._compute_method_name(), self._board.maze.maze_size,
+                                             search_duration, turn.compute_method.get_search_status())
+
+    def _compute_method_name(self):
+        return getattr(self._library_binding_factory, "SHORT_NAME", None)
+
+    def _on_computation_done(self, turn):
+        self._record_search(turn)
+        if turn.transition((_BotTurn.COMPUTING, _BotTurn.ABORTING), _BotTurn.PLAYING):
+            if turn.deadline is not None:
+                turn.deadline.cancel()
+            self._schedule_shift(turn)
+
+    def _on_computation_timeout(self, turn):
+        if turn.transition((_BotTurn.COMPUTING,), _BotTurn.ABORTING):
+            if not turn.computation.cancel():
+                turn.compute_method.abort_search()
+                if turn.compute_method.get_best_action() is not None:
+                    self._on_grace_period_expired(turn)
+                elif not turn.compute_method.RESULT_FOLLOWS_ABORT:
+                    turn.deadline = self._runtime.call_later(self.WAIT_FOR_RESULT, self._on_grace_period_expired,
+                                                             turn)
+
+    def _on_grace_period_expired(self, turn):
+        if turn.transition((_BotTurn.ABORTING,), _BotTurn.PLAYING):
+            self._schedule_shift(turn)
+
+    def _schedule_shift(self, turn):
+        idle_time = max(self._pacing.shift_idle_time, self._prepare_delay) - turn.elapsed()
+        self._runtime.call_later(max(idle_time, timedelta(0)),
+                                 self._runtime.submit_request, self._play_shift, turn.compute_method)
+
+    def _play_shift(self, compute_method):
         shift_action = compute_method.shift_action
         move_action = compute_method.move_action
 
         if shift_action is None or move_action is None:
-            shift_action, move_action = self.random_actions()
+            shift_action, move_action = compute_method.get_best_action() or self.random_actions()
 
         self._post_shift(*shift_action)
-        time.sleep(max(self.MOVE_ACTION_IDLE_TIME, self._prepare_delay).total_seconds())
-        self._post_move(move_action)
+        self._runtime.call_later(max(self._pacing.move_idle_time, self._prepare_delay),
+                                 self._runtime.submit_request, self._post_move, move_action)
 
     @property
     def shift_url(self):
@@ -148,28 +471,39 @@ class Bot(Player, Thread):
                 self._move_url = self._url_supplier.get_move_url(self._game.identifier, self.identifier)
 
     def random_actions(self):
-        board = copy.deepcopy(self._board)
-        piece = next(piece for piece in board.pieces if piece.maze_card.identifier == self._piece.maze_card.identifier)
+        board = self._board.fork()
+        piece = board.pieces[self._board.pieces.index(self._piece)]
         shift_location = choice(tuple(self._game.get_enabled_shift_locations()))
         shift_rotation = choice([0, 90, 180, 270])
         board.shift(shift_location, shift_rotation)
         piece_location = board.maze.maze_card_location(piece.maze_card)
-        reachable_locations = Graph(board.maze).reachable_locations(piece_location)
+        reachable_locations = board.reachable_locations(piece_location)
         shift_action = (shift_location, shift_rotation)
         move_action = choice(tuple(reachable_locations))
         return shift_action, move_action
 
 
-class LibraryBinding(Thread, extlib.ExternalLibraryBinding):
+class LibraryBinding(extlib.ExternalLibraryBinding):
     """ Calls an external library to perform the move. The abort_search method is already
-    implemented in the superclass. """
+    implemented in the superclass.
+
+    run() computes the action and stores it. It is expected to be called by an executor.
+    If a SolverCache is given, run() returns a cached action without searching,
+    and caches the action of a search which has terminated. The cache key is determined by run() as well,
+    so that hashing the board does not delay the caller. """
+
+    RESULT_FOLLOWS_ABORT = False
 
-    def __init__(self, board, piece, game, full_library_path):
+    def __init__(self, board, piece, game, full_library_path, solver_cache=None, num_threads=1):
         extlib.ExternalLibraryBinding.__init__(self, full_library_path,
-                                               board, piece, game.previous_shift_location)
-        Thread.__init__(self)
+                                               board, piece, game.previous_shift_location, num_threads=num_threads)
         self._shift_action = None
         self._move_action = None
+        self._solver_cache = solver_cache
+        self._determine_cache_key = functools.partial(_cache_key, solver_cache, full_library_path, board, piece,
+                                                      game.previous_shift_location)
+        self._time_budget = None
+        self._search_duration = None
 
     @property
     def shift_action(self):
@@ -181,13 +515,152 @@ class LibraryBinding(Thread, extlib.ExternalLibraryBinding):
         """ Getter for move_action """
         return self._move_action
 
+    @property
+    def search_duration(self):
+        """ The duration of the library search as timedelta, or None if run() has not searched """
+        return self._search_duration
+
+    def submit(self, runtime, time_budget=None, speculative=False):
+        """ Submits run() to the runtime's computation executor, returns a Future.
+        Speculative searches are submitted to the runtime's speculation executor instead.
+        If a time budget is given, the library stops the search when it has been used up. """
+        self._time_budget = time_budget
+        if speculative:
+            return runtime.submit_speculation(self.run)
+        return runtime.submit_computation(self.run)
+
     def run(self):
-        action = self.find_optimal_action()
+        cache_key = self._determine_cache_key()
+        action = self._solver_cache.lookup(cache_key) if self._solver_cache else None
+        if action is None:
+            search_start = time.monotonic()
+            action = self.find_optimal_action(time_budget=self._time_budget)
+            self._search_duration = timedelta(seconds=time.monotonic() - search_start)
+            if action and self._solver_cache and self.get_search_status()["search_terminated"]:
+                self._solver_cache.store(cache_key, action)
         if action:
             self._shift_action = action[0]
             self._move_action = action[1]
 
 
+class ServiceBinding:
+    """ Has the same interface as LibraryBinding, but runs the computation on a SolverService.
+
+    The search instance is created from the board on construction, and sent to a worker process on submit.
+    The cache key is determined on submit, if a SolverCache is given.
+    The worker stops the search at the end of the time budget, or when it is aborted by abort_search().
+    In both cases, it returns the best action found so far as the result of the computation. """
+
+    RESULT_FOLLOWS_ABORT = True
+
+    def __init__(self, board, piece, game, full_library_path, solver_service, time_budget=None, solver_cache=None):
+        self._instance = extlib.SearchInstance.from_board(board, piece, game.previous_shift_location)
+        self._full_library_path = full_library_path
+        self._solver_service = solver_service
+        self._time_budget = time_budget
+        self._solver_cache = solver_cache
+        self._determine_cache_key = functools.partial(_cache_key, solver_cache, full_library_path, board, piece,
+                                                      game.previous_shift_location)
+        self._cache_key = None
+        self._future = None
+        self._shift_action = None
+        self._move_action = None
+        self._search_status = _INITIAL_SEARCH_STATUS
+        self._search_duration = None
+
+    @property
+    def shift_action(self):
+        """ Getter for shift_action """
+        return self._shift_action
+
+    @property
+    def move_action(self):
+        """ Getter for move_action """
+        return self._move_action
+
+    @property
+    def search_duration(self):
+        """ The duration of the search in the worker as timedelta, or None if the worker has not searched """
+        return self._search_duration
+
+    def submit(self, runtime, time_budget=None, speculative=False):
+        """ Submits the search to the solver service, returns a Future. Runtime is not used.
+        Speculative searches are submitted to the service's pool of speculative searches. They are only limited
+        by the given time budget. For other searches, it overrides the one given on construction.
+        If the action is cached, the returned Future is already done. """
+        self._cache_key = self._determine_cache_key()
+        action = self._solver_cache.lookup(self._cache_key) if self._solver_cache else None
+        if action is not None:
+            future = Future()
+            future.set_result((action, _INITIAL_SEARCH_STATUS, None))
+        else:
+            if not speculative:
+                time_budget = time_budget or self._time_budget
+            future = self._solver_service.submit(self._full_library_path, self._instance, time_budget,
+                                                 speculative=speculative)
+            self._future = future
+        future.add_done_callback(self._store_result)
+        return future
+
+    def get_search_status(self):
+        """ Returns the final status of the search in the worker, after the computation has finished """
+        return self._search_status
+
+    def abort_search(self):
+        """ Asks the solver service to abort the search, if one has been submitted """
+        if self._future is not None:
+            self._solver_service.abort(self._future)
+
+    def get_best_action(self):
+        """ The worker returns the best action found so far itself when it aborts the search. Hence, returns None """
+        return None
+
+    def _store_result(self, future):
+        try:
+            action, self._search_status, self._search_duration = \
+                (None, _INITIAL_SEARCH_STATUS, None) if future.cancelled() else future.result()
+            if action and self._search_status["search_terminated"] and self._solver_cache:
+                self._solver_cache.store(self._cache_key, action)
+            if action:
+                self._shift_action = action[0]
+                self._move_action = action[1]
+        except Exception:
+            traceback.print_exc()
+
+
+_INITIAL_SEARCH_STATUS = {"current_search_depth": 0, "search_terminated": False}
+
+
+def _position_key(board, piece):
+    return board.state_hash, piece.piece_index
+
+
+def _likely_boards(board, opponent_piece, count):
+    """ Returns at most count forks of the board, with the opponent's piece moved to its most likely locations.
+
+    It is assumed that the opponent approaches the objective, or stays if the objective is the leftover.
+    If the opponent can reach the objective, the next objective is unknown. Then, there are no likely boards.
+    """
+    maze = board.maze
+    objective = maze.maze_card_location(board.objective_maze_card)
+    opponent_location = maze.maze_card_location(opponent_piece.maze_card)
+    reachable_locations = board.reachable_locations(opponent_location)
+    if objective in reachable_locations:
+        return []
+
+    def likelihood_order(location):
+        distance = abs(location.row - objective.row) + abs(location.column - objective.column) \
+            if objective is not None else 0
+        return distance, location != opponent_location, location.row, location.column
+
+    forks = []
+    for location in sorted(reachable_locations, key=likelihood_order)[:count]:
+        fork = board.fork()
+        fork.move(fork.pieces[board.pieces.index(opponent_piece)], location)
+        forks.append(fork)
+    return forks
+
+
 def _library_extension():
     extension = ".so"
     if platform.system() == "Windows":
@@ -197,9 +670,7 @@ def _library_extension():
 
 def _library_filenames():
     library_folder = current_app.config['LIBRARY_PATH']
-    extension = _library_extension()
-    search_pattern = os.path.join(library_folder, '*' + extension)
-    return glob.glob(search_pattern)
+    return extlib.library_registry().library_filenames(library_folder, _library_extension())
 
 
 def _validate_expected_library(expected_library):
@@ -215,9 +686,33 @@ def _validate_expected_library(expected_library):
 
 def _create_library_binding_factory(expected_library, full_path=None):
     full_library_path = full_path or _validate_expected_library(expected_library)
-
-    library_binding_factory = functools.partial(LibraryBinding,
-                                                full_library_path=full_library_path)
+    solver_service = _app_extension("solver_service")
+    solver_cache = _app_extension("solver_cache")
+    if solver_service is not None:
+        library_binding_factory = functools.partial(ServiceBinding, full_library_path=full_library_path,
+                                                    solver_service=solver_service, solver_cache=solver_cache)
+    else:
+        library_binding_factory = functools.partial(LibraryBinding, full_library_path=full_library_path,
+                                                    solver_cache=solver_cache, num_threads=_search_threads())
     setattr(library_binding_factory, "SHORT_NAME", expected_library)
     setattr(library_binding_factory, "FULL_PATH", full_library_path)
     return library_binding_factory
+
+
+def _search_threads():
+    if has_app_context():
+        return current_app.config.get("SOLVER_SEARCH_THREADS", 1)
+    return 1
+
+
+def _app_extension(name):
+    if has_app_context():
+        return current_app.extensions.get(name)
+    return None
+
+
+def _cache_key(solver_cache, full_library_path, board, piece, previous_shift_location):
+    if solver_cache is None:
+        return None
+    compute_method = os.path.splitext(os.path.basename(full_library_path))[0]
+    return SolverCache.search_key(compute_method, board, piece, previous_shift_location)
@@ -0,0 +1,131 @@
+""" This module evaluates all shift actions of a turn at once.
+
+For each admissible pair of shift location and leftover rotation, it determines the locations a piece can reach
+after the shift. Instead of copying the board and performing a BFS for every candidate,
+the mazes of all candidates are represented as one 3-d NumPy array of out-path bitmasks,
+and the reachable locations are determined by a batched flood fill.
+"""
+import numpy as np
+
+from labyrinth.model import out_paths_dict
+from labyrinth.model.game import BoardLocation
+
+_NORTH, _EAST, _SOUTH, _WEST = 1, 2, 4, 8
+
+_BIT_BY_DIRECTION = {(-1, 0): _NORTH, (0, 1): _EAST, (1, 0): _SOUTH, (0, -1): _WEST}
+
+_ROTATIONS = [0, 90, 180, 270]
+
+
+def reachable_locations_by_shift(board, piece, previous_shift_location=None):
+    """ Determines the reachable locations of a piece for all admissible shift actions.
+
+    Shift locations which violate the no-pushback rule are omitted.
+    Leftover rotations which result in the same maze as a smaller rotation (e.g. 180 for a straight)
+    are omitted as well.
+
+    :param board: an instance of Board. It is not altered.
+    :param piece: the Piece whose reachable locations are determined
+    :param previous_shift_location: the shift location of the previous turn, or None
+    :return: a dictionary mapping tuples (shift location, leftover rotation) to frozensets of BoardLocations
+    """
+    maze = board.maze
+    maze_size = maze.maze_size
+    base_masks = np.array([[_out_paths_mask(maze[BoardLocation(row, column)]) for column in range(maze_size)]
+                           for row in range(maze_size)], dtype=np.uint8)
+    leftover_masks = _distinct_rotation_masks(board.leftover_card)
+    shift_locations = sorted(board.enabled_shift_locations(previous_shift_location),
+                             key=lambda location: (location.row, location.column))
+    piece_location = maze.maze_card_location(piece.maze_card)
+
+    candidates = [(shift_location, rotation) for shift_location in shift_locations for rotation in leftover_masks]
+    masks = np.empty((len(candidates), maze_size, maze_size), dtype=np.uint8)
+    masks[:] = base_masks
+    sources = np.zeros((len(candidates), maze_size, maze_size), dtype=bool)
+    num_rotations = len(leftover_masks)
+    for index, shift_location in enumerate(shift_locations):
+        batch = slice(index * num_rotations, (index + 1) * num_rotations)
+        _shift(masks[batch], base_masks, shift_location, list(leftover_masks.values()))
+        source = _shifted_piece_location(piece_location, shift_location, maze_size)
+        sources[batch, source.row, source.column] = True
+
+    reached = _flood_fill(masks, sources)
+    return {candidate: _to_locations(reached[index]) for index, candidate in enumerate(candidates)}
+
+
+def _out_paths_mask(maze_card):
+    return _directions_mask(maze_card.rotated_out_paths())
+
+
+def _directions_mask(directions):
+    mask = 0
+    for direction in directions:
+        mask |= _BIT_BY_DIRECTION[direction]
+    return mask
+
+
+def _distinct_rotation_masks(maze_card):
+    """ Returns a dictionary from rotation to out-path bitmask, omitting rotations with duplicate masks """
+    masks = {}
+    for rotation in _ROTATIONS:
+        mask = _directions_mask(out_paths_dict.dictionary[(maze_card.out_paths, rotation)])
+        if mask not in masks.values():
+            masks[rotation] = mask
+    return masks
+
+
+def _shift(masks, base_masks, shift_location, inserted_masks):
+    """ Shifts the line of the given shift location in a batch of mazes,
+    inserting one of the given masks in each maze of the batch """
+    row, column = shift_location.row, shift_location.column
+    last = base_masks.shape[0] - 1
+    if row == 0:
+        masks[:, 1:, column] = base_masks[:-1, column]
+    elif row == last:
+        masks[:, :-1, column] = base_masks[1:, column]
+    elif column == 0:
+        masks[:, row, 1:] = base_masks[row, :-1]
+    else:
+        masks[:, row, :-1] = base_masks[row, 1:]
+    masks[:, row, column] = inserted_masks
+
+
+def _shifted_piece_location(piece_location, shift_location, maze_size):
+    """ Returns the location of a piece after the line of the given shift location was shifted.
+    Pieces on a pushed out maze card are placed on the inserted maze card. """
+    row, column = piece_location.row, piece_location.column
+    last = maze_size - 1
+    if shift_location.row == 0 and column == shift_location.column:
+        row = row + 1 if row < last else 0
+    elif shift_location.row == last and column == shift_location.column:
+        row = row - 1 if row > 0 else last
+    elif shift_location.column == 0 and row == shift_location.row:
+        column = column + 1 if column < last else 0
+    elif shift_location.column == last and row == shift_location.row:
+        column = column - 1 if column > 0 else last
+    return BoardLocation(row, column)
+
+
+def _flood_fill(masks, sources):
+    """ Performs a flood fill in a batch of mazes, starting at the source locations.
+
+    :param masks: an array of shape (batch size, maze size, maze size) of out-path bitmasks
+    :param sources: a boolean array of the same shape, marking the starting locations
+    :return: a boolean array of the same shape, marking all reached locations
+    """
+    east_open = ((masks[:, :, :-1] & _EAST) != 0) & ((masks[:, :, 1:] & _WEST) != 0)
+    south_open = ((masks[:, :-1, :] & _SOUTH) != 0) & ((masks[:, 1:, :] & _NORTH) != 0)
+    reached = sources.copy()
+    while True:
+        expanded = reached.copy()
+        expanded[:, :, 1:] |= reached[:, :, :-1] & east_open
+        expanded[:, :, :-1] |= reached[:, :, 1:] & east_open
+        expanded[:, 1:, :] |= reached[:, :-1, :] & south_open
+        expanded[:, :-1, :] |= reached[:, 1:, :] & south_open
+        if np.array_equal(expanded, reached):
+            return reached
+        reached = expanded
+
+
+def _to_locations(reached):
+    return frozenset(BoardLocation(int(row), int(column)) for row, column in zip(*np.nonzero(reached)))
@@ -1,9 +1,17 @@
 """ This module provides a binding to an external library.
 
 It models the structs with ctypes and defines a class which implements the algorithm interface by
-binding to a library at a given path """
+binding to a library at a given path.
+Libraries are loaded once per process by the LibraryRegistry, which also caches the contents of library folders. """
 import ctypes
+import glob
+import os
+import threading
+
+import numpy as np
+
 from labyrinth.model.game import BoardLocation
+from labyrinth.model.node_buffer import NODE_DTYPE
 
 
 class LOCATION(ctypes.Structure):
@@ -18,7 +26,7 @@ class PLAYER_LOCATIONS(ctypes.Structure):
 
 class NODE(ctypes.Structure):
     """ corresponds to game.MazeCard
-    The out_paths are represented as a bitfield """
+    The out_paths are represented as a bitfield. Has the same layout as node_buffer.NODE_DTYPE """
     _fields_ = [("node_id", ctypes.c_uint), ("out_paths", ctypes.c_ubyte), ("rotation", ctypes.c_short)]
 
 
@@ -48,68 +56,275 @@ class STATUS(ctypes.Structure):
     ]
 
 
+class SEARCH_INSTANCE(ctypes.Structure):
+    """ corresponds to SearchInstance, one element of the batch passed to find_actions_batch """
+    _fields_ = [
+        ("graph", GRAPH),
+        ("player_locations", PLAYER_LOCATIONS),
+        ("objective_id", ctypes.c_uint),
+        ("previous_shift_location", LOCATION),
+    ]
+
+
+class SearchInstance:
+    """ The input of a search in plain Python values, so that it can be sent to other processes.
+
+    nodes is an array of node_buffer.NODE_DTYPE in row-wise order, followed by the leftover.
+    player_locations and previous_shift_location are tuples (row, column). The first player is the one to play.
+    """
+
+    __slots__ = ("extent", "nodes", "player_locations", "objective_id", "previous_shift_location")
+
+    def __init__(self, extent, nodes, player_locations, objective_id, previous_shift_location=(-1, -1)):
+        self.extent = extent
+        self.nodes = nodes
+        self.player_locations = player_locations
+        self.objective_id = objective_id
+        self.previous_shift_location = previous_shift_location
+
+    def __getstate__(self):
+        return tuple(getattr(self, attribute) for attribute in self.__slots__)
+
+    def __setstate__(self, state):
+        for attribute, value in zip(self.__slots__, state):
+            setattr(self, attribute, value)
+
+    @classmethod
+    def from_board(cls, board, piece, previous_shift_location=None, copy_nodes=True):
+        """ Creates the instance of the given piece's search on the given board
+
+        :param copy_nodes: if False, the nodes are the board's node buffer, which is altered by the next shift
+        """
+        maze = board.maze
+        nodes = board.node_buffer().nodes
+        if copy_nodes:
+            nodes = nodes.copy()
+        pos = board.pieces.index(piece)
+        pieces = board.pieces[pos:] + board.pieces[:pos]
+        player_locations = [maze.maze_card_location(other.maze_card) for other in pieces]
+        previous_shift_location = previous_shift_location or BoardLocation(-1, -1)
+        return cls(extent=maze.maze_size, nodes=nodes,
+                   player_locations=tuple((location.row, location.column) for location in player_locations),
+                   objective_id=board.objective_maze_card.identifier,
+                   previous_shift_location=(previous_shift_location.row, previous_shift_location.column))
+
+
+class LibraryRegistry:
+    """ Loads each library once, and declares the argument and return types of its functions.
+
+    Also caches the library filenames of folders. If rescan is set, a folder is scanned again
+    when its modification time has changed, i.e. when a library has been added or removed.
+    """
+
+    def __init__(self, rescan=True):
+        self.rescan = rescan
+        self._libraries = {}
+        self._folders = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        """ Returns the loaded library at the given path, with declared prototypes """
+        with self._lock:
+            library = self._libraries.get(path)
+            if library is None:
+                library = ctypes.cdll.LoadLibrary(path)
+                self._declare_functions(library)
+                self._libraries[path] = library
+            return library
+
+    def library_filenames(self, folder, extension):
+        """ Returns the paths of all files in folder with the given extension """
+        try:
+            modification_time = os.stat(folder).st_mtime_ns
+        except OSError:
+            modification_time = None
+        with self._lock:
+            cached = self._folders.get((folder, extension))
+            if cached is not None and (not self.rescan or cached[0] == modification_time):
+                return list(cached[1])
+        filenames = glob.glob(os.path.join(folder, "*" + extension))
+        with self._lock:
+            self._folders[(folder, extension)] = (modification_time, tuple(filenames))
+        return filenames
+
+    @staticmethod
+    def _declare_functions(library):
+        library.find_action.argtypes = [ctypes.POINTER(GRAPH), ctypes.POINTER(PLAYER_LOCATIONS), ctypes.c_uint,
+                                        ctypes.POINTER(LOCATION)]
+        library.find_action.restype = ACTION
+        library.abort_search.argtypes = []
+        library.abort_search.restype = None
+        library.get_status.argtypes = []
+        library.get_status.restype = STATUS
+        if hasattr(library, "create_search_context"):
+            library.create_search_context.argtypes = []
+            library.create_search_context.restype = ctypes.c_void_p
+            library.find_action_with_context.argtypes = [ctypes.c_void_p] + library.find_action.argtypes
+            library.find_action_with_context.restype = ACTION
+            library.abort_search_with_context.argtypes = [ctypes.c_void_p]
+            library.abort_search_with_context.restype = None
+            library.get_status_with_context.argtypes = [ctypes.c_void_p]
+            library.get_status_with_context.restype = STATUS
+            library.destroy_search_context.argtypes = [ctypes.c_void_p]
+            library.destroy_search_context.restype = None
+        if hasattr(library, "find_action_with_time_budget"):
+            library.find_action_with_time_budget.argtypes = [ctypes.c_void_p] + library.find_action.argtypes + \
+                [ctypes.c_ulong]
+            library.find_action_with_time_budget.restype = ACTION
+        if hasattr(library, "set_search_threads"):
+            library.set_search_threads.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+            library.set_search_threads.restype = None
+        if hasattr(library, "find_actions_batch"):
+            library.find_actions_batch.argtypes = [ctypes.c_void_p, ctypes.POINTER(SEARCH_INSTANCE), ctypes.c_ulong,
+                                                   ctypes.c_ulong, ctypes.POINTER(ACTION), ctypes.POINTER(STATUS)]
+            library.find_actions_batch.restype = None
+        if hasattr(library, "get_best_action"):
+            library.get_best_action.argtypes = []
+            library.get_best_action.restype = ACTION
+            library.get_best_action_with_context.argtypes = [ctypes.c_void_p]
+            library.get_best_action_with_context.restype = ACTION
+
+
+_REGISTRY = LibraryRegistry()
+
+
+def library_registry():
+    """ Returns the process-wide LibraryRegistry """
+    return _REGISTRY
+
+
 class ExternalLibraryBinding:
     """ Binds to an external library at given path.
-    Translates the game datastructures to the ctypes structures and back """
-    _OUT_PATH_TO_BIT = {"N": 1, "E": 2, "S": 4, "W": 8}
+    Translates the game datastructures to the ctypes structures and back.
 
+    If the library exports a reentrant interface (create_search_context etc.), each binding owns a search context,
+    so that aborting or querying the search of one binding does not interfere with searches of other bindings.
+    Otherwise, the library's global abort and status functions are used.
+    Libraries with a reentrant interface also stop searches at a deadline (find_action_with_time_budget),
+    and split a search across multiple threads (set_search_threads).
+    Libraries with iterative searches also export the best action found so far (get_best_action). """
     _ERROR_LOCATION = BoardLocation(-1, -1)
 
-    def __init__(self, path, board, piece, previous_shift_location=None):
-        self._library = ctypes.cdll.LoadLibrary(path)
-        self._library.find_action.restype = ACTION
-        self._library.abort_search.restype = None
-        self._library.get_status.restype = STATUS
+    def __init__(self, path, board=None, piece=None, previous_shift_location=None, num_threads=1):
+        """ board and piece are only required for find_optimal_action()
+
+        :param num_threads: the number of threads of a search, 0 for one per hardware thread.
+        Libraries without set_search_threads search on one thread.
+        """
+        self._library = library_registry().load(path)
+        self._context = None
+        if hasattr(self._library, "create_search_context"):
+            self._context = self._library.create_search_context()
+            if num_threads != 1 and hasattr(self._library, "set_search_threads"):
+                self._library.set_search_threads(self._context, num_threads)
         self._board = board
-        pos = board.pieces.index(piece)
-        self._pieces = board.pieces[pos:] + board.pieces[:pos]
+        self._piece = piece
         self._previous_shift_location = previous_shift_location
-        if self._previous_shift_location is None:
-            self._previous_shift_location = BoardLocation(-1, -1)
 
-    def find_optimal_action(self):
+    def find_optimal_action(self, time_budget=None):
         """ finds optimal action by calling the external library """
-        graph = self._create_graph(self._board)
-        start_locations = [self._board.maze.maze_card_location(piece.maze_card) for piece in self._pieces]
-        start_locations = self._create_player_locations(start_locations)
-        previous_shift_location = self._create_location(self._previous_shift_location)
-        objective_id = self._board.objective_maze_card.identifier
-        action = self._library.find_action(ctypes.byref(graph), ctypes.byref(start_locations), objective_id,
-                                           ctypes.byref(previous_shift_location))
+        return self.find_action(SearchInstance.from_board(self._board, self._piece, self._previous_shift_location,
+                                                          copy_nodes=False), time_budget=time_budget)
+
+    def find_action(self, instance, time_budget=None):
+        """ finds optimal action for a SearchInstance by calling the external library.
+        The nodes are passed to the library without conversion.
+
+        :param time_budget: a timedelta after which the library stops the search, as if it was aborted.
+        Libraries without find_action_with_time_budget are aborted by a timer instead.
+        """
+        if time_budget is not None and not (self._context and hasattr(self._library, "find_action_with_time_budget")):
+            return self._find_action_with_timer(instance, time_budget)
+        nodes = np.ascontiguousarray(instance.nodes, dtype=NODE_DTYPE)
+        graph = GRAPH(extent=instance.extent, num_nodes=len(nodes), nodes=nodes.ctypes.data_as(ctypes.POINTER(NODE)))
+        locations = (LOCATION * len(instance.player_locations))(*instance.player_locations)
+        start_locations = PLAYER_LOCATIONS(locations=locations, num_players=len(instance.player_locations))
+        previous_shift_location = LOCATION(*instance.previous_shift_location)
+        objective_id = instance.objective_id
+        if time_budget is not None:
+            action = self._library.find_action_with_time_budget(self._context, ctypes.byref(graph),
+                                                                ctypes.byref(start_locations), objective_id,
+                                                                ctypes.byref(previous_shift_location),
+                                                                int(time_budget.total_seconds() * 1000))
+        elif self._context:
+            action = self._library.find_action_with_context(self._context, ctypes.byref(graph),
+                                                            ctypes.byref(start_locations), objective_id,
+                                                            ctypes.byref(previous_shift_location))
+        else:
+            action = self._library.find_action(ctypes.byref(graph), ctypes.byref(start_locations), objective_id,
+                                               ctypes.byref(previous_shift_location))
         return self._map_returned_action(action)
 
+    def _find_action_with_timer(self, instance, time_budget):
+        timer = threading.Timer(time_budget.total_seconds(), self.abort_search)
+        timer.start()
+        try:
+            return self.find_action(instance)
+        finally:
+            timer.cancel()
+
+    def find_actions(self, instances, num_threads=0):
+        """ finds optimal actions for a sequence of SearchInstances with a single library call.
+        The library solves the instances in parallel on num_threads threads, by default one per hardware thread.
+        abort_search() aborts all searches of the batch. An abort before the batch has started has no effect on it.
+        Libraries without find_actions_batch solve the instances one after the other.
+
+        :return: a list of tuples (action, status), with action as returned by find_action(),
+        and status as returned by get_search_status()
+        """
+        if not hasattr(self._library, "find_actions_batch"):
+            return [(self.find_action(instance), self.get_search_status()) for instance in instances]
+        nodes = [np.ascontiguousarray(instance.nodes, dtype=NODE_DTYPE) for instance in instances]
+        locations = [(LOCATION * len(instance.player_locations))(*instance.player_locations) for instance in instances]
+        c_instances = (SEARCH_INSTANCE * len(instances))(*(
+            SEARCH_INSTANCE(graph=GRAPH(extent=instance.extent, num_nodes=len(instance_nodes),
+                                        nodes=instance_nodes.ctypes.data_as(ctypes.POINTER(NODE))),
+                            player_locations=PLAYER_LOCATIONS(locations=instance_locations,
+                                                              num_players=len(instance.player_locations)),
+                            objective_id=instance.objective_id,
+                            previous_shift_location=LOCATION(*instance.previous_shift_location))
+            for instance, instance_nodes, instance_locations in zip(instances, nodes, locations)))
+        actions = (ACTION * len(instances))()
+        statuses = (STATUS * len(instances))()
+        self._library.find_actions_batch(self._context, c_instances, len(instances), num_threads, actions, statuses)
+        return [(self._map_returned_action(action), self._map_search_status(status))
+                for action, status in zip(actions, statuses)]
+
     def abort_search(self):
-        self._library.abort_search()
+        """ Aborts the search of this binding. With a search context, this also takes effect if the search
+        has not started yet. """
+        if self._context:
+            self._library.abort_search_with_context(self._context)
+        else:
+            self._library.abort_search()
 
     def get_search_status(self):
-        status = self._library.get_status()
+        if self._context:
+            status = self._library.get_status_with_context(self._context)
+        else:
+            status = self._library.get_status()
         return self._map_search_status(status)
 
-    @staticmethod
-    def _create_node(maze_card):
-        """ creates a NODE from a MazeCard """
-        out_paths = 0
-        for out_path in maze_card.out_paths:
-            out_paths |= ExternalLibraryBinding._OUT_PATH_TO_BIT[out_path]
-        return NODE(maze_card.identifier, out_paths, maze_card.rotation)
-
-    @staticmethod
-    def _create_graph(board):
-        """ creates a GRAPH function argument
+    def get_best_action(self):
+        """ Returns the best action of the deepest completed search iteration, while the search is running or after
+        it has been aborted. Returns None if no iteration has completed, or if the library does not provide it. """
+        if not hasattr(self._library, "get_best_action"):
+            return None
+        if self._context:
+            action = self._library.get_best_action_with_context(self._context)
+        else:
+            action = self._library.get_best_action()
+        return self._map_returned_action(action)
 
-        :param board: an instance of labyrinth.model.game.board
-        """
-        maze = board.maze
-        extent = maze.maze_size
-        node_array = [ExternalLibraryBinding._create_node(maze[location]) for location in maze.maze_locations]
-        node_array.append(ExternalLibraryBinding._create_node(board.leftover_card))
-        nodes = (NODE * len(node_array))(*node_array)
-        return GRAPH(extent=extent, num_nodes=len(node_array), nodes=nodes)
+    def close(self):
+        """ Releases the search context. Must not be called while a search is running. """
+        context, self._context = self._context, None
+        if context:
+            self._library.destroy_search_context(context)
 
-    @staticmethod
-    def _create_location(board_location):
-        """ creates a LOCATION from a BoardLocation """
-        return LOCATION(board_location.row, board_location.column)
+    def __del__(self):
+        if getattr(self, "_context", None):
+            self.close()
 
     @classmethod
     def _map_returned_action(cls, action):
@@ -121,13 +336,6 @@ class ExternalLibraryBinding:
         else:
             return None
 
-    @classmethod
-    def _create_player_locations(cls, board_locations):
-        """ creates a PLAYER_LOCATIONS from a list of BoardLocations """
-        location_array = [ExternalLibraryBinding._create_location(location) for location in board_locations]
-        player_locations = (LOCATION * len(location_array))(*location_array)
-        return PLAYER_LOCATIONS(locations=player_locations, num_players=len(location_array))
-
     @classmethod
     def _map_search_status(cls, status):
         """ creates a dict from a STATUS """
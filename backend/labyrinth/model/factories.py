@@ -2,11 +2,15 @@
 
 There are two ways of creating these objects: either by fully specifying all details, or
 by randomly generating layouts based with certain restrictions, based on the original game. """
+import functools
 import random
 import math
-from labyrinth.model.game import MazeCard, Maze, BoardLocation, Board, Game, Turns
+import types
+from labyrinth.model.game import MazeCard, Maze, BoardLocation, Board, Game, Turns, get_topology
 from labyrinth.model.exceptions import InvalidSizeException
 
+MAX_MAZE_SIZE = 101
+
 
 class MazeCardFactory:
     """ Constructs maze cards, taking care of unique ids """
@@ -47,11 +51,12 @@ def create_maze_and_leftover(size=7):
     randomly placed on the board, with the last remaing card beeing returned as the leftover.
     The ratios are approximately kept for other sizes, rounding in favor of corners and then straights.
     """
-    if _even(size) or not 2 < size < 32:
-        raise InvalidSizeException("Requested size {} is not an odd number between 2 and 32.".format(size))
+    if _even(size) or not 2 < size <= MAX_MAZE_SIZE:
+        raise InvalidSizeException("Requested size {} is not an odd number between 3 and {}.".format(
+            size, MAX_MAZE_SIZE))
     maze = Maze(maze_size=size)
 
-    fixed_cards = _determine_fixed_cards(size)
+    fixed_cards = _fixed_card_layout(size)
     remaining = size*size+1 - len(fixed_cards)
     free_cards_out_paths = _determine_free_cards_out_paths(remaining)
     card_factory = MazeCardFactory()
@@ -61,8 +66,7 @@ def create_maze_and_leftover(size=7):
 
     for location in maze.maze_locations:
         if location in fixed_cards:
-            maze[location] = card_factory.create_instance(fixed_cards[location].out_paths,
-                                                          fixed_cards[location].rotation)
+            maze[location] = card_factory.create_instance(*fixed_cards[location])
         else:
             maze[location] = card_iter.__next__()
 
@@ -70,12 +74,20 @@ def create_maze_and_leftover(size=7):
     return maze, leftover
 
 
+@functools.lru_cache(maxsize=None)
+def _fixed_card_layout(size):
+    """ Returns a read-only map from location to a tuple (out_paths, rotation) of the fixed cards.
+    The layout is computed once per size. """
+    return types.MappingProxyType({location: (maze_card.out_paths, maze_card.rotation)
+                                   for location, maze_card in _determine_fixed_cards(size).items()})
+
+
 def _determine_fixed_cards(size):
     """ Determines the locations, out paths and rotations for the fixed cards,
     according to the layout of the original game. The layout is generalized to arbitrary
     sizes.
     Returns a map from location to MazeCard. """
-    maze = Maze(maze_size=size)
+    topology = get_topology(size)
     border = size - 1
     center = border // 2
     fixed_corners = {
@@ -86,7 +98,8 @@ def _determine_fixed_cards(size):
     fixed_center = {}
     if border % 4 == 0:
         fixed_center[BoardLocation(center, center)] = MazeCard(out_paths=MazeCard.CROSS)
-    fixed_locations = [location for location in maze.maze_locations if _even(location.column) and _even(location.row)]
+    fixed_locations = [location for location in topology.maze_locations
+                       if _even(location.column) and _even(location.row)]
     fixed_t_juncts_locations = [location for location in fixed_locations
                                 if location not in fixed_corners and location not in fixed_center]
 
@@ -141,13 +154,14 @@ def create_board(maze_size=7):
     return Board(maze=maze, leftover_card=leftover)
 
 
-def create_game(maze_size=7, game_id=0, with_delay=True):
-    """ Creates a game instance with a random board. Player and piece initialization
+def create_game(maze_size=7, game_id=0, with_delay=True, board=None):
+    """ Creates a game instance with a random board, or the given board. Player and piece initialization
     is not done here. """
+    board = board or create_board(maze_size)
     if not with_delay:
-        return Game(game_id, board=create_board(maze_size), turns=Turns())
+        return Game(game_id, board=board, turns=Turns())
     else:
-        return Game(game_id, board=create_board(maze_size))
+        return Game(game_id, board=board)
 
 
 def create_maze(maze_string, maze_card_factory=None):
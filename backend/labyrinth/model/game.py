@@ -13,16 +13,24 @@ The Maze is a wrapper for a 2-d array of MazeCards, with convenient functions.
 A Piece represents a player, with a unique ID,
 a reference to a maze card the piece is currently positioned on and an objective.
 BoardLocation is a wrapper for a row and a column. If both are positive, the position is in the maze.
+
+MazeTopology holds the static data of a maze size, e.g. its locations and shift lines.
+It is computed once per maze size and shared by all mazes and boards of this size.
 """
+import copy
+import functools
 import itertools
-from threading import Thread
-import time
 import random
+import types
+import weakref
 from datetime import timedelta
 
 from labyrinth.model import exceptions
 from labyrinth.model import out_paths_dict
-from labyrinth.model.reachable import Graph
+from labyrinth.model import zobrist
+from labyrinth.model.node_buffer import NodeBuffer
+from labyrinth.model.reachable import Graph, ConnectedComponents
+from labyrinth.model.timers import shared_scheduler
 
 
 class BoardLocation:
@@ -30,7 +38,9 @@ class BoardLocation:
     The location does now know the extent of the maze.
     """
 
-    _HASH_MAX = 31
+    _HASH_MAX = 1024
+
+    __slots__ = ("row", "column")
 
     def __init__(self, row: int, column: int):
         self.row = row
@@ -58,6 +68,76 @@ class BoardLocation:
         return self.__str__()
 
 
+class MazeTopology:
+    """ The static data of a maze of a given size, which does not depend on the placed maze cards.
+
+    Instances are shared among all mazes and boards of the same size, and must not be altered.
+    Use get_topology() to retrieve the instance for a maze size. Copies and unpickled instances are the shared instance.
+    """
+
+    def __init__(self, maze_size):
+        self.maze_size = maze_size
+        self.maze_locations = tuple(BoardLocation(row, column)
+                                    for row in range(maze_size) for column in range(maze_size))
+        border = maze_size - 1
+        self.start_locations = (BoardLocation(0, 0),
+                                BoardLocation(0, border),
+                                BoardLocation(border, border),
+                                BoardLocation(border, 0))
+        self.shift_locations = frozenset(self._generate_shift_locations())
+        border_locations = [location for location in self.maze_locations
+                            if location.row in (0, border) or location.column in (0, border)]
+        self.shift_lines = types.MappingProxyType(
+            {location: tuple(self._generate_shift_line(location)) for location in border_locations})
+        self.opposing_border_locations = types.MappingProxyType(
+            {location: self._generate_opposing_border_location(location) for location in border_locations})
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return get_topology, (self.maze_size,)
+
+    def _generate_shift_locations(self):
+        maze_size = self.maze_size
+        for position in range(1, maze_size, 2):
+            yield BoardLocation(0, position)
+            yield BoardLocation(position, 0)
+            yield BoardLocation(maze_size - 1, position)
+            yield BoardLocation(position, maze_size - 1)
+
+    def _generate_shift_line(self, location):
+        """ Yields the locations of the line shifted by inserting at the given border location,
+        from the location of the inserted maze card to the location of the pushed out maze card """
+        row_delta, column_delta = self._shift_direction(location)
+        row, column = location.row, location.column
+        while 0 <= row < self.maze_size and 0 <= column < self.maze_size:
+            yield BoardLocation(row, column)
+            row, column = row + row_delta, column + column_delta
+
+    def _shift_direction(self, location):
+        if location.row == self.maze_size - 1:
+            return (-1, 0)
+        if location.row == 0:
+            return (1, 0)
+        if location.column == self.maze_size - 1:
+            return (0, -1)
+        return (0, 1)
+
+    def _generate_opposing_border_location(self, location):
+        row, column = location.row, location.column
+        limit = self.maze_size - 1
+        if row in (0, limit):
+            return BoardLocation(limit - row, column)
+        return BoardLocation(row, limit - column)
+
+
+@functools.lru_cache(maxsize=None)
+def get_topology(maze_size):
+    """ Returns the shared MazeTopology of the given maze size """
+    return MazeTopology(maze_size)
+
+
 class MazeCard:
     """ Represents one maze card
     The out_paths field defines the type of the card.
@@ -75,6 +155,8 @@ class MazeCard:
 
     _DIRECTIONS_BY_OUT_PATHS_ROTATED = out_paths_dict.dictionary
 
+    __slots__ = ("_out_paths", "_rotation", "_id")
+
     def __init__(self, identifier=0, out_paths=STRAIGHT, rotation=0):
         self._out_paths = out_paths
         self._rotation = rotation
@@ -143,6 +225,8 @@ class Piece:
     Each piece has a reference to a MazeCard instance as its current board position.
     """
 
+    __slots__ = ("piece_index", "maze_card")
+
     def __init__(self, piece_index, maze_card: MazeCard):
         self.piece_index = piece_index
         self.maze_card = maze_card
@@ -151,12 +235,22 @@ class Piece:
 class Maze:
     """ Represent the state of the maze.
     The state is maintained in a 2-d array of MazeCard instances.
+
+    An index from maze cards to their locations is built on the first lookup,
+    and maintained alongside the 2-d array from then on.
+
+    A maze can be forked. The fork shares the rows of the 2-d array with the original maze.
+    A row is copied as soon as either of the two mazes sets a maze card in this row (copy-on-write).
+    The location index is copied as soon as either of the two mazes sets a maze card.
     """
 
     def __init__(self, maze_size=7):
         self._maze_size = maze_size
-        self._maze_locations = [BoardLocation(row, column) for row in range(maze_size) for column in range(maze_size)]
+        self._topology = get_topology(maze_size)
         self._maze_cards = [[None for _ in range(maze_size)] for _ in range(maze_size)]
+        self._owned_rows = [True] * maze_size
+        self._card_locations = None
+        self._owns_card_locations = True
 
     @property
     def maze_size(self):
@@ -165,8 +259,13 @@ class Maze:
 
     @property
     def maze_locations(self):
-        """ Returns all BoardLocations of this maze """
-        return self._maze_locations
+        """ Returns all BoardLocations of this maze, row by row """
+        return self._topology.maze_locations
+
+    @property
+    def topology(self):
+        """ Getter for the shared MazeTopology of this maze's size """
+        return self._topology
 
     def __getitem__(self, location):
         """ Retrieves the maze card at a given location
@@ -186,15 +285,47 @@ class Maze:
         :param maze_card: the maze card to set
         """
         self._validate_location(location)
-        self._maze_cards[location.row][location.column] = maze_card
+        row = location.row
+        if not self._owned_rows[row]:
+            self._maze_cards[row] = list(self._maze_cards[row])
+            self._owned_rows[row] = True
+        if self._card_locations is not None:
+            self._update_card_locations(location, maze_card)
+        self._maze_cards[row][location.column] = maze_card
+
+    def _update_card_locations(self, location, maze_card):
+        if not self._owns_card_locations:
+            self._card_locations = dict(self._card_locations)
+            self._owns_card_locations = True
+        replaced = self._maze_cards[location.row][location.column]
+        if replaced is not None and self._card_locations.get(replaced) == location:
+            del self._card_locations[replaced]
+        if maze_card is not None:
+            self._card_locations[maze_card] = location
+
+    def fork(self):
+        """ Returns a copy of this maze, which shares all unchanged rows with this maze.
+
+        The maze cards themselves are not copied. """
+        forked = copy.copy(self)
+        forked._maze_cards = list(self._maze_cards)
+        forked._owned_rows = [False] * self._maze_size
+        self._owned_rows = [False] * self._maze_size
+        forked._owns_card_locations = False
+        self._owns_card_locations = False
+        return forked
 
     def maze_card_location(self, maze_card):
         """ Returns the BoardLocation of the given MazeCard,
         or None if the card is not in the maze """
-        for location in self.maze_locations:
-            if self[location] == maze_card:
-                return location
-        return None
+        if self._card_locations is None:
+            self._card_locations = {}
+            self._owns_card_locations = True
+            for location in reversed(self.maze_locations):
+                maze_card_at_location = self[location]
+                if maze_card_at_location is not None:
+                    self._card_locations[maze_card_at_location] = location
+        return self._card_locations.get(maze_card)
 
     def shift(self, location, inserted_maze_card):
         """ Performs a shifting action on the maze
@@ -204,55 +335,32 @@ class Maze:
         :raises InvalidShiftLocationException: for invalid shift location
         :return: the pushed out maze card
         """
-        self._validate_shift_location(location)
-        direction = self._determine_shift_direction(location)
-        shift_line_locations = []
-        current_location = location
-        while current_location is not None:
-            shift_line_locations.append(current_location)
-            current_location = self._neighbor(current_location, direction)
+        shift_line_locations = self.shift_line_locations(location)
         pushed_out = self[shift_line_locations[-1]]
         self._shift_all(shift_line_locations)
         self[shift_line_locations[0]] = inserted_maze_card
         return pushed_out
 
+    def shift_line_locations(self, location):
+        """ Returns the locations of the line which is shifted by inserting a maze card at the given location.
+
+        :param location: the location of the inserted maze card
+        :raises InvalidShiftLocationException: if the location is not on the border
+        :return: a tuple of BoardLocations, starting with the given location
+        and ending with the location of the pushed out maze card
+        """
+        self._validate_location(location)
+        try:
+            return self._topology.shift_lines[location]
+        except KeyError:
+            raise exceptions.InvalidShiftLocationException(
+                "Location {} is not shiftable (not on border)".format(str(location)))
+
     def _shift_all(self, shift_locations):
         """ Shifts the maze cards along the given locations """
         for source, target in reversed(list(zip(shift_locations, shift_locations[1:]))):
             self[target] = self[source]
 
-    def _determine_shift_direction(self, shift_location):
-        """ Returns the direction to shift to for a given location
-
-        :param shift_location: the location of the pushed in maze card
-        :raises InvalidShiftLocationException: if the location is not on the border
-        :return: the direction as a tuple
-        """
-        if shift_location.row == self._maze_size - 1:
-            return (-1, 0)
-        if shift_location.row == 0:
-            return (1, 0)
-        if shift_location.column == self._maze_size - 1:
-            return (0, -1)
-        if shift_location.column == 0:
-            return (0, 1)
-        raise exceptions.InvalidShiftLocationException(
-            "Location {} is not shiftable (not on border)".format(str(shift_location)))
-
-    def _neighbor(self, location, direction):
-        """ Determines the neighbor of a location, if possible.
-
-        :param location: the location the neighbor is requested for
-        :param direction: a tuple describing the position of the requested neighbor,
-        relative to the given location, e.g. (-1, 0) for the northern neighbor
-        :return: a new location in the given direction,
-        or None, if the location is outside of the maze's extent
-        """
-        new_location = location.add(*direction)
-        if not self.is_inside(new_location):
-            new_location = None
-        return new_location
-
     def is_inside(self, location):
         """ Determines if the given location is inside the maze """
         return location.row >= 0 and \
@@ -264,9 +372,6 @@ class Maze:
         if not self.is_inside(location):
             raise exceptions.InvalidLocationException("Location {} is outside of the maze.".format(str(location)))
 
-    def _validate_shift_location(self, location):
-        self._validate_location(location)
-
 
 class Board:
     """
@@ -277,13 +382,22 @@ class Board:
         if not maze:
             maze = Maze()
         self._maze = maze
-        self._shift_locations = self._generate_shift_locations()
+        self._shift_locations = maze.topology.shift_locations
         if not leftover_card:
             leftover_card = MazeCard()
         self._leftover_card = leftover_card
         if not objective_maze_card:
             objective_maze_card = self._find_new_objective_maze_card()
         self._objective_maze_card = objective_maze_card
+        self._version = 0
+        self._components = None
+        self._components_version = None
+        self._node_buffer = None
+        self._node_buffer_version = None
+        self._sharing_boards = None
+        self._previous_shift_location = None
+        self._state_hash = None
+        self.previous_move_path = None
 
     @property
     def leftover_card(self):
@@ -310,9 +424,97 @@ class Board:
         """ Getter for shift_locations """
         return self._shift_locations
 
+    @property
+    def previous_shift_location(self):
+        """ Getter for the location of the last shift, or None """
+        return self._previous_shift_location
+
+    @previous_shift_location.setter
+    def previous_shift_location(self, location):
+        """ Setter for the location of the last shift """
+        if self._state_hash is not None:
+            self._state_hash ^= zobrist.previous_shift_key(self._previous_shift_location) ^ \
+                zobrist.previous_shift_key(location)
+        self._previous_shift_location = location
+
+    @property
+    def state_hash(self):
+        """ Returns the Zobrist hash of the board state, a 64-bit integer.
+
+        It covers the card type and rotation at each location, the leftover, the positions of the pieces,
+        the objective and the previous shift location, but not the identifiers of the maze cards.
+        The hash is computed on first access, and then updated incrementally by shift() and move().
+        It does not reflect changes of the maze which are performed directly, without the board. """
+        if self._state_hash is None:
+            self._state_hash = self._partial_state_hash(self._maze.maze_locations)
+        return self._state_hash
+
+    def _partial_state_hash(self, locations):
+        """ Returns the XOR of the keys of the maze cards at the given locations, and of all other features """
+        maze = self._maze
+        state_hash = zobrist.card_key(None, self._leftover_card) ^ \
+            zobrist.objective_key(maze.maze_card_location(self._objective_maze_card)) ^ \
+            zobrist.previous_shift_key(self._previous_shift_location)
+        for location in locations:
+            state_hash ^= zobrist.card_key(location, maze[location])
+        for piece in self._pieces:
+            state_hash ^= zobrist.piece_key(piece.piece_index, maze.maze_card_location(piece.maze_card))
+        return state_hash
+
+    @property
+    def version(self):
+        """ Getter for version. The version is increased with every shift of the maze. """
+        return self._version
+
+    def _components_up_to_date(self):
+        return self._components is not None and self._components_version == self._version
+
+    def connected_components(self):
+        """ Returns the ConnectedComponents of the current maze.
+
+        The components are labeled at most once per board version.
+        Components which are up to date are updated incrementally by a shift. """
+        if not self._components_up_to_date():
+            self._components = ConnectedComponents(self._maze)
+            self._components_version = self._version
+        return self._components
+
+    def _update_components(self, shift_location):
+        """ Incrementally updates up-to-date connected components after the maze was shifted """
+        if self._components_up_to_date():
+            self._components.update(self._maze.shift_line_locations(shift_location))
+            self._components_version = self._version + 1
+
+    def node_buffer(self):
+        """ Returns the NodeBuffer of the current maze and leftover, e.g. to pass the board to a solver library.
+
+        The buffer is created at most once per board version, and updated in place by a shift.
+        It is altered by later shifts, so it has to be copied if it is used beyond the current board version. """
+        if self._node_buffer is None or self._node_buffer_version != self._version:
+            self._node_buffer = NodeBuffer(self)
+            self._node_buffer_version = self._version
+        return self._node_buffer
+
+    def _update_node_buffer(self, shift_location):
+        """ Updates an up-to-date node buffer after the maze was shifted """
+        if self._node_buffer is not None and self._node_buffer_version == self._version:
+            self._node_buffer.update(self, shift_location)
+            self._node_buffer_version = self._version + 1
+
+    def reachable_locations(self, location):
+        """ Returns all locations which are reachable from the given location, as a frozenset """
+        return self.connected_components().component_of(location)
+
+    def reachable_locations_by_piece(self):
+        """ Returns a dictionary which maps each piece to the locations reachable from its current location """
+        components = self.connected_components()
+        return {piece: components.component_of(self._maze.maze_card_location(piece.maze_card))
+                for piece in self._pieces}
+
     def clear_pieces(self):
         """ Removes all pieces currently on the board """
         self._pieces.clear()
+        self._state_hash = None
 
     def create_piece(self):
         """ Creates and places a piece on the board.
@@ -327,20 +529,14 @@ class Board:
         assert piece not in self._pieces
         self._place_piece_start_location(piece)
         self._pieces.append(piece)
+        self._toggle_piece_hash(piece)
 
     def _place_piece_start_location(self, piece):
         piece_index = piece.piece_index
-        start_locations = self._start_locations()
+        start_locations = self._maze.topology.start_locations
         start_location = start_locations[piece_index % len(start_locations)]
         piece.maze_card = self._maze[start_location]
 
-    def _start_locations(self):
-        maze_size = self.maze.maze_size
-        return [BoardLocation(0, 0),
-                BoardLocation(0, maze_size - 1),
-                BoardLocation(maze_size - 1, maze_size - 1),
-                BoardLocation(maze_size - 1, 0)]
-
     def _next_free_piece_index(self):
         current_piece_indices = set(map(lambda piece: piece.piece_index, self._pieces))
         next_index = 0
@@ -353,58 +549,117 @@ class Board:
     def remove_piece(self, piece):
         """ Removes a piece from the board """
         self._pieces.remove(piece)
+        self._toggle_piece_hash(piece)
+
+    def _toggle_piece_hash(self, piece):
+        if self._state_hash is not None:
+            self._state_hash ^= zobrist.piece_key(piece.piece_index, self._maze.maze_card_location(piece.maze_card))
+
+    def fork(self):
+        """ Returns a copy of this board for simulations, e.g. to try out a shift.
+
+        Shifts and moves on the fork do not alter this board, and vice versa.
+        The copy is cheap: the maze is forked, maze cards are shared.
+        Only the pieces are copied. They are in the same order as the pieces of this board.
+        As long as a board shares maze cards with another live board, its leftover is copied on each shift,
+        because its rotation is changed. Boards which share maze cards are kept in a weak set, so that
+        the original stops copying once its forks have been discarded. """
+        forked = copy.copy(self)
+        forked._maze = self._maze.fork()
+        forked._pieces = [Piece(piece.piece_index, piece.maze_card) for piece in self._pieces]
+        if self._components is not None:
+            forked._components = self._components.fork(forked._maze)
+        if self._node_buffer is not None:
+            forked._node_buffer = self._node_buffer.fork()
+        if self._sharing_boards is None:
+            self._sharing_boards = weakref.WeakSet([self])
+        self._sharing_boards.add(forked)
+        forked._sharing_boards = self._sharing_boards
+        return forked
+
+    def _shares_maze_cards(self):
+        """ Returns True iff another live board may reference the maze cards of this board """
+        return self._sharing_boards is not None and len(self._sharing_boards) > 1
 
     def shift(self, shift_location: BoardLocation, leftover_rotation: int):
         """ Performs a shifting action """
         self._validate_shift_location(shift_location)
+        line = self._maze.shift_line_locations(shift_location)
+        if self._state_hash is not None:
+            self._state_hash ^= self._partial_state_hash(line)
+        if self._shares_maze_cards():
+            self._copy_leftover_card()
         self._leftover_card.rotation = leftover_rotation
         pushed_card = self._leftover_card
         self._leftover_card = self._maze.shift(shift_location, self._leftover_card)
+        self._update_components(shift_location)
+        self._update_node_buffer(shift_location)
+        self._version += 1
+        self.previous_move_path = None
         for card_piece in self._find_pieces_by_maze_card(self._leftover_card):
             card_piece.maze_card = pushed_card
+        self._previous_shift_location = shift_location
+        if self._state_hash is not None:
+            self._state_hash ^= self._partial_state_hash(line)
+
+    def _copy_leftover_card(self):
+        """ Replaces the leftover by a copy, so that a maze card shared with a forked board is not altered """
+        leftover_copy = MazeCard(self._leftover_card.identifier, self._leftover_card.out_paths,
+                                 self._leftover_card.rotation)
+        if self._objective_maze_card is self._leftover_card:
+            self._objective_maze_card = leftover_copy
+        self._leftover_card = leftover_copy
 
     def move(self, piece, target_location):
-        """ Performs a move action. Returns True iff objective was reached. """
+        """ Performs a move action. Returns True iff objective was reached.
+        The path of the move is stored in previous_move_path, until the next shift. """
         piece_location = self._maze.maze_card_location(piece.maze_card)
         target = self._maze[target_location]
-        self._validate_move_location(piece_location, target_location)
+        path = self.find_path(piece_location, target_location)
+        if path is None:
+            raise exceptions.MoveUnreachableException("Locations {} and {} are not connected".format(
+                piece_location, target_location))
+        if self._state_hash is not None:
+            self._state_hash ^= zobrist.piece_key(piece.piece_index, piece_location) ^ \
+                zobrist.piece_key(piece.piece_index, target_location)
         piece.maze_card = target
+        self.previous_move_path = path
         if target == self.objective_maze_card:
             self._objective_maze_card = self._find_new_objective_maze_card()
+            if self._state_hash is not None:
+                self._state_hash ^= zobrist.objective_key(target_location) ^ \
+                    zobrist.objective_key(self._maze.maze_card_location(self._objective_maze_card))
             return True
         return False
 
     def opposing_border_location(self, border_location):
         """ Returns the location directly opposite of the given location on the border """
-        row, column = border_location.row, border_location.column
-        limit = self.maze.maze_size - 1
-        borders = {0, limit}
-        if row in borders:
-            return BoardLocation(limit - row, column)
-        if column in borders:
-            return BoardLocation(row, limit - column)
-        raise exceptions.InvalidStateException("Location {} is not on the border".format(border_location))
+        try:
+            return self._maze.topology.opposing_border_locations[border_location]
+        except KeyError:
+            raise exceptions.InvalidStateException("Location {} is not on the border".format(border_location))
 
-    def _validate_move_location(self, piece_location, target_location):
-        if not Graph(self._maze).is_reachable(piece_location, target_location):
-            raise exceptions.MoveUnreachableException("Locations {} and {} are not connected".format(
-                piece_location, target_location))
+    def enabled_shift_locations(self, previous_shift_location=None):
+        """ Returns the shift locations which are admissible after a shift at the given location,
+        i.e. all shift locations without the one opposing the previous shift location (no-pushback rule) """
+        opposing_shift_location = None
+        if previous_shift_location:
+            opposing_shift_location = self.opposing_border_location(previous_shift_location)
+        return self._shift_locations.difference({opposing_shift_location})
+
+    def find_path(self, source_location, target_location):
+        """ Returns a shortest path between two locations as a list of BoardLocations, or None if they are not
+        connected. Unconnected locations are detected in constant time if the connected components are up to date. """
+        if self._components_up_to_date() and \
+                not self._components.same_component(source_location, target_location):
+            return None
+        return Graph(self._maze).find_path(source_location, target_location)
 
     def _validate_shift_location(self, location):
         if location not in self._shift_locations:
             raise exceptions.InvalidShiftLocationException(
                 "Location {} is not shiftable (fixed maze cards)".format(str(location)))
 
-    def _generate_shift_locations(self):
-        maze_size = self.maze.maze_size
-        shift_locations = []
-        for position in range(1, maze_size, 2):
-            shift_locations.append(BoardLocation(0, position))
-            shift_locations.append(BoardLocation(position, 0))
-            shift_locations.append(BoardLocation(maze_size - 1, position))
-            shift_locations.append(BoardLocation(position, maze_size - 1))
-        return frozenset(shift_locations)
-
     def _find_pieces_by_maze_card(self, maze_card):
         """ Finds pieces whose maze_card field matches the given maze card
 
@@ -414,7 +669,7 @@ class Board:
 
     def _find_new_objective_maze_card(self):
         """ Finds a random maze card not occupied by a player's piece """
-        start_locations = self._start_locations()
+        start_locations = self._maze.topology.start_locations
         possible_locations = [location for location in self._maze.maze_locations if location not in start_locations]
         maze_cards = set([self._maze[location]
                           for location in possible_locations] + [self._leftover_card])
@@ -429,6 +684,8 @@ class Player:
     Invariants: Board and Game are either both set or both None.
     If both are set, piece is set as well. """
 
+    __slots__ = ("_id", "_piece", "_board", "_game", "score", "player_name")
+
     def __init__(self, identifier, game=None, piece=None, player_name=None):
         """ board and game can only be set together. """
         self._id = identifier
@@ -491,6 +748,8 @@ class PlayerAction:
     PREPARE_SHIFT = "PREPARE_SHIFT"
     PREPARE_MOVE = "PREPARE_MOVE"
 
+    __slots__ = ("_player", "_action", "_turn_callback")
+
     def __init__(self, player, action, turn_callback=None):
         """
         :param player: a Player instance
@@ -542,60 +801,86 @@ class Turns:
     """ This class contains the turn progression.
 
     It manages player's turns and the correct order of their actions.
+    Each player has four consecutive turn states, one for each action in _ACTIONS.
+    A turn state is encoded as an integer, player index * 4 + action index.
+    PlayerAction instances are only created when requested.
+
+    Transitions after a prepare delay are scheduled on a DelayScheduler, by default the shared one.
     """
 
-    def __init__(self, prepare_delay=timedelta(0), players=None, next_action=None):
+    _ACTIONS = (PlayerAction.PREPARE_SHIFT, PlayerAction.SHIFT_ACTION,
+                PlayerAction.PREPARE_MOVE, PlayerAction.MOVE_ACTION)
+    _ACTION_INDEX = {action: index for index, action in enumerate(_ACTIONS)}
+
+    __slots__ = ("_turn_changed_listeners", "_players", "_turn_callbacks", "_prepare_delay", "_next",
+                 "_delay_scheduler", "_delayed_transition")
+
+    def __init__(self, prepare_delay=timedelta(0), players=None, next_action=None, delay_scheduler=None):
         self._turn_changed_listeners = []
-        self._turn_states = []
+        self._players = []
+        self._turn_callbacks = []
         self._prepare_delay = prepare_delay
+        self._delay_scheduler = delay_scheduler or shared_scheduler()
+        self._delayed_transition = None
         self.init(players)
-        self._next = self._turn_states.index(next_action) if next_action else 0
+        self._next = self._state_of(next_action) if next_action else 0
         if self._next_action_is_prepare() and not self._prepare_delay:
             self._next += 1
 
     def init(self, players=None):
         """ clears turn progression, adds all players """
-        self._turn_states = []
+        self._players = []
+        self._turn_callbacks = []
         if players:
             for player in players:
                 player.register_in_turns(self)
 
     def _num_players(self):
-        return len(self._turn_states) // 4
+        return len(self._players)
+
+    def _num_states(self):
+        return len(self._players) * len(self._ACTIONS)
+
+    def _state_of(self, player_action):
+        """ Returns the integer-encoded turn state of a PlayerAction """
+        player_index = next(index for index, player in enumerate(self._players)
+                            if player.identifier == player_action.player.identifier)
+        return player_index * len(self._ACTIONS) + self._ACTION_INDEX[player_action.action]
+
+    def _player_action_of(self, state):
+        player_index, action_index = divmod(state, len(self._ACTIONS))
+        return PlayerAction(self._players[player_index], self._ACTIONS[action_index],
+                            self._turn_callbacks[player_index])
 
     def add_player(self, player, turn_callback=None):
         """ Adds a player to the turn progression, if he is not present already """
-        already_present = any(
-            player_action.player == player
-            for player_action in self._turn_states
-        )
-        if not already_present:
-            self._turn_states.append(PlayerAction(player, PlayerAction.PREPARE_SHIFT, turn_callback))
-            self._turn_states.append(PlayerAction(player, PlayerAction.SHIFT_ACTION, turn_callback))
-            self._turn_states.append(PlayerAction(player, PlayerAction.PREPARE_MOVE, turn_callback))
-            self._turn_states.append(PlayerAction(player, PlayerAction.MOVE_ACTION, turn_callback))
+        if player not in self._players:
+            self._players.append(player)
+            self._turn_callbacks.append(turn_callback)
 
     def remove_player(self, player_to_remove):
         """ Removes all PlayerActions with this player. If it was this player's turn to play, the next
         Player has to play and listeners have to be notified. """
-        def next_player(state_list):
-            next_player_index = (self._next + 4) % len(state_list)
-            return state_list[next_player_index].player
-
-        old_next_player_action = self.next_player_action()
-        old_player_actions = self._turn_states
-        self._turn_states = [player_action for player_action in self._turn_states
-                             if player_action.player != player_to_remove]
-        if self._turn_states:
-            if old_next_player_action.player == player_to_remove:
-                new_next_player_action = PlayerAction(next_player(old_player_actions), PlayerAction.PREPARE_SHIFT)
-                self.set_next(new_next_player_action)
+        if player_to_remove not in self._players:
+            return
+        removed_index = self._players.index(player_to_remove)
+        next_player_index, next_action_index = divmod(self._next, len(self._ACTIONS))
+        next_player = self._players[(next_player_index + 1) % len(self._players)]
+        del self._players[removed_index]
+        del self._turn_callbacks[removed_index]
+        if next_player_index == removed_index:
+            self._cancel_delayed_transition()
+        if self._players:
+            if next_player_index == removed_index:
+                self.set_next(index=self._players.index(next_player) * len(self._ACTIONS))
             else:
-                self._next = self._turn_states.index(old_next_player_action)
+                if removed_index < next_player_index:
+                    next_player_index -= 1
+                self._next = next_player_index * len(self._ACTIONS) + next_action_index
 
     def start(self):
         """ Starts the progression, informs player if necessary """
-        if self._turn_states:
+        if self._players:
             self.set_next(index=0)
 
     def is_action_possible(self, player, action):
@@ -605,8 +890,12 @@ class Turns:
         :param action: one of PlayerAction.MOVE_ACTION and PlayerAction.SHIFT_ACTION
         :return: true, iff the action is to be performed by the player
         """
-        return (action is PlayerAction.MOVE_ACTION or action is PlayerAction.SHIFT_ACTION) and \
-            self.next_player_action() == PlayerAction(player, action)
+        if not (action is PlayerAction.MOVE_ACTION or action is PlayerAction.SHIFT_ACTION) or \
+                self._next >= self._num_states():
+            return False
+        player_index, action_index = divmod(self._next, len(self._ACTIONS))
+        return self._players[player_index].identifier == player.identifier and \
+            self._ACTIONS[action_index] == action
 
     def perform_action(self, player, action):
         """Method to call when a player performed the given action.
@@ -623,38 +912,50 @@ class Turns:
         self.set_next()
 
     def _next_action_is_prepare(self):
-        return self.next_player_action() and self.next_player_action().is_prepare()
+        return self._next < self._num_states() and \
+            self._ACTIONS[self._next % len(self._ACTIONS)] in (PlayerAction.PREPARE_SHIFT, PlayerAction.PREPARE_MOVE)
 
     def set_next(self, player_action=None, index=None):
-        assert self._turn_states
+        assert self._players
         if player_action:
-            next_index = self._turn_states.index(player_action)
+            next_index = self._state_of(player_action)
         elif index is not None:
             next_index = index
         else:
-            next_index = (self._next + 1) % len(self._turn_states)
+            next_index = (self._next + 1) % self._num_states()
         self._next = next_index
-        if self.next_player_action().is_prepare():
+        self._cancel_delayed_transition()
+        if self._next_action_is_prepare():
             if self._prepare_delay:
                 self._notify_turn_changed_listeners()
-                Thread(target=self._delay_next_state, args=[self.next_player_action()]).start()
+                self._delayed_transition = self._delay_scheduler.call_later_on_worker(
+                    self._prepare_delay, self._delay_next_state, self.next_player_action())
             else:
                 self.set_next()
         else:
             self._notify_turn_changed_listeners()
 
     def _delay_next_state(self, next_player_action):
-        time.sleep(self._prepare_delay.total_seconds())
         # check that state was not changed, e.g. due to removed player
         if next_player_action == self.next_player_action():
             self.set_next()
 
+    def _cancel_delayed_transition(self):
+        if self._delayed_transition is not None:
+            self._delayed_transition.cancel()
+            self._delayed_transition = None
+
+    def player_after(self, player):
+        """ Returns the player whose turn follows the turn of the given player """
+        player_index = next(index for index, current in enumerate(self._players)
+                            if current.identifier == player.identifier)
+        return self._players[(player_index + 1) % len(self._players)]
+
     def next_player_action(self):
         """ Returns the next PlayerAction in the turn progression """
-        try:
-            return self._turn_states[self._next]
-        except IndexError:
+        if self._next >= self._num_states():
             return None
+        return self._player_action_of(self._next)
 
     @property
     def prepare_delay(self):
@@ -692,6 +993,16 @@ class Game:
         self.previous_shift_location = None
         self._turn_listeners = []
 
+    @property
+    def previous_shift_location(self):
+        """ Getter for the location of the previous shift, which is kept by the board """
+        return self._board.previous_shift_location
+
+    @previous_shift_location.setter
+    def previous_shift_location(self, location):
+        """ Setter for the location of the previous shift """
+        self._board.previous_shift_location = location
+
     @property
     def turns(self):
         """ Getter for turns """
@@ -765,8 +1076,8 @@ class Game:
         for player in self._players:
             player.score = 0
             player.reset_board(new_board)
-        self.previous_shift_location = None
         self._board = new_board
+        self.previous_shift_location = None
         self._turns.start()
 
     def shift(self, player_id, new_leftover_location, leftover_rotation):
@@ -801,10 +1112,7 @@ class Game:
         """ Returns all currently enabled shift locations.
         These are the shift locations of the board, without the shift location of the previous turn
         """
-        opposing_shift_location = None
-        if self.previous_shift_location:
-            opposing_shift_location = self.board.opposing_border_location(self.previous_shift_location)
-        return self.board.shift_locations.difference({opposing_shift_location})
+        return self.board.enabled_shift_locations(self.previous_shift_location)
 
     def _validate_pushback_rule(self, shift_location):
         """ Checks if the requested shift location is different to the shift location of the previous turn
@@ -0,0 +1,57 @@
+""" This module provides the nodes of a board in the memory layout of the solver libraries.
+
+The solver libraries expect the maze as an array of CNode structs (see algolibs/solvers/c_api.h):
+an unsigned 32-bit identifier, an 8-bit out-paths bitmask, and a signed 16-bit rotation, 8 bytes per node.
+A NodeBuffer holds these nodes in a NumPy structured array with the same layout, so that it can be passed to
+a library without conversion. It is kept up to date incrementally: a shift only rewrites the shifted line and
+the leftover.
+"""
+import numpy as np
+
+NODE_DTYPE = np.dtype({"names": ["node_id", "out_paths", "rotation"],
+                       "formats": [np.uint32, np.uint8, np.int16],
+                       "offsets": [0, 4, 6],
+                       "itemsize": 8})
+
+_BIT_BY_OUT_PATH = {"N": 1, "E": 2, "S": 4, "W": 8}
+
+
+def out_paths_bitmask(out_paths):
+    """ Returns the bitmask of out-paths given as a string of directions, e.g. 'NES' """
+    mask = 0
+    for out_path in out_paths:
+        mask |= _BIT_BY_OUT_PATH[out_path]
+    return mask
+
+
+class NodeBuffer:
+    """ The maze cards of a board as an array of CNode structs.
+
+    The nodes are the maze cards row by row, followed by the leftover.
+    The instance does not observe the board. After a shift, update() has to be called with the shift location.
+    """
+
+    def __init__(self, board):
+        maze = board.maze
+        self.extent = maze.maze_size
+        self.nodes = np.empty(self.extent * self.extent + 1, dtype=NODE_DTYPE)
+        for index, location in enumerate(maze.maze_locations):
+            self._write(index, maze[location])
+        self._write(len(self.nodes) - 1, board.leftover_card)
+
+    def update(self, board, shift_location):
+        """ Rewrites the nodes of the line shifted at shift_location, and the leftover """
+        maze = board.maze
+        for location in maze.shift_line_locations(shift_location):
+            self._write(location.row * self.extent + location.column, maze[location])
+        self._write(len(self.nodes) - 1, board.leftover_card)
+
+    def fork(self):
+        """ Returns a copy of this buffer """
+        forked = NodeBuffer.__new__(NodeBuffer)
+        forked.extent = self.extent
+        forked.nodes = self.nodes.copy()
+        return forked
+
+    def _write(self, index, maze_card):
+        self.nodes[index] = (maze_card.identifier, out_paths_bitmask(maze_card.out_paths), maze_card.rotation)
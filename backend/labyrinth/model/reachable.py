@@ -1,7 +1,14 @@
 """ This module deals with graph algorithms performed on the maze,
 
-Currently it only has one class to compute all reachable locations.
+Graph computes all reachable locations from a given source with a BFS,
+and finds a path between two locations with an A* search, which stops as soon as the target is reached.
+ConnectedComponents labels all locations of the maze with their connected component in a single pass,
+so that reachability queries can be answered in constant time afterwards.
+After a shift, the labels are updated incrementally.
 """
+import copy
+import heapq
+import itertools
 from collections import deque
 
 
@@ -15,7 +22,7 @@ class Graph:
         self._reached_locations = {}
 
     def is_reachable(self, source_location, target_location) -> bool:
-        """ Performs a BFS in a graph represented by the current maze to
+        """ Searches a path in a graph represented by the current maze to
         verify if the source location and the target location
         are connected.
 
@@ -23,8 +30,48 @@ class Graph:
         :param target_location: the requested BoardLocation
         :return: True, iff there is a path between the two locations
         """
-        reachable_locations = self.reachable_locations(source_location)
-        return target_location in reachable_locations
+        return self.find_path(source_location, target_location) is not None
+
+    def find_path(self, source_location, target_location):
+        """ Performs an A* search from the source to the target location, using the chessboard distance
+        as heuristic. The search stops as soon as the target is reached.
+
+        :param source_location: the BoardLocation to start from
+        :param target_location: the requested BoardLocation
+        :return: a list of BoardLocations from source to target, both inclusive, or None if they are not connected
+        """
+        def heuristic(location):
+            return max(abs(location.row - target_location.row), abs(location.column - target_location.column))
+
+        tie_breaker = itertools.count()
+        self._reached_locations = set()
+        predecessors = {source_location: None}
+        distances = {source_location: 0}
+        open_locations = [(heuristic(source_location), next(tie_breaker), source_location)]
+        while open_locations:
+            _, _, current = heapq.heappop(open_locations)
+            if current in self._reached_locations:
+                continue
+            if current == target_location:
+                return self._backtrack(predecessors, target_location)
+            self._reached_locations.add(current)
+            for neighbor in self._neighbors(current):
+                distance = distances[current] + 1
+                if neighbor not in distances or distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current
+                    heapq.heappush(open_locations, (distance + heuristic(neighbor), next(tie_breaker), neighbor))
+        return None
+
+    @staticmethod
+    def _backtrack(predecessors, target_location):
+        path = []
+        current = target_location
+        while current is not None:
+            path.append(current)
+            current = predecessors[current]
+        path.reverse()
+        return path
 
     def reachable_locations(self, source):
         """ Performs a BFS, returning all reachable BoardLocations.
@@ -55,3 +102,75 @@ class Graph:
                     card_to_test = self._maze[location_to_test]
                     if card_to_test.has_rotated_out_path(_mirror(delta)):
                         yield location_to_test
+
+
+class ConnectedComponents:
+    """ Labels all locations of a maze with the connected component they belong to.
+
+    The labeling is performed once, on construction. Afterwards, the component of any location
+    can be retrieved in constant time. The instance does not observe the maze.
+    If maze cards have been replaced, update() has to be called with the changed locations.
+    """
+    _NEIGHBOR_DELTAS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+    def __init__(self, maze):
+        self._maze = maze
+        self._label_by_location = {}
+        self._components = {}
+        self._next_label = 0
+        self._label(self._maze.maze_locations)
+
+    def component_of(self, location):
+        """ Returns the connected component of the given location
+
+        :param location: a BoardLocation inside the maze
+        :return: a frozenset of BoardLocations
+        """
+        return self._components[self._label_by_location[location]]
+
+    def same_component(self, location, other_location) -> bool:
+        """ Returns True, iff there is a path between the two locations """
+        return self._label_by_location[location] == self._label_by_location[other_location]
+
+    def fork(self, maze):
+        """ Returns a copy of this labeling for the given maze, which has to be equal to the labeled maze,
+        e.g. a fork of it. """
+        forked = copy.copy(self)
+        forked._maze = maze
+        forked._label_by_location = dict(self._label_by_location)
+        forked._components = dict(self._components)
+        return forked
+
+    def update(self, changed_locations):
+        """ Relabels the components after the maze cards at the given locations have changed,
+        e.g. the shift line after a shift.
+
+        Only paths which start or end at a changed location can have changed. Hence, only the components
+        containing a changed location or one of its neighbors are dissolved and labeled again.
+
+        :param changed_locations: an iterable of BoardLocations whose maze cards have been replaced
+        """
+        affected_labels = set()
+        for location in changed_locations:
+            affected_labels.add(self._label_by_location[location])
+            for delta in self._NEIGHBOR_DELTAS:
+                neighbor = location.add(*delta)
+                if self._maze.is_inside(neighbor):
+                    affected_labels.add(self._label_by_location[neighbor])
+        affected_locations = set()
+        for label in affected_labels:
+            affected_locations.update(self._components.pop(label))
+        for location in affected_locations:
+            del self._label_by_location[location]
+        self._label(affected_locations)
+
+    def _label(self, locations):
+        graph = Graph(self._maze)
+        for location in locations:
+            if location not in self._label_by_location:
+                component = frozenset(graph.reachable_locations(location))
+                label = self._next_label
+                self._next_label += 1
+                self._components[label] = component
+                for component_location in component:
+                    self._label_by_location[component_location] = label
@@ -0,0 +1,145 @@
+""" This module provides a cache of solver results.
+
+A search result only depends on the computation method, the board state, the searching piece,
+and the previous shift location. The board state is identified by its symmetry-canonical hash
+(see symmetry.canonical_form), so that all eight orientations of a position share one entry.
+Actions are stored in the canonical orientation, and mapped back to the orientation of the searched board.
+The canonical form hashes the whole board eight times. For mazes larger than CANONICAL_MAX_MAZE_SIZE,
+where this is expensive and transformed positions rarely recur, the incrementally maintained Board.state_hash
+identifies the board state instead, and actions are stored in the orientation of the searched board.
+Only results of searches which have terminated are cached, i.e. actions which are guaranteed to reach the objective
+(or, for minimax, whose outcome is decided). Results of aborted searches depend on the available time.
+
+The cache keeps the most recently used entries in memory. Optionally, all entries are also written to an
+SQLite database, which is consulted on misses in memory, so that results survive restarts.
+"""
+import collections
+import json
+import sqlite3
+import threading
+
+from labyrinth.model import zobrist
+from labyrinth.model.game import BoardLocation
+from labyrinth.model.symmetry import Transform, canonical_form
+
+
+class SearchKey:
+    """ The key of a search, together with the transform of the searched board to its canonical orientation """
+
+    __slots__ = ("key", "transform", "maze_size", "leftover_out_paths")
+
+    def __init__(self, key, transform, maze_size, leftover_out_paths):
+        self.key = key
+        self.transform = transform
+        self.maze_size = maze_size
+        self.leftover_out_paths = leftover_out_paths
+
+
+class SolverCache:
+    """ A bounded LRU cache from search keys to actions, optionally backed by an SQLite database """
+
+    CANONICAL_MAX_MAZE_SIZE = 9
+
+    def __init__(self, capacity=4096, database_path=None):
+        """
+        :param capacity: the maximum number of entries kept in memory
+        :param database_path: the path of an SQLite database file, or None to keep entries in memory only
+        """
+        self._capacity = capacity
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._connection = None
+        if database_path is not None:
+            self._connection = sqlite3.connect(database_path, check_same_thread=False)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS solver_cache (key TEXT PRIMARY KEY, action TEXT)")
+            self._connection.commit()
+
+    @staticmethod
+    def search_key(compute_method, board, piece, previous_shift_location):
+        """ Returns the SearchKey of a search for the given piece on the given board """
+        if board.maze.maze_size <= SolverCache.CANONICAL_MAX_MAZE_SIZE:
+            board_hash, transform = canonical_form(board, previous_shift_location)
+        else:
+            board_hash, transform = board.state_hash, Transform()
+            if previous_shift_location is not None:
+                board_hash ^= zobrist.previous_shift_key(board.previous_shift_location) ^ \
+                    zobrist.previous_shift_key(previous_shift_location)
+        return SearchKey((compute_method, board_hash, piece.piece_index), transform,
+                         board.maze.maze_size, board.leftover_card.out_paths)
+
+    def lookup(self, search_key):
+        """ Returns the cached action for a SearchKey, in the orientation of the searched board, or None """
+        action = self.get(search_key.key)
+        if action is not None:
+            action = search_key.transform.unmap_action(action, search_key.maze_size, search_key.leftover_out_paths)
+        return action
+
+    def store(self, search_key, action):
+        """ Caches the action found for a SearchKey """
+        self.put(search_key.key,
+                 search_key.transform.map_action(action, search_key.maze_size, search_key.leftover_out_paths))
+
+    def get(self, key):
+        """ Returns the cached action for the given key, or None. Keys are tuples of strings and integers """
+        with self._lock:
+            action = self._entries.get(key)
+            if action is not None:
+                self._entries.move_to_end(key)
+            elif self._connection is not None:
+                action = self._load(key)
+                if action is not None:
+                    self._store_in_memory(key, action)
+            if action is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return action
+
+    def put(self, key, action):
+        """ Caches an action, as returned by ExternalLibraryBinding.find_action """
+        with self._lock:
+            self._store_in_memory(key, action)
+            if self._connection is not None:
+                self._connection.execute("INSERT OR REPLACE INTO solver_cache (key, action) VALUES (?, ?)",
+                                         (json.dumps(key), _action_to_json(action)))
+                self._connection.commit()
+
+    def metrics(self):
+        """ Returns a dictionary with the number of hits, misses, the hit rate and the number of entries in memory """
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / requests if requests else 0.0,
+                "size": len(self._entries),
+            }
+
+    def close(self):
+        """ Closes the database connection """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _store_in_memory(self, key, action):
+        self._entries[key] = action
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        row = self._connection.execute("SELECT action FROM solver_cache WHERE key = ?", (json.dumps(key),)).fetchone()
+        return _json_to_action(row[0]) if row else None
+
+
+def _action_to_json(action):
+    (shift_location, rotation), move_location = action
+    return json.dumps([shift_location.row, shift_location.column, rotation, move_location.row, move_location.column])
+
+
+def _json_to_action(action_json):
+    shift_row, shift_column, rotation, move_row, move_column = json.loads(action_json)
+    return (BoardLocation(shift_row, shift_column), rotation), BoardLocation(move_row, move_column)
@@ -0,0 +1,228 @@
+""" This module provides a pool of worker processes which run searches of the solver libraries.
+
+Searches running in threads of the server process share one interpreter and, for libraries without search contexts,
+the libraries' global state. The SolverService instead runs each search in one of its worker processes.
+The workers preload the libraries on start. A search is sent to a worker as a SearchInstance, which consists of plain
+Python values only, together with its deadline, at which the library stops the search. The deadline is determined
+on submission, so that the time a search waits for a free worker is part of its time budget.
+Each search is also sent an abort event, which is shared with the server process by a multiprocessing manager.
+A thread of the worker aborts the search in the library, as soon as the event is set.
+
+Speculative searches run on a separate pool of worker processes with lower scheduling priority, so that they
+neither wait in front of nor slow down the searches of bots whose turn it is.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import multiprocessing
+import os
+import threading
+import time
+
+import labyrinth.model.external_library as extlib
+
+
+class SolverService:
+    """ Runs searches on a pool of worker processes, and keeps track of queue depth and latencies.
+
+    The pool is started by start(), or with the first submitted search.
+    The pool of speculative searches is started with the first submitted speculative search.
+    Speculative searches are not included in the metrics.
+    """
+
+    def __init__(self, library_paths=(), max_workers=None, time_budget=timedelta(seconds=3), search_threads=1,
+                 max_speculations=1):
+        """
+        :param library_paths: paths of the libraries which are loaded by each worker on start
+        :param max_workers: the number of worker processes, by default the number of available cores
+        :param time_budget: the default time after which a search is aborted, measured from its submission
+        :param search_threads: the number of threads of each search, see ExternalLibraryBinding
+        :param max_speculations: the number of worker processes of speculative searches
+        """
+        self._library_paths = tuple(library_paths)
+        self._max_workers = max_workers or _available_cores()
+        self._max_speculations = max_speculations
+        self._time_budget = time_budget
+        self._search_threads = search_threads
+        self._context = multiprocessing.get_context("spawn")
+        self._executor = None
+        self._speculation_executor = None
+        self._manager = None
+        self._abort_events = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    @property
+    def max_workers(self):
+        """ The number of worker processes """
+        return self._max_workers
+
+    def start(self):
+        """ Starts the worker processes, so that the first searches do not wait for them to load the libraries """
+        with self._lock:
+            executor, _ = self._start()
+        for _ in range(self._max_workers):
+            executor.submit(_warm_up)
+
+    def submit(self, library_path, instance, time_budget=None, speculative=False):
+        """ Submits a search, returns a Future of the found action.
+
+        :param library_path: the path of the library performing the search
+        :param instance: a SearchInstance
+        :param time_budget: a timedelta which overrides the service's default time budget
+        :param speculative: if True, the search runs on the pool of speculative searches.
+            Without time budget, a speculative search has no deadline, and runs until it terminates or is aborted.
+        :return: a Future whose result is a tuple of the action, as returned by ExternalLibraryBinding.find_action,
+        the final search status, as returned by ExternalLibraryBinding.get_search_status,
+        and the duration of the search in the worker, as timedelta
+        """
+        if speculative and time_budget is None:
+            deadline = None
+        else:
+            deadline = time.time() + (time_budget or self._time_budget).total_seconds()
+        with self._lock:
+            executor, manager = self._start_speculations() if speculative else self._start()
+            if not speculative:
+                self._pending += 1
+        abort_event = manager.Event()
+        submit_time = time.monotonic()
+        future = executor.submit(_search, library_path, instance, deadline, self._search_threads, abort_event)
+        with self._lock:
+            self._abort_events[future] = abort_event
+        if speculative:
+            future.add_done_callback(self._forget_abort_event)
+        else:
+            future.add_done_callback(lambda _: self._on_search_done(future, time.monotonic() - submit_time))
+        return future
+
+    def abort(self, future):
+        """ Aborts a submitted search. If it waits for a worker, it is cancelled.
+        Otherwise, the worker stops the search, and returns the best action found so far. """
+        if future.cancel():
+            return
+        with self._lock:
+            abort_event = self._abort_events.get(future)
+        if abort_event is not None:
+            abort_event.set()
+
+    def metrics(self):
+        """ Returns a dictionary with the number of workers, the number of pending and of completed searches,
+        the number of searches waiting for a worker, and the mean and maximum latencies in seconds """
+        with self._lock:
+            return {
+                "workers": self._max_workers,
+                "pending": self._pending,
+                "queue_depth": max(self._pending - self._max_workers, 0),
+                "completed": self._completed,
+                "mean_latency": self._total_latency / self._completed if self._completed else 0.0,
+                "max_latency": self._max_latency,
+            }
+
+    def shutdown(self):
+        """ Aborts the running searches, shuts down the worker processes, and waits for them to finish """
+        with self._lock:
+            executors = [self._executor, self._speculation_executor]
+            self._executor, self._speculation_executor = None, None
+            manager, self._manager = self._manager, None
+            abort_events = list(self._abort_events.values())
+        for abort_event in abort_events:
+            abort_event.set()
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+    def _start(self):
+        """ Creates the pool and the manager of the abort events, if they do not exist yet. Requires the lock. """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=self._context,
+                                                 initializer=_initialize_worker, initargs=(self._library_paths,))
+        return self._executor, self._start_manager()
+
+    def _start_speculations(self):
+        """ Creates the pool of speculative searches and the manager of the abort events,
+        if they do not exist yet. Requires the lock. """
+        if self._speculation_executor is None:
+            self._speculation_executor = ProcessPoolExecutor(max_workers=self._max_speculations,
+                                                             mp_context=self._context,
+                                                             initializer=_initialize_speculation_worker,
+                                                             initargs=(self._library_paths,))
+        return self._speculation_executor, self._start_manager()
+
+    def _start_manager(self):
+        if self._manager is None:
+            self._manager = self._context.Manager()
+        return self._manager
+
+    def _forget_abort_event(self, future):
+        with self._lock:
+            self._abort_events.pop(future, None)
+
+    def _on_search_done(self, future, latency):
+        self._forget_abort_event(future)
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+
+def _available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _initialize_worker(library_paths):
+    for library_path in library_paths:
+        extlib.library_registry().load(library_path)
+
+
+def _initialize_speculation_worker(library_paths):
+    """ Lowers the scheduling priority of the worker process, where the platform supports this """
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    _initialize_worker(library_paths)
+
+
+def _warm_up():
+    """ Runs in a worker process. Its only purpose is to make the pool start the worker """
+
+
+def _search(library_path, instance, deadline, search_threads, abort_event):
+    """ Runs in a worker process, which runs one search at a time.
+    The deadline is given in seconds since the epoch, as returned by time.time(), or None for no deadline """
+    binding = extlib.ExternalLibraryBinding(library_path, num_threads=search_threads)
+    finished = threading.Event()
+    binding_lock = threading.Lock()
+    threading.Thread(target=_forward_abort, args=(abort_event, binding, finished, binding_lock), daemon=True).start()
+    try:
+        start = time.monotonic()
+        time_budget = None if deadline is None else timedelta(seconds=max(deadline - time.time(), 0))
+        action = binding.find_action(instance, time_budget=time_budget)
+        return action, binding.get_search_status(), timedelta(seconds=time.monotonic() - start)
+    finally:
+        with binding_lock:
+            finished.set()
+            binding.close()
+
+
+def _forward_abort(abort_event, binding, finished, binding_lock):
+    """ Runs in a thread of a worker process. Aborts the search of the binding as soon as the abort event is set """
+    try:
+        while not finished.is_set():
+            if abort_event.wait(_ABORT_POLL_INTERVAL.total_seconds()):
+                with binding_lock:
+                    if not finished.is_set():
+                        binding.abort_search()
+                return
+    except (EOFError, OSError):
+        pass
+
+
+_ABORT_POLL_INTERVAL = timedelta(milliseconds=20)
@@ -0,0 +1,143 @@
+""" This module maps board states to a canonical orientation under the symmetries of the square maze.
+
+The maze has eight symmetries (the dihedral group D4): four rotations by multiples of 90 degrees,
+each optionally preceded by a reflection at the vertical center line. A symmetry maps shift locations to shift
+locations, and a solution of a transformed board is the transformed solution of the original board.
+
+canonical_form() determines a hash of the board state which is the same for all eight orientations,
+together with the Transform which maps the board to the orientation with the minimal hash.
+Actions found for the canonical orientation are mapped back with Transform.unmap_action().
+"""
+from labyrinth.model import out_paths_dict, zobrist
+from labyrinth.model.game import Board, BoardLocation, Maze, MazeCard, Piece
+
+_ROTATIONS = (0, 90, 180, 270)
+_BIT_BY_DIRECTION = {(-1, 0): 1, (0, 1): 2, (1, 0): 4, (0, -1): 8}
+
+
+class Transform:
+    """ A symmetry of the square maze: an optional reflection at the vertical center line,
+    followed by quarter_turns clockwise rotations by 90 degrees """
+
+    __slots__ = ("quarter_turns", "reflected")
+
+    def __init__(self, quarter_turns=0, reflected=False):
+        self.quarter_turns = quarter_turns % 4
+        self.reflected = reflected
+
+    def inverse(self):
+        """ Returns the transform which undoes this transform """
+        if self.reflected:
+            return self
+        return Transform(-self.quarter_turns, False)
+
+    def map_location(self, location, maze_size):
+        """ Returns the image of a BoardLocation. None, i.e. the leftover, is mapped to None """
+        if location is None:
+            return None
+        row, column = location.row, location.column
+        border = maze_size - 1
+        if self.reflected:
+            column = border - column
+        for _ in range(self.quarter_turns):
+            row, column = column, border - row
+        return BoardLocation(row, column)
+
+    def map_directions(self, directions):
+        """ Returns the images of directions, given as tuples (row delta, column delta) """
+        mapped = set()
+        for row_delta, column_delta in directions:
+            if self.reflected:
+                column_delta = -column_delta
+            for _ in range(self.quarter_turns):
+                row_delta, column_delta = column_delta, -row_delta
+            mapped.add((row_delta, column_delta))
+        return mapped
+
+    def map_rotation(self, out_paths, rotation):
+        """ Returns the rotation of a maze card with the given out_paths, so that its directions are the images
+        of the directions at the given rotation """
+        directions = self.map_directions(out_paths_dict.dictionary[(out_paths, rotation)])
+        return next(candidate for candidate in _ROTATIONS
+                    if out_paths_dict.dictionary[(out_paths, candidate)] == directions)
+
+    def map_action(self, action, maze_size, leftover_out_paths):
+        """ Returns the image of an action ((shift location, rotation), move location) """
+        (shift_location, rotation), move_location = action
+        return (self.map_location(shift_location, maze_size), self.map_rotation(leftover_out_paths, rotation)), \
+            self.map_location(move_location, maze_size)
+
+    def unmap_action(self, action, maze_size, leftover_out_paths):
+        """ Returns the action whose image is the given action """
+        return self.inverse().map_action(action, maze_size, leftover_out_paths)
+
+    def map_board(self, board):
+        """ Returns a new board which is the image of the given board.
+        Maze cards and pieces are copied, with identifiers and piece indices retained. """
+        maze_size = board.maze.maze_size
+        maze = Maze(maze_size)
+        copies = {}
+        for location in board.maze.maze_locations:
+            maze_card = board.maze[location]
+            copies[maze_card] = self._map_card(maze_card)
+            maze[self.map_location(location, maze_size)] = copies[maze_card]
+        copies[board.leftover_card] = self._map_card(board.leftover_card)
+        mapped = Board(maze, leftover_card=copies[board.leftover_card],
+                       objective_maze_card=copies[board.objective_maze_card])
+        for piece in board.pieces:
+            mapped.pieces.append(Piece(piece.piece_index, copies[piece.maze_card]))
+        mapped.previous_shift_location = self.map_location(board.previous_shift_location, maze_size)
+        return mapped
+
+    def _map_card(self, maze_card):
+        return MazeCard(maze_card.identifier, maze_card.out_paths,
+                        self.map_rotation(maze_card.out_paths, maze_card.rotation))
+
+    def __eq__(self, other):
+        return isinstance(other, Transform) and \
+            (self.quarter_turns, self.reflected) == (other.quarter_turns, other.reflected)
+
+    def __hash__(self):
+        return hash((self.quarter_turns, self.reflected))
+
+    def __repr__(self):
+        return f"Transform({self.quarter_turns}, {self.reflected})"
+
+
+TRANSFORMS = tuple(Transform(quarter_turns, reflected) for reflected in (False, True) for quarter_turns in range(4))
+
+
+def canonical_form(board, previous_shift_location=None):
+    """ Returns a tuple (canonical hash, transform).
+
+    The canonical hash is the minimum of the hashes of the eight transformed board states. It covers the directions
+    of the maze cards, the type of the leftover, the positions of the pieces and the objective,
+    and the previous shift location. It does not depend on the leftover's current rotation,
+    as a shift sets the rotation anyway. The transform maps the board to the orientation with the minimal hash.
+
+    :param previous_shift_location: the location of the previous shift, by default the board's
+    """
+    if previous_shift_location is None:
+        previous_shift_location = board.previous_shift_location
+    maze = board.maze
+    cards = [(location, maze[location]) for location in maze.maze_locations]
+    pieces = [(piece.piece_index, maze.maze_card_location(piece.maze_card)) for piece in board.pieces]
+    objective_location = maze.maze_card_location(board.objective_maze_card)
+    common_hash = zobrist.card_key(None, MazeCard(out_paths=board.leftover_card.out_paths))
+    hashes = [(common_hash ^ _transformed_hash(transform, maze.maze_size, cards, pieces, objective_location,
+                                               previous_shift_location), index)
+              for index, transform in enumerate(TRANSFORMS)]
+    canonical_hash, index = min(hashes)
+    return canonical_hash, TRANSFORMS[index]
+
+
+def _transformed_hash(transform, maze_size, cards, pieces, objective_location, previous_shift_location):
+    state_hash = zobrist.objective_key(transform.map_location(objective_location, maze_size)) ^ \
+        zobrist.previous_shift_key(transform.map_location(previous_shift_location, maze_size))
+    for location, maze_card in cards:
+        directions = transform.map_directions(out_paths_dict.dictionary[(maze_card.out_paths, maze_card.rotation)])
+        state_hash ^= zobrist.directions_key(transform.map_location(location, maze_size),
+                                             sum(_BIT_BY_DIRECTION[direction] for direction in directions))
+    for piece_index, location in pieces:
+        state_hash ^= zobrist.piece_key(piece_index, transform.map_location(location, maze_size))
+    return state_hash
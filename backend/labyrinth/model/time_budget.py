@@ -0,0 +1,105 @@
+""" This module determines the time budgets of bot searches.
+
+The solvers search with increasing depths, and the work of an aborted depth is lost. Hence, a good budget ends
+shortly after the deepest depth which can be completed in the available time. The TimeBudgetManager learns how long
+each computation method takes to complete a depth on a given maze size from the durations of finished searches.
+A terminated search has completed its current depth, an aborted search only the depth before. Aborted searches are
+recorded with their completed depth, so that the observations are not restricted to the searches which happened
+to terminate. The manager assumes that the time grows exponentially with the depth,
+and fits a line to the logarithms of the times.
+
+The available time is bounded by the time the player has left in its turn, after which it is removed from the game,
+and shrinks with the number of searches waiting for a free solver. Until enough searches have been observed,
+the budget is the default budget, scaled with the number of locations of the maze.
+"""
+import collections
+from datetime import timedelta
+import math
+import threading
+
+
+class TimeBudgetManager:
+    """ Determines time budgets of searches by computation method and maze size, and learns from finished searches """
+
+    MIN_OBSERVATIONS = 4
+    MAX_OBSERVATIONS = 64
+    MARGIN = 1.25
+
+    def __init__(self, default_budget=timedelta(seconds=3), min_budget=timedelta(milliseconds=500),
+                 max_budget=timedelta(seconds=10), player_timeout=timedelta(seconds=30), queue_depth=None):
+        """
+        :param default_budget: the budget for 7x7 mazes, as long as there are too few observations
+        :param min_budget: the lower bound of all budgets
+        :param max_budget: the upper bound of all budgets, if there are no waiting searches
+        :param player_timeout: the time after which a player is removed. Budgets do not exceed it.
+        :param queue_depth: a function returning the current number of searches waiting for a solver
+        """
+        self._default_budget = default_budget
+        self._min_budget = min_budget
+        self._max_budget = max_budget
+        self._player_timeout = player_timeout
+        self._queue_depth = queue_depth or (lambda: 0)
+        self._observations = {}
+        self._lock = threading.Lock()
+
+    @property
+    def player_timeout(self):
+        """ Getter for player_timeout """
+        return self._player_timeout
+
+    def budget(self, compute_method, maze_size, remaining_time=None):
+        """ Returns the time budget of a search, as timedelta
+
+        :param remaining_time: the time the player has left for the search, before it is removed.
+            By default, the player timeout.
+        """
+        if remaining_time is None:
+            remaining_time = self._player_timeout
+        limit = max(min(self._max_budget, remaining_time), timedelta(0))
+        available = min(limit, max(self._min_budget, limit / (1 + self._queue_depth())))
+        curve = self._fit(compute_method, maze_size)
+        if curve is None:
+            budget = self._default_budget * (maze_size / 7) ** 2
+        else:
+            budget = self._completion_time(curve, available)
+        return min(max(budget, self._min_budget), available)
+
+    def record(self, compute_method, maze_size, elapsed, search_status):
+        """ Records a finished search with the deepest depth it has completed.
+
+        :param elapsed: the duration of the search, measured from its start in the library, as timedelta
+        :param search_status: the final status of the search, as returned by ExternalLibraryBinding.get_search_status
+        """
+        depth = search_status["current_search_depth"]
+        if not search_status["search_terminated"]:
+            depth -= 1
+        if depth < 1 or elapsed <= timedelta(0):
+            return
+        with self._lock:
+            observations = self._observations.setdefault((compute_method, maze_size),
+                                                         collections.deque(maxlen=self.MAX_OBSERVATIONS))
+            observations.append((depth, math.log(elapsed.total_seconds())))
+
+    def _fit(self, compute_method, maze_size):
+        """ Returns the intercept and slope of log(time) over depth, or None if there are too few observations """
+        with self._lock:
+            observations = list(self._observations.get((compute_method, maze_size), ()))
+        if len(observations) < self.MIN_OBSERVATIONS or len({depth for depth, _ in observations}) < 2:
+            return None
+        mean_depth = sum(depth for depth, _ in observations) / len(observations)
+        mean_log_time = sum(log_time for _, log_time in observations) / len(observations)
+        covariance = sum((depth - mean_depth) * (log_time - mean_log_time) for depth, log_time in observations)
+        variance = sum((depth - mean_depth) ** 2 for depth, _ in observations)
+        slope = covariance / variance
+        if slope <= 0:
+            return None
+        return mean_log_time - slope * mean_depth, slope
+
+    def _completion_time(self, curve, available):
+        """ Returns the predicted time to complete the deepest depth which fits into the available time,
+        including a safety margin. If not even the first depth fits, returns the available time. """
+        intercept, slope = curve
+        deepest = math.floor((math.log(available.total_seconds() / self.MARGIN) - intercept) / slope)
+        if deepest < 1:
+            return available
+        return timedelta(seconds=math.exp(intercept + slope * deepest) * self.MARGIN)
@@ -0,0 +1,144 @@
+""" This module provides a shared timer for delayed calls.
+
+All delayed calls are kept in one heap, ordered by due time, and are executed by a single daemon thread.
+Hence, the number of threads does not depend on the number of pending calls.
+Callbacks are executed on the timer thread one after the other, so they should return quickly.
+Callbacks which may block, e.g. because they notify listeners or access the database,
+are scheduled with call_later_on_worker. The timer thread only hands them over to a small worker pool.
+"""
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DelayedCall:
+    """ A handle to a call which has been scheduled by a DelayScheduler """
+
+    __slots__ = ("due_time", "_callback", "_args", "_cancelled", "_executor")
+
+    def __init__(self, due_time, callback, args, executor=None):
+        self.due_time = due_time
+        self._callback = callback
+        self._args = args
+        self._cancelled = False
+        self._executor = executor
+
+    @property
+    def cancelled(self):
+        """ Returns True iff the call has been cancelled """
+        return self._cancelled
+
+    def cancel(self):
+        """ Cancels the call. Has no effect if the call has already been executed """
+        self._cancelled = True
+
+    def _run(self):
+        if not self._cancelled:
+            if self._executor is None:
+                self._callback(*self._args)
+            else:
+                self._executor.submit(self._run_on_worker)
+
+    def _run_on_worker(self):
+        # the call may have been cancelled while it was waiting for a worker
+        if not self._cancelled:
+            try:
+                self._callback(*self._args)
+            except Exception:
+                traceback.print_exc()
+
+
+class DelayScheduler:
+    """ Executes delayed calls on a single timer thread.
+
+    The thread is started with the first scheduled call.
+    Calls scheduled with call_later_on_worker are executed by a pool of at most max_workers threads,
+    which is created on first use.
+    """
+
+    def __init__(self, clock=time.monotonic, max_workers=2):
+        self._clock = clock
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._max_workers = max_workers
+        self._executor = None
+
+    def call_later(self, delay, callback, *args):
+        """ Schedules a call of callback with the given arguments.
+        The callback is executed on the timer thread.
+
+        :param delay: the delay in seconds, or a timedelta
+        :param callback: the function to call
+        :return: a DelayedCall, which can be used to cancel the call
+        """
+        return self._schedule(delay, callback, args, executor=None)
+
+    def call_later_on_worker(self, delay, callback, *args):
+        """ Schedules a call of callback with the given arguments.
+        The callback is executed on the worker pool, so that it may block without delaying other calls.
+
+        :param delay: the delay in seconds, or a timedelta
+        :param callback: the function to call
+        :return: a DelayedCall, which can be used to cancel the call
+        """
+        return self._schedule(delay, callback, args, executor=self._worker_executor())
+
+    def _worker_executor(self):
+        with self._condition:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="delayed-call")
+            return self._executor
+
+    def _schedule(self, delay, callback, args, executor):
+        if hasattr(delay, "total_seconds"):
+            delay = delay.total_seconds()
+        delayed_call = DelayedCall(self._clock() + delay, callback, args, executor=executor)
+        with self._condition:
+            heapq.heappush(self._heap, (delayed_call.due_time, next(self._sequence), delayed_call))
+            self._ensure_started()
+            self._condition.notify()
+        return delayed_call
+
+    def pending(self):
+        """ Returns the number of scheduled calls which are neither executed nor cancelled """
+        with self._condition:
+            return sum(1 for _, _, delayed_call in self._heap if not delayed_call.cancelled)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="delay-scheduler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            delayed_call = self._wait_for_due_call()
+            try:
+                delayed_call._run()
+            except Exception:
+                traceback.print_exc()
+
+    def _wait_for_due_call(self):
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                remaining = self._heap[0][0] - self._clock()
+                if remaining <= 0:
+                    return heapq.heappop(self._heap)[2]
+                self._condition.wait(remaining)
+
+
+_SHARED_SCHEDULER = DelayScheduler()
+
+
+def shared_scheduler():
+    """ Returns the process-wide DelayScheduler """
+    return _SHARED_SCHEDULER
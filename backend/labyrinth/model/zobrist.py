@@ -0,0 +1,51 @@
+""" This module provides the keys for Zobrist hashing of board states.
+
+The hash of a board state is the XOR of one 64-bit key per feature of the state:
+the card type and rotation at each location, the leftover's type and rotation, the position of each piece,
+the position of the objective, and the previous shift location. A position is either a location,
+or None for the leftover. As XOR is its own inverse, a change of the state is applied to the hash
+by XOR-ing the keys of the replaced features and of the new features.
+
+Keys are derived from the features with a keyed hash function instead of a random number generator.
+Hence, they are the same in every process, and hashes can be stored and compared across processes.
+"""
+import functools
+import hashlib
+
+_LEFTOVER = (-1, -1)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _key(*feature):
+    digest = hashlib.blake2b(repr(feature).encode(), digest_size=8, person=b"labyrinth").digest()
+    return int.from_bytes(digest, "little")
+
+
+def _position(location):
+    return _LEFTOVER if location is None else (location.row, location.column)
+
+
+def card_key(location, maze_card):
+    """ Returns the key of a maze card at the given location, or at the leftover position if location is None """
+    return _key("card", _position(location), maze_card.out_paths, maze_card.rotation)
+
+
+def piece_key(piece_index, location):
+    """ Returns the key of the piece with the given index at the given position """
+    return _key("piece", piece_index, _position(location))
+
+
+def objective_key(location):
+    """ Returns the key of the objective at the given position """
+    return _key("objective", _position(location))
+
+
+def previous_shift_key(shift_location):
+    """ Returns the key of the previous shift location, which may be None """
+    return _key("shift", _position(shift_location))
+
+
+def directions_key(location, directions_bitmask):
+    """ Returns the key of a maze card at the given location, given by its rotated out-paths as bitmask.
+    Unlike card_key, it does not distinguish rotations of a maze card which result in the same out-paths. """
+    return _key("directions", _position(location), directions_bitmask)
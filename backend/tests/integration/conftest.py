@@ -5,7 +5,7 @@ import platform
 import tempfile
 import pytest
 
-from labyrinth import create_app
+from labyrinth import create_app, shutdown
 
 
 @pytest.fixture
@@ -21,6 +21,7 @@ def app():
         "OVERDUE_PLAYER_TIMEDELTA_S": 30
     })
     yield app
+    shutdown(app)
     os.close(file_descriptor)
     os.unlink(db_path)
 
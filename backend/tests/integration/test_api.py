@@ -4,6 +4,8 @@ import json
 import os
 import time
 
+from labyrinth import shutdown
+
 
 def test_post_player_returns_player(client):
     """ Tests POST for /api/games/0/players """
@@ -254,6 +256,46 @@ def test_change_maze_size(client):
     _wait_for(client, "SHIFT", game_id=5)
 
 
+def test_change_maze_size_to_marathon_size(client):
+    """ Tests PUT for /api/games/0
+
+    Creates a game, then increases maze size to 101.
+    Checks number of maze cards and that the player can shift.
+    """
+    player_id = _assert_ok_retrieve_id(_post_player(client))
+    response = _put_game(client, size=101)
+    assert response.status_code == 200
+    state = _get_state(client).get_json()
+    assert state["maze"]["mazeSize"] == 101
+    assert len(state["maze"]["mazeCards"]) == 101*101 + 1
+    _wait_for(client, "SHIFT")
+    response = _post_shift(client, player_id=player_id, column=100, row=99, rotation=0)
+    assert response.status_code == 200
+
+
+def test_change_maze_size__takes_board_from_pool(app, client):
+    """ Tests PUT for /api/games/0
+
+    Creates a game, then changes the maze size. Both boards are taken from the filled board pool.
+    """
+    board_pool = app.extensions["board_pool"]
+    board_pool.fill()
+    hits = board_pool.hits
+    _post_player(client)
+    response = _put_game(client, size=7)
+    assert response.status_code == 200
+    assert board_pool.hits == hits + 2
+
+
+def test_shutdown__stops_board_pool_thread(app):
+    """ Tests that the refill thread of the board pool does not outlive the app """
+    board_pool = app.extensions["board_pool"]
+    refill_thread = board_pool._thread
+    assert refill_thread.is_alive()
+    shutdown(app)
+    assert not refill_thread.is_alive()
+
+
 def test_change_maze_size_with_even_size(client):
     """ Tests PUT for /api/games/0
 
@@ -293,6 +335,8 @@ def test_post_move(client):
                     None)
     assert location["row"] == 0
     assert location["column"] == 1
+    assert state["previousMovePath"][0] == {"row": 0, "column": 0}
+    assert state["previousMovePath"][-1] == {"row": 0, "column": 1}
     _wait_for(client, "SHIFT")
 
 
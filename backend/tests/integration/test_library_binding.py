@@ -9,7 +9,10 @@ from datetime import timedelta
 import time
 import threading
 
-from labyrinth.model.external_library import ExternalLibraryBinding
+import pytest
+
+from labyrinth.model.external_library import ExternalLibraryBinding, SearchInstance
+from labyrinth.model.solver_service import SolverService
 from labyrinth.model.reachable import Graph
 from labyrinth.model.game import BoardLocation
 from tests.unit.factories import param_tuple_to_param_dict, create_board_and_pieces
@@ -172,6 +175,260 @@ def test_abort_search__with_long_running_instance__returns_quickly(library_path)
         assert concurrent_library_binding.action is None
 
 
+def test_find_action__with_time_budget__returns_at_deadline(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    library_binding = ExternalLibraryBinding(library_path, board, piece)
+
+    start = time.time()
+    action = library_binding.find_optimal_action(time_budget=timedelta(milliseconds=100))
+    stop = time.time()
+
+    assert 0.1 <= (stop - start) < 0.2
+    assert not library_binding.get_search_status()["search_terminated"]
+    if action:
+        _assert_valid_action(action, board, None, piece)
+
+
+def test_find_action__after_search_with_time_budget__is_not_limited(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    library_binding = ExternalLibraryBinding(library_path, board, piece)
+    library_binding.find_optimal_action(time_budget=timedelta(milliseconds=20))
+
+    search_ended_event = threading.Event()
+    ConcurrentExternalLibraryBinding(library_binding, search_ended_event).start()
+
+    assert not search_ended_event.wait(timeout=0.2)
+    library_binding.abort_search()
+    assert search_ended_event.wait(timeout=1)
+
+
+def test_find_action__with_threads__returns_action_of_sequential_search(library_path):
+    test_setup = (MAZE_3BY3, "NE", [(0, 0)], (2, 2))
+    board, piece = _create_board(test_setup)
+
+    sequential_action = ExternalLibraryBinding(library_path, board, piece).find_optimal_action()
+    action = ExternalLibraryBinding(library_path, board, piece, num_threads=4).find_optimal_action()
+
+    assert action == sequential_action
+    _assert_valid_action(action, board, None, piece)
+
+
+def test_abort_search__with_concurrent_bindings__aborts_only_own_search(library_path):
+    """ Runs two searches on a long running instance concurrently, and aborts one of them.
+    The other search is expected to continue until it is aborted as well. """
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    aborted_binding = ExternalLibraryBinding(library_path, board, piece)
+    running_binding = ExternalLibraryBinding(library_path, board, piece)
+
+    aborted_event, running_event = threading.Event(), threading.Event()
+    ConcurrentExternalLibraryBinding(aborted_binding, aborted_event).start()
+    ConcurrentExternalLibraryBinding(running_binding, running_event).start()
+    time.sleep(timedelta(milliseconds=10).total_seconds())
+    aborted_binding.abort_search()
+
+    assert aborted_event.wait(timeout=0.1)
+    assert not running_event.wait(timeout=0.1)
+    running_binding.abort_search()
+    assert running_event.wait(timeout=0.1)
+
+
+def test_abort_search__before_search__returns_quickly(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    library_binding = ExternalLibraryBinding(library_path, board, piece)
+
+    library_binding.abort_search()
+    start = time.time()
+    library_binding.find_optimal_action()
+    assert (time.time() - start) < 0.1
+
+
+def test_get_best_action__while_searching__returns_valid_action(library_path):
+    """ Only libraries with iterative searches provide the best action found so far. """
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6), (0, 0)], (3, 2))
+    board, piece = _create_board(test_setup)
+    library_binding = ExternalLibraryBinding(library_path, board, piece)
+    search_ended_event = threading.Event()
+    ConcurrentExternalLibraryBinding(library_binding, search_ended_event).start()
+    time.sleep(timedelta(milliseconds=50).total_seconds())
+
+    action = library_binding.get_best_action()
+
+    library_binding.abort_search()
+    assert search_ended_event.wait(timeout=0.1)
+    if "minimax" in library_path:
+        _assert_valid_action(action, board, None, piece)
+    else:
+        assert action is None
+
+
+def test_close__releases_search_context(library_path):
+    test_setup = (MAZE_3BY3, "NE", [(0, 0)], (0, 2))
+    board, piece = _create_board(test_setup)
+    library_binding = ExternalLibraryBinding(library_path, board, piece)
+
+    library_binding.close()
+    library_binding.close()
+
+    assert library_binding.find_optimal_action() is not None
+
+
+def test_find_actions__with_batch__finds_valid_action_for_each_instance(library_path):
+    test_setup = (MAZE_3BY3, "NE", [(0, 0)], (0, 2))
+    board, piece = _create_board(test_setup)
+    previous_shift_locations = [None, BoardLocation(0, 1), BoardLocation(1, 0), BoardLocation(2, 1)]
+    instances = [SearchInstance.from_board(board, piece, location) for location in previous_shift_locations]
+    library_binding = ExternalLibraryBinding(library_path)
+
+    results = library_binding.find_actions(instances, num_threads=2)
+
+    assert len(results) == len(instances)
+    for (action, status), previous_shift_location in zip(results, previous_shift_locations):
+        forked_board = board.fork()
+        _assert_valid_action(action, forked_board, previous_shift_location, forked_board.pieces[0])
+        assert status["search_terminated"]
+
+
+def test_find_actions__when_aborted__returns_quickly(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6), (0, 0)], (3, 2))
+    board, piece = _create_board(test_setup)
+    instances = [SearchInstance.from_board(board, piece)] * 4
+    library_binding = ExternalLibraryBinding(library_path)
+    results = []
+    search = threading.Thread(target=lambda: results.extend(library_binding.find_actions(instances, num_threads=2)))
+    search.start()
+    time.sleep(timedelta(milliseconds=20).total_seconds())
+
+    library_binding.abort_search()
+
+    search.join(timeout=0.2)
+    assert not search.is_alive()
+    assert len(results) == len(instances)
+
+
+def test_find_actions__after_aborted_batch__finds_valid_actions(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6), (0, 0)], (3, 2))
+    board, piece = _create_board(test_setup)
+    library_binding = ExternalLibraryBinding(library_path)
+    search = threading.Thread(target=lambda: library_binding.find_actions([SearchInstance.from_board(board, piece)] * 2,
+                                                                          num_threads=2))
+    search.start()
+    time.sleep(timedelta(milliseconds=20).total_seconds())
+    library_binding.abort_search()
+    search.join(timeout=1)
+
+    test_setup = (MAZE_3BY3, "NE", [(0, 0)], (0, 2))
+    board, piece = _create_board(test_setup)
+    results = library_binding.find_actions([SearchInstance.from_board(board, piece)] * 2, num_threads=2)
+
+    for action, status in results:
+        forked_board = board.fork()
+        _assert_valid_action(action, forked_board, None, forked_board.pieces[0])
+        assert status["search_terminated"]
+
+
+@pytest.mark.parametrize("with_context", [True, False])
+def test_find_actions__without_instances__returns_empty_list(library_path, with_context):
+    library_binding = ExternalLibraryBinding(library_path)
+    if not with_context:
+        library_binding.close()
+
+    assert library_binding.find_actions([]) == []
+
+
+def test_solver_service__finds_valid_action(library_path):
+    test_setup = (MAZE_3BY3, "NE", [(0, 0)], (0, 2))
+    previous_shift_location = BoardLocation(0, 1)
+    board, piece = _create_board(test_setup)
+    instance = SearchInstance.from_board(board, piece, previous_shift_location)
+    service = SolverService([library_path], max_workers=1)
+
+    try:
+        action, status, search_duration = service.submit(library_path, instance).result(timeout=30)
+    finally:
+        service.shutdown()
+
+    _assert_valid_action(action, board, previous_shift_location, piece)
+    assert status["search_terminated"]
+    assert search_duration > timedelta(0)
+    assert service.metrics()["completed"] == 1
+
+
+def test_solver_service__with_speculative_search__finds_valid_action(library_path):
+    test_setup = (MAZE_3BY3, "NE", [(0, 0)], (0, 2))
+    previous_shift_location = BoardLocation(0, 1)
+    board, piece = _create_board(test_setup)
+    instance = SearchInstance.from_board(board, piece, previous_shift_location)
+    service = SolverService([library_path], max_workers=1)
+
+    try:
+        action, _, _ = service.submit(library_path, instance, speculative=True).result(timeout=30)
+    finally:
+        service.shutdown()
+
+    _assert_valid_action(action, board, previous_shift_location, piece)
+    assert service.metrics()["completed"] == 0
+
+
+def test_solver_service__with_long_running_instance__aborts_after_time_budget(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    instance = SearchInstance.from_board(board, piece)
+    service = SolverService([library_path], max_workers=1, time_budget=timedelta(milliseconds=100))
+
+    try:
+        service.submit(library_path, instance).result(timeout=30)
+        start = time.time()
+        service.submit(library_path, instance).result(timeout=30)
+        stop = time.time()
+    finally:
+        service.shutdown()
+
+    assert (stop - start) < 1
+
+
+def test_solver_service__abort__stops_running_search(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    instance = SearchInstance.from_board(board, piece)
+    service = SolverService([library_path], max_workers=1, time_budget=timedelta(seconds=20))
+    service.start()
+
+    try:
+        future = service.submit(library_path, instance)
+        time.sleep(1)
+        start = time.time()
+        service.abort(future)
+        future.result(timeout=30)
+        stop = time.time()
+    finally:
+        service.shutdown()
+
+    assert (stop - start) < 1
+
+
+def test_solver_service__with_search_waiting_for_worker__includes_waiting_time_in_time_budget(library_path):
+    test_setup = (LONG_RUNNING_EXHSEARCH_INSTANCE, "NE", [(7, 6)], (3, 2))
+    board, piece = _create_board(test_setup)
+    instance = SearchInstance.from_board(board, piece)
+    service = SolverService([library_path], max_workers=1, time_budget=timedelta(milliseconds=500))
+
+    try:
+        service.submit(library_path, instance).result(timeout=30)
+        start = time.time()
+        futures = [service.submit(library_path, instance) for _ in range(2)]
+        for future in futures:
+            future.result(timeout=30)
+        stop = time.time()
+    finally:
+        service.shutdown()
+
+    assert (stop - start) < 0.9
+
+
 class ConcurrentExternalLibraryBinding(threading.Thread):
     def __init__(self, external_binding, search_ended_event):
         threading.Thread.__init__(self)
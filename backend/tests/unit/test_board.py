@@ -1,8 +1,11 @@
 """ Tests for Game of game.py """
+import random
+
 import pytest
 from tests.unit.factories import create_random_maze, MazeCardFactory
 from labyrinth.model.game import Board, BoardLocation
 from labyrinth.model.factories import create_maze
+from labyrinth.model.reachable import Graph
 from labyrinth.model.exceptions import InvalidShiftLocationException, InvalidRotationException, \
     MoveUnreachableException, InvalidLocationException
 
@@ -145,6 +148,20 @@ def test_move_updates_players_maze_card_correctly():
     assert board.maze[BoardLocation(0, 2)] == piece.maze_card
 
 
+def test_move_stores_path_until_next_shift():
+    """ Tests move and previous_move_path """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_random_maze_card())
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(0, 1)]
+    board.move(piece, BoardLocation(1, 3))
+    assert board.previous_move_path == [BoardLocation(0, 1), BoardLocation(0, 2), BoardLocation(0, 3),
+                                        BoardLocation(1, 3)]
+    board.shift(BoardLocation(0, 1), 0)
+    assert board.previous_move_path is None
+
+
 def test_move_raises_error_on_unreachable_location():
     """ Tests move validation """
     maze_card_factory = MazeCardFactory()
@@ -164,6 +181,132 @@ def test_move_raises_error_on_invalid_location():
         board.move(piece, BoardLocation(-1, -1))
 
 
+def test_shift_increases_version():
+    """ Tests shift and version """
+    board = Board()
+    old_version = board.version
+    board.shift(BoardLocation(0, 1), 90)
+    assert board.version == old_version + 1
+
+
+def test_connected_components_are_cached():
+    """ Tests connected_components """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    components = board.connected_components()
+    assert board.connected_components() is components
+
+
+def test_connected_components_are_updated_incrementally_by_shifts():
+    """ Tests connected_components after a series of shifts, compares with a full BFS """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NES", 0))
+    board.connected_components()
+    for shift_location, rotation in [((0, 1), 0), ((3, 6), 90), ((6, 5), 180), ((1, 0), 270), ((0, 3), 90)]:
+        board.shift(BoardLocation(*shift_location), rotation)
+        components = board.connected_components()
+        for location in board.maze.maze_locations:
+            assert components.component_of(location) == Graph(board.maze).reachable_locations(location)
+
+
+def test_reachable_locations_after_shift():
+    """ Tests reachable_locations. Shifting a straight into (0, 1) connects (0, 1) and (1, 1) """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    assert BoardLocation(1, 1) not in board.reachable_locations(BoardLocation(0, 1))
+    board.shift(BoardLocation(0, 1), 0)
+    assert BoardLocation(1, 1) in board.reachable_locations(BoardLocation(0, 1))
+
+
+def test_reachable_locations_by_piece():
+    """ Tests reachable_locations_by_piece """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_random_maze_card())
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(0, 1)]
+    expected = {BoardLocation(*coord) for coord in [(0, 1), (0, 2), (0, 3), (1, 3)]}
+    assert board.reachable_locations_by_piece() == {piece: expected}
+
+
+def test_fork_is_not_altered_by_shift_and_move_of_original():
+    """ Tests fork """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(0, 1)]
+    forked = board.fork()
+    forked_ids = [forked.maze[location].identifier for location in forked.maze.maze_locations]
+    board.move(piece, BoardLocation(0, 2))
+    board.shift(BoardLocation(0, 1), 90)
+    assert [forked.maze[location].identifier for location in forked.maze.maze_locations] == forked_ids
+    assert forked.leftover_card.rotation == 0
+    assert forked.pieces[0].maze_card == forked.maze[BoardLocation(0, 1)]
+
+
+def test_original_is_not_altered_by_shifts_and_move_of_fork():
+    """ Tests fork. Performs two shifts on the fork, so that a shared maze card is pushed out and rotated """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(0, 1)]
+    ids = [board.maze[location].identifier for location in board.maze.maze_locations]
+    rotations = [board.maze[location].rotation for location in board.maze.maze_locations]
+    forked = board.fork()
+    forked.move(forked.pieces[0], BoardLocation(0, 2))
+    forked.shift(BoardLocation(0, 1), 90)
+    forked.shift(BoardLocation(3, 6), 270)
+    assert [board.maze[location].identifier for location in board.maze.maze_locations] == ids
+    assert [board.maze[location].rotation for location in board.maze.maze_locations] == rotations
+    assert board.leftover_card.rotation == 0
+    assert piece.maze_card == board.maze[BoardLocation(0, 1)]
+
+
+def test_fork_of_fork_is_not_altered_by_shifts_of_original():
+    """ Tests fork. The intermediate fork is discarded, but the original still shares maze cards """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    forked = board.fork().fork()
+    rotations = [forked.maze[location].rotation for location in forked.maze.maze_locations]
+    board.shift(BoardLocation(0, 1), 90)
+    board.shift(BoardLocation(3, 6), 270)
+    assert [forked.maze[location].rotation for location in forked.maze.maze_locations] == rotations
+    assert forked.leftover_card.rotation == 0
+
+
+def test_shift__after_forks_are_discarded__does_not_copy_leftover():
+    """ Tests that the copy-on-write of the leftover ends with the lifetime of the forks """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    forked = board.fork()
+    leftover = board.leftover_card
+    board.shift(BoardLocation(0, 1), 90)
+    assert board.maze[BoardLocation(0, 1)] is not leftover
+    del forked
+    leftover = board.leftover_card
+    board.shift(BoardLocation(0, 1), 90)
+    assert board.maze[BoardLocation(0, 1)] is leftover
+
+
+def test_fork_has_equal_reachable_locations():
+    """ Tests fork and reachable_locations """
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_maze(MAZE_STRING, maze_card_factory),
+                  leftover_card=maze_card_factory.create_instance("NS", 0))
+    board.connected_components()
+    forked = board.fork()
+    forked.shift(BoardLocation(0, 1), 0)
+    assert BoardLocation(1, 1) not in board.reachable_locations(BoardLocation(0, 1))
+    assert BoardLocation(1, 1) in forked.reachable_locations(BoardLocation(0, 1))
+
+
 def test_opposing_border_location_for_east_location():
     """ Tests opposing_border_location """
     board = Board()
@@ -216,3 +359,49 @@ MAZE_STRING = """
 ---------------------------*
 
 """
+
+
+def _recomputed_state_hash(board):
+    """ Computes the hash of the board state from scratch """
+    forked = board.fork()
+    forked._state_hash = None
+    return forked.state_hash
+
+
+def test_state_hash__after_shifts_and_moves__equals_recomputed_hash():
+    maze_card_factory = MazeCardFactory()
+    board = Board(maze=create_random_maze(maze_card_factory),
+                  leftover_card=maze_card_factory.create_random_maze_card())
+    pieces = [board.create_piece(), board.create_piece()]
+    initial_hash = board.state_hash
+    random_generator = random.Random(17)
+    for _ in range(30):
+        shift_location = random_generator.choice(sorted(board.shift_locations, key=str))
+        board.shift(shift_location, random_generator.choice([0, 90, 180, 270]))
+        assert board.state_hash == _recomputed_state_hash(board)
+        piece = random_generator.choice(pieces)
+        piece_location = board.maze.maze_card_location(piece.maze_card)
+        target = random_generator.choice(sorted(board.reachable_locations(piece_location), key=str))
+        board.move(piece, target)
+        assert board.state_hash == _recomputed_state_hash(board)
+    assert board.state_hash != initial_hash
+
+
+def test_state_hash__of_equal_boards__is_equal():
+    maze = create_random_maze()
+    boards = [Board(maze.fork(), objective_maze_card=maze[BoardLocation(3, 3)]) for _ in range(2)]
+    for board in boards:
+        board.create_piece()
+    assert boards[0].state_hash == boards[1].state_hash
+    boards[1].previous_shift_location = BoardLocation(0, 1)
+    assert boards[0].state_hash != boards[1].state_hash
+
+
+def test_state_hash__when_pieces_are_added_and_removed__is_updated():
+    board = Board(create_random_maze())
+    hash_without_piece = board.state_hash
+    piece = board.create_piece()
+    assert board.state_hash != hash_without_piece
+    assert board.state_hash == _recomputed_state_hash(board)
+    board.remove_piece(piece)
+    assert board.state_hash == hash_without_piece
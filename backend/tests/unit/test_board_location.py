@@ -16,3 +16,9 @@ def test_add_should_return_correct_location():
     new_location = location.add(1, 0)
     assert new_location.row == 1
     assert new_location.column == 0
+
+
+def test_hash_is_unique_for_locations_of_large_mazes():
+    """ Tests __hash__ of BoardLocation """
+    locations = [BoardLocation(row, column) for row in range(101) for column in range(101)]
+    assert len({hash(location) for location in locations}) == len(locations)
@@ -0,0 +1,88 @@
+""" Tests for module model.board_pool """
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from labyrinth.model.board_pool import BoardPool
+from labyrinth.model.exceptions import InvalidSizeException
+
+
+def _wait_until(condition, timeout=2.0):
+    start = time.time()
+    while not condition() and time.time() - start < timeout:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_take__from_filled_pool__counts_hit_and_returns_ready_board():
+    board_factory = Mock()
+    pool = BoardPool({7: 2}, board_factory=board_factory)
+    pool.fill()
+    assert board_factory.call_count == 2
+    board = pool.take(maze_size=7)
+    assert board is board_factory.return_value
+    assert board_factory.call_count == 2
+    assert (pool.hits, pool.misses) == (1, 0)
+    assert pool.available(7) == 1
+
+
+def test_take__from_empty_pool__counts_miss_and_creates_board():
+    board_factory = Mock()
+    pool = BoardPool({7: 2}, board_factory=board_factory)
+    board = pool.take(maze_size=7)
+    assert board is board_factory.return_value
+    board_factory.assert_called_once_with(maze_size=7)
+    assert (pool.hits, pool.misses) == (0, 1)
+
+
+def test_take__with_size_without_capacity__counts_miss():
+    pool = BoardPool({7: 2})
+    pool.fill()
+    board = pool.take(maze_size=9)
+    assert board.maze.maze_size == 9
+    assert (pool.hits, pool.misses) == (0, 1)
+    assert pool.available(9) == 0
+
+
+def test_take__with_invalid_size__raises_exception():
+    pool = BoardPool({7: 1})
+    with pytest.raises(InvalidSizeException):
+        pool.take(maze_size=8)
+
+
+def test_fill__creates_boards_up_to_capacity_for_each_size():
+    pool = BoardPool({5: 1, 7: 3})
+    pool.fill()
+    assert pool.available(5) == 1
+    assert pool.available(7) == 3
+    assert pool.take(maze_size=5).maze.maze_size == 5
+
+
+def test_start__fills_pool_and_refills_after_take():
+    pool = BoardPool({7: 2})
+    pool.start()
+    try:
+        assert _wait_until(lambda: pool.available(7) == 2)
+        first = pool.take(maze_size=7)
+        second = pool.take(maze_size=7)
+        assert first is not second
+        assert _wait_until(lambda: pool.available(7) == 2)
+    finally:
+        pool.stop()
+    assert pool.hits + pool.misses == 2
+
+
+def test_fill__concurrently_with_refill_thread__does_not_exceed_capacity():
+    def slow_board_factory(maze_size):
+        time.sleep(0.05)
+        return Mock(maze_size=maze_size)
+
+    pool = BoardPool({7: 1}, board_factory=slow_board_factory)
+    pool.start()
+    try:
+        pool.fill()
+        time.sleep(0.1)
+        assert pool.available(7) == 1
+    finally:
+        pool.stop()
@@ -1,11 +1,15 @@
-""" Tests for module model.bots. The classes contained in this are multithreaded.
-The tests only run these classes in a single thread, by calling run() directly. """
+""" Tests for module model.bots. Bots run their computations and requests on a runtime.
+Most tests use a runtime which runs everything in a single thread, and collects delayed calls. """
 import copy
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
 import labyrinth.model.factories as factory
-from labyrinth.model.bots import Bot
-from labyrinth.model.game import Board, BoardLocation, Game, Turns
+from labyrinth.model.bots import Bot, BotRuntime, IdlePacing, LibraryBinding, Ponderer, ServiceBinding, _likely_boards
+from labyrinth.model.game import Board, BoardLocation, Game, Player, PlayerAction, Turns
+from labyrinth.model.solver_cache import SolverCache
 
 
 def test_bot__when_register_in_turns__calls_add_player_on_turns_with_callback():
@@ -20,44 +24,609 @@ def test_bot__when_register_in_turns__calls_add_player_on_turns_with_callback():
     assert turns.add_player.call_args[1]["turn_callback"] is not None
 
 
-@patch('time.sleep', return_value=None)
+class SynchronousRuntime:
+    """ A BotRuntime which runs submitted requests immediately, and collects delayed calls.
+
+    Computations run immediately, unless computations_running is set.
+    Then, they are left running until their future is resolved by the test. """
+
+    def __init__(self, computations_running=False):
+        self.delayed_calls = []
+        self.computations = []
+        self.speculations = []
+        self._computations_running = computations_running
+
+    def submit_computation(self, function, *args):
+        return self._submit_running(self.computations, function, *args)
+
+    def submit_speculation(self, function, *args):
+        return self._submit_running(self.speculations, function, *args)
+
+    def _submit_running(self, running, function, *args):
+        if self._computations_running:
+            future = Future()
+            future.set_running_or_notify_cancel()
+            running.append(future)
+            return future
+        return self.submit_request(function, *args)
+
+    def submit_request(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+    def call_later(self, delay, function, *args):
+        delayed_call = Mock(delay=delay, function=function, args=args)
+        self.delayed_calls.append(delayed_call)
+        return delayed_call
+
+    def run_next_delayed_call(self):
+        """ Runs the first delayed call which has not been cancelled, returns its delay """
+        delayed_call = self.delayed_calls.pop(0)
+        while delayed_call.cancel.called:
+            delayed_call = self.delayed_calls.pop(0)
+        delayed_call.function(*delayed_call.args)
+        return delayed_call.delay
+
+    def run_delayed_calls(self):
+        """ Runs all delayed calls which have not been cancelled, including those scheduled by delayed calls.
+        Returns their delays """
+        delays = []
+        while self.delayed_calls:
+            delayed_call = self.delayed_calls.pop(0)
+            if not delayed_call.cancel.called:
+                delays.append(delayed_call.delay)
+                delayed_call.function(*delayed_call.args)
+        return delays
+
+
+PACING = IdlePacing(shift_idle_time=timedelta(seconds=1), move_idle_time=timedelta(seconds=2))
+
+
+def _create_bot(library_factory, runtime, game):
+    player = Bot(library_binding_factory=library_factory, move_url="move-url", shift_url="shift-url",
+                 identifier=9, runtime=runtime, pacing=PACING)
+    player.set_game(game)
+    return player
+
+
 @patch.object(Bot, "_post_shift")
 @patch.object(Bot, "_post_move")
-def given_library_binding__when_bot_run__calls_start_on_binding(post_move, post_shift, time_sleep):
-    """ Tests that the bot calls start() one its computation method.
-    """
+def given_library_binding__when_bot_run__calls_start_on_binding(post_move, post_shift):
+    """ Tests that the bot starts its computation method, i.e. submits it to the runtime """
     game = factory.create_game(with_delay=False)
     library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime()
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    library.submit.assert_called_once()
+    library.run.assert_called_once()
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def given_library_binding__when_library_finished__calls_post_shift_but_not_post_move(post_move, post_shift):
+    """ Tests that the bot posts the computed shift first, and the computed move only after the move idle time """
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime()
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+    while not post_shift.called:
+        runtime.run_next_delayed_call()
+
+    post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
+    post_move.assert_not_called()
+    runtime.run_delayed_calls()
+
+    post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
+    post_move.assert_called_once_with(BoardLocation(0, 0))
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_computation_finishes_early__posts_its_actions_without_waiting_for_timeout(post_move, post_shift):
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime()
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    library.run.assert_called_once()
+    post_shift.assert_not_called()
+    delays = runtime.run_delayed_calls()
+
+    assert len(delays) == 2
+    assert timedelta(milliseconds=500) < delays[0] <= PACING.shift_idle_time
+    assert delays[1] == PACING.move_idle_time
+    library.abort_search.assert_not_called()
+    post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
+    post_move.assert_called_once_with(BoardLocation(0, 0))
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_computation_exceeds_timeout__aborts_and_posts_after_grace_period(post_move, post_shift):
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    delays = runtime.run_delayed_calls()
+
+    assert delays[:2] == [Bot.COMPUTATION_TIMEOUT, Bot.WAIT_FOR_RESULT]
+    assert delays[2] <= PACING.shift_idle_time
+    assert delays[3] == PACING.move_idle_time
+    library.abort_search.assert_called_once()
+    post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
+    post_move.assert_called_once()
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_result_follows_abort__waits_for_result_instead_of_grace_period(post_move, post_shift):
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    library.RESULT_FOLLOWS_ABORT = True
+    runtime = SynchronousRuntime(computations_running=True)
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    assert runtime.run_delayed_calls() == [Bot.COMPUTATION_TIMEOUT]
+    library.abort_search.assert_called_once()
+    post_shift.assert_not_called()
+
+    runtime.computations[0].set_result(None)
+
+    runtime.run_delayed_calls()
+    post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
+    post_move.assert_called_once()
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_computation_finishes_after_abort__does_not_wait_for_grace_period(post_move, post_shift):
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+    timeout = runtime.delayed_calls.pop(0)
+    timeout.function(*timeout.args)
+    library.abort_search.assert_called_once()
+
+    runtime.computations[0].set_result(None)
+
+    delays = runtime.run_delayed_calls()
+    assert len(delays) == 2
+    assert delays[1] == PACING.move_idle_time
+    post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
+    post_move.assert_called_once()
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_computation_exceeds_timeout__plays_best_action_so_far_without_grace_period(post_move, post_shift):
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    library.shift_action, library.move_action = None, None
+    library.get_best_action.return_value = (BoardLocation(0, 3), 180), BoardLocation(1, 1)
+    runtime = SynchronousRuntime(computations_running=True)
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    delays = runtime.run_delayed_calls()
+
+    assert delays[0] == Bot.COMPUTATION_TIMEOUT
+    assert Bot.WAIT_FOR_RESULT not in delays
+    library.abort_search.assert_called_once()
+    post_shift.assert_called_once_with(BoardLocation(0, 3), 180)
+    post_move.assert_called_once_with(BoardLocation(1, 1))
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__with_time_budget_manager__uses_its_budget_and_records_search(post_move, post_shift):
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    library_factory.SHORT_NAME = "exh"
+    library.get_search_status.return_value = {"current_search_depth": 3, "search_terminated": True}
+    library.search_duration = timedelta(seconds=1)
+    time_budget_manager = Mock(player_timeout=timedelta(seconds=30))
+    time_budget_manager.budget.return_value = timedelta(seconds=5)
+    runtime = SynchronousRuntime(computations_running=True)
     player = Bot(library_binding_factory=library_factory, move_url="move-url", shift_url="shift-url",
-                 identifier=9)
+                 identifier=9, runtime=runtime, pacing=PACING, time_budget_manager=time_budget_manager)
     player.set_game(game)
-    player.run()
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
 
-    library.start.assert_called_once()
+    assert runtime.delayed_calls[0].delay == timedelta(seconds=5)
+    library.submit.assert_called_once_with(runtime, timedelta(seconds=5))
+    time_budget_manager.budget.assert_called_once()
+    assert time_budget_manager.budget.call_args[0] == ("exh", game.board.maze.maze_size)
+    runtime.computations[0].set_result(None)
+
+    time_budget_manager.record.assert_called_once_with("exh", game.board.maze.maze_size, timedelta(seconds=1),
+                                                       {"current_search_depth": 3, "search_terminated": True})
+
+
+def test_bot__with_time_budget_manager__passes_remaining_time_of_player():
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, _ = _mock_library_binding()
+    time_budget_manager = Mock(player_timeout=timedelta(seconds=30))
+    time_budget_manager.budget.return_value = timedelta(seconds=5)
+    runtime = SynchronousRuntime(computations_running=True)
+    player = Bot(library_binding_factory=library_factory, move_url="move-url", shift_url="shift-url",
+                 identifier=9, runtime=runtime, pacing=PACING, time_budget_manager=time_budget_manager)
+    player.set_game(game)
+
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    remaining_time = time_budget_manager.budget.call_args[1]["remaining_time"]
+    after_search = PACING.move_idle_time + Bot.WAIT_FOR_RESULT
+    assert timedelta(seconds=29) - after_search < remaining_time <= timedelta(seconds=30) - after_search
+
+
+def test_bot__with_time_budget_manager__does_not_record_computation_without_search():
+    game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, library = _mock_library_binding()
+    library.search_duration = None
+    time_budget_manager = Mock(player_timeout=timedelta(seconds=30))
+    time_budget_manager.budget.return_value = timedelta(seconds=5)
+    runtime = SynchronousRuntime()
+    player = Bot(library_binding_factory=library_factory, move_url="move-url", shift_url="shift-url",
+                 identifier=9, runtime=runtime, pacing=PACING, time_budget_manager=time_budget_manager)
+    player.set_game(game)
+
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    time_budget_manager.record.assert_not_called()
 
 
-@patch('time.sleep', return_value=None)
 @patch.object(Bot, "_post_shift")
 @patch.object(Bot, "_post_move")
-def given_library_binding__when_library_finished__calls_post_shift_but_not_post_move(post_move,
-                                                                                     post_shift,
-                                                                                     time_sleep):
+def test_bot__with_prepare_delay__waits_for_prepare_delay_before_actions(post_move, post_shift):
     game = factory.create_game(game_id=7, with_delay=False)
+    library_factory, _ = _mock_library_binding()
+    runtime = SynchronousRuntime()
+    player = _create_bot(library_factory, runtime, game)
+    player._prepare_delay = timedelta(seconds=5)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    delays = runtime.run_delayed_calls()
+
+    assert timedelta(seconds=4) < delays[0] <= timedelta(seconds=5)
+    assert delays[1] == timedelta(seconds=5)
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_notified_of_other_actions__does_not_compute(post_move, post_shift):
+    game = factory.create_game(with_delay=False)
+    library_factory, _ = _mock_library_binding()
+    runtime = SynchronousRuntime()
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.SHIFT_ACTION)
+    player.notify_turn_change(PlayerAction.MOVE_ACTION)
+
+    library_factory.assert_not_called()
+    assert not runtime.delayed_calls
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__when_computation_has_not_started_at_timeout__cancels_it_and_posts_random_actions(post_move, post_shift):
+    game = factory.create_game(with_delay=False)
     library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime()
+    runtime.submit_computation = Mock(return_value=Future())
+    player = _create_bot(library_factory, runtime, game)
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+    runtime.run_delayed_calls()
+
+    library.run.assert_not_called()
+    library.abort_search.assert_not_called()
+    post_shift.assert_called_once()
+    post_move.assert_called_once()
+
+
+def _create_pondering_game(library_factory, runtime):
+    """ Creates a game with a human player, followed by a pondering bot, and lets the human shift """
+    game = factory.create_game(game_id=7, with_delay=False)
+    human = Player(1)
+    game.add_player(human)
     player = Bot(library_binding_factory=library_factory, move_url="move-url", shift_url="shift-url",
-                 identifier=9)
-    player.set_game(game)
-    player.run()
+                 identifier=9, runtime=runtime, pacing=PACING, pondering_positions=1, ponderer=Ponderer())
+    game.add_player(player)
+    with patch("labyrinth.model.bots._likely_boards", side_effect=lambda board, piece, count: [board.fork()]):
+        game.turns.set_next(PlayerAction(human, PlayerAction.MOVE_ACTION))
+    return game, player
 
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__with_pondering__when_position_matches__continues_speculative_search(post_move, post_shift):
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    game, player = _create_pondering_game(library_factory, runtime)
+    assert len(runtime.speculations) == 1
+
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+    runtime.speculations[0].set_result(None)
+    runtime.run_delayed_calls()
+
+    assert library_factory.call_count == 1
+    assert len(runtime.speculations) == 1
+    assert not runtime.computations
+    library.abort_search.assert_not_called()
     post_shift.assert_called_once_with(BoardLocation(0, 1), 90)
-    post_move.assert_called_once_with(BoardLocation(0, 0))
+
+
+@patch.object(Bot, "_post_shift")
+@patch.object(Bot, "_post_move")
+def test_bot__with_pondering__when_position_differs__aborts_speculative_search(post_move, post_shift):
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    game, player = _create_pondering_game(library_factory, runtime)
+    game.board.shift(BoardLocation(0, 1), 90)
+
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+
+    library.abort_search.assert_called_once()
+    assert library_factory.call_count == 2
+    assert len(runtime.speculations) == 1
+    assert len(runtime.computations) == 1
+
+
+def test_bot__with_pondering__when_speculation_expires__aborts_it():
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    game, player = _create_pondering_game(library_factory, runtime)
+
+    delays = runtime.run_delayed_calls()
+
+    assert delays == [Bot.PONDERING_TIMEOUT]
+    library.abort_search.assert_called_once()
+
+
+def test_bot__with_pondering__submits_speculative_search_without_time_budget():
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+
+    _create_pondering_game(library_factory, runtime)
+
+    library.submit.assert_called_once_with(runtime, speculative=True)
+
+
+def test_bot__with_pondering__when_continued_speculation_exceeds_computation_timeout__aborts_it():
+    library_factory, library = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    game, player = _create_pondering_game(library_factory, runtime)
+    runtime.delayed_calls.clear()
+
+    player.notify_turn_change(PlayerAction.PREPARE_SHIFT)
+    timeout = runtime.delayed_calls.pop(0)
+    timeout.function(*timeout.args)
+
+    assert timeout.delay == Bot.COMPUTATION_TIMEOUT
+    library.abort_search.assert_called_once()
+
+
+def test_bot__without_pondering__does_not_search_during_turns_of_others():
+    library_factory, _ = _mock_library_binding()
+    runtime = SynchronousRuntime(computations_running=True)
+    game = factory.create_game(game_id=7, with_delay=False)
+    human = Player(1)
+    game.add_player(human)
+    game.add_player(Bot(library_binding_factory=library_factory, move_url="move-url", shift_url="shift-url",
+                        identifier=9, runtime=runtime))
+
+    game.turns.set_next(PlayerAction(human, PlayerAction.MOVE_ACTION))
+
+    library_factory.assert_not_called()
+
+
+def test_likely_boards__moves_opponent_towards_objective_on_forks():
+    board = create_board()
+    board = Board(board.maze, leftover_card=board.leftover_card, objective_maze_card=board.maze[BoardLocation(6, 6)])
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(1, 0)]
+
+    forks = _likely_boards(board, piece, 2)
+
+    locations = [fork.maze.maze_card_location(fork.pieces[0].maze_card) for fork in forks]
+    assert locations == [BoardLocation(3, 2), BoardLocation(2, 2)]
+    assert piece.maze_card is board.maze[BoardLocation(1, 0)]
+
+
+def test_likely_boards__when_opponent_can_reach_objective__is_empty():
+    board = create_board()
+    board = Board(board.maze, leftover_card=board.leftover_card, objective_maze_card=board.maze[BoardLocation(2, 2)])
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(1, 0)]
+
+    assert _likely_boards(board, piece, 2) == []
+
+
+def test_bot_runtime__with_many_computations__uses_bounded_number_of_threads():
+    runtime = BotRuntime(max_computations=2, max_requests=1, delay_scheduler=Mock())
+    threads_before = threading.active_count()
+    release = threading.Event()
+    futures = [runtime.submit_computation(release.wait, 1) for _ in range(10)]
+    assert threading.active_count() <= threads_before + 2
+    release.set()
+    assert all(future.result(timeout=1) for future in futures)
+
+
+def test_bot_runtime__queue_depth__counts_computations_waiting_for_a_thread():
+    runtime = BotRuntime(max_computations=2, max_requests=1, delay_scheduler=Mock())
+    release = threading.Event()
+    futures = [runtime.submit_computation(release.wait, 1) for _ in range(5)]
+    assert runtime.queue_depth() == 3
+    release.set()
+    for future in futures:
+        future.result(timeout=1)
+    assert runtime.queue_depth() == 0
+
+
+def test_bot_runtime__queue_depth__does_not_count_speculations():
+    runtime = BotRuntime(max_computations=1, max_speculations=1, delay_scheduler=Mock())
+    release = threading.Event()
+    futures = [runtime.submit_speculation(release.wait, 1) for _ in range(3)]
+    futures.append(runtime.submit_computation(release.wait, 1))
+    assert runtime.queue_depth() == 0
+    release.set()
+    assert all(future.result(timeout=1) for future in futures)
+
+
+def test_bot_runtime__call_later__delegates_to_delay_scheduler():
+    delay_scheduler = Mock()
+    runtime = BotRuntime(delay_scheduler=delay_scheduler)
+    callback = Mock()
+    runtime.call_later(timedelta(seconds=1), callback, 5)
+    delay_scheduler.call_later.assert_called_once_with(timedelta(seconds=1), callback, 5)
+
+
+def test_library_binding__run__stores_action():
+    action = (BoardLocation(0, 1), 90), BoardLocation(0, 0)
+    with patch("labyrinth.model.external_library.ExternalLibraryBinding.__init__", return_value=None):
+        binding = LibraryBinding(board=None, piece=None, game=Mock(), full_library_path="lib.so")
+    with patch.object(LibraryBinding, "find_optimal_action", return_value=action):
+        binding.run()
+    assert binding.shift_action == (BoardLocation(0, 1), 90)
+
+
+def test_library_binding__submit__passes_time_budget_to_library():
+    with patch("labyrinth.model.external_library.ExternalLibraryBinding.__init__", return_value=None):
+        binding = LibraryBinding(board=None, piece=None, game=Mock(), full_library_path="lib.so")
+    with patch.object(LibraryBinding, "find_optimal_action", return_value=None) as find_optimal_action:
+        binding.submit(SynchronousRuntime(), timedelta(seconds=2))
+    find_optimal_action.assert_called_once_with(time_budget=timedelta(seconds=2))
+
+
+def test_service_binding__submit__sends_search_instance_to_service_and_stores_result():
+    game = factory.create_game(with_delay=False)
+    action = (BoardLocation(0, 1), 90), BoardLocation(0, 0)
+    solver_service = Mock()
+    solver_service.submit.return_value = Future()
+    binding = ServiceBinding(game.board, game.board.create_piece(), game, full_library_path="lib.so",
+                             solver_service=solver_service, time_budget=timedelta(seconds=2))
+
+    future = binding.submit(runtime=None)
+    library_path, instance, time_budget = solver_service.submit.call_args[0]
+    assert binding.shift_action is None
+    future.set_result((action, {"current_search_depth": 2, "search_terminated": True}, timedelta(seconds=1)))
+
+    assert (library_path, time_budget) == ("lib.so", timedelta(seconds=2))
+    assert binding.search_duration == timedelta(seconds=1)
+    assert instance.extent == game.board.maze.maze_size
+    assert binding.shift_action == (BoardLocation(0, 1), 90)
+    assert binding.move_action == BoardLocation(0, 0)
+
+
+def test_service_binding__submit__with_speculative_search__submits_speculation_without_time_budget():
+    game = factory.create_game(with_delay=False)
+    solver_service = Mock()
+    solver_service.submit.return_value = Future()
+    binding = ServiceBinding(game.board, game.board.create_piece(), game, full_library_path="lib.so",
+                             solver_service=solver_service, time_budget=timedelta(seconds=2))
+
+    binding.submit(runtime=None, speculative=True)
+
+    assert solver_service.submit.call_args[0][2] is None
+    assert solver_service.submit.call_args[1] == {"speculative": True}
+
+
+def test_service_binding__when_cancelled__completes_without_actions():
+    game = factory.create_game(with_delay=False)
+    solver_service = Mock()
+    solver_service.submit.return_value = Future()
+    binding = ServiceBinding(game.board, game.board.create_piece(), game, full_library_path="lib.so",
+                             solver_service=solver_service)
+
+    future = binding.submit(runtime=None)
+    future.cancel()
+
+    assert future.done()
+    assert binding.shift_action is None
+    assert binding.search_duration is None
+
+
+def test_service_binding__abort_search__aborts_submitted_search_on_service():
+    game = factory.create_game(with_delay=False)
+    solver_service = Mock()
+    solver_service.submit.return_value = Future()
+    binding = ServiceBinding(game.board, game.board.create_piece(), game, full_library_path="lib.so",
+                             solver_service=solver_service)
+    binding.abort_search()
+    solver_service.abort.assert_not_called()
+
+    future = binding.submit(runtime=None)
+    binding.abort_search()
+
+    solver_service.abort.assert_called_once_with(future)
+
+
+def test_service_binding__with_cached_action__does_not_submit_search():
+    game = factory.create_game(with_delay=False)
+    piece = game.board.create_piece()
+    action = (BoardLocation(0, 1), 90), BoardLocation(0, 0)
+    solver_cache = SolverCache()
+    solver_cache.store(SolverCache.search_key("lib", game.board, piece, None), action)
+    solver_service = Mock()
+    binding = ServiceBinding(game.board, piece, game, full_library_path="path/lib.so",
+                             solver_service=solver_service, solver_cache=solver_cache)
+
+    future = binding.submit(runtime=None)
+
+    assert future.done()
+    solver_service.submit.assert_not_called()
+    assert binding.move_action == BoardLocation(0, 0)
+
+
+def test_library_binding__run__with_terminated_search__caches_action_for_next_binding():
+    game = factory.create_game(with_delay=False)
+    piece = game.board.create_piece()
+    action = (BoardLocation(0, 1), 90), BoardLocation(0, 0)
+    solver_cache = SolverCache()
+    with patch("labyrinth.model.external_library.ExternalLibraryBinding.__init__", return_value=None):
+        bindings = [LibraryBinding(game.board, piece, game, full_library_path="path/lib.so",
+                                   solver_cache=solver_cache) for _ in range(2)]
+    with patch.object(LibraryBinding, "find_optimal_action", return_value=action) as find_optimal_action, \
+            patch.object(LibraryBinding, "get_search_status", return_value={"search_terminated": True}):
+        for binding in bindings:
+            binding.run()
+
+    find_optimal_action.assert_called_once()
+    assert bindings[1].shift_action == (BoardLocation(0, 1), 90)
+    assert solver_cache.metrics()["hits"] == 1
+    assert bindings[0].search_duration >= timedelta(0)
+    assert bindings[1].search_duration is None
+
+
+def test_library_binding__determines_cache_key_in_run():
+    game = factory.create_game(with_delay=False)
+    piece = game.board.create_piece()
+    with patch("labyrinth.model.external_library.ExternalLibraryBinding.__init__", return_value=None), \
+            patch.object(SolverCache, "search_key", wraps=SolverCache.search_key) as search_key:
+        binding = LibraryBinding(game.board, piece, game, full_library_path="path/lib.so", solver_cache=SolverCache())
+        search_key.assert_not_called()
+        with patch.object(LibraryBinding, "find_optimal_action", return_value=None):
+            binding.run()
+    search_key.assert_called_once_with("lib", game.board, piece, None)
 
 
 def _mock_library_binding():
     mock_computation_method = Mock()
-    mock_computation_method.start = Mock()
     mock_computation_method.shift_action = BoardLocation(0, 1), 90
     mock_computation_method.move_action = BoardLocation(0, 0)
+    mock_computation_method.get_best_action.return_value = None
+    mock_computation_method.RESULT_FOLLOWS_ABORT = False
+    mock_computation_method.submit.side_effect = \
+        lambda runtime, time_budget=None, speculative=False: \
+        (runtime.submit_speculation if speculative else runtime.submit_computation)(mock_computation_method.run)
     mock_computation_method_factory = Mock()
     mock_computation_method_factory.return_value = mock_computation_method
     return mock_computation_method_factory, mock_computation_method
@@ -93,14 +662,12 @@ def test_random_actions_computes_valid_actions():
         assert move_location in allowed_moves
 
 
-@patch('time.sleep', return_value=None)
 @patch.object(Bot, "_post_shift")
 @patch.object(Bot, "_post_move")
-def test_bot_random_algorith_when_piece_is_pushed_out(post_move, post_shift, time_sleep):
+def test_bot_random_algorith_when_piece_is_pushed_out(post_move, post_shift):
     """ Tests case where piece is positioned on a shift location, so that it is pushed out.
     Runs computation 100 times. Push-out expectation rate is 1/12.
     Probability that no push-out takes place in 100 runs is negligible
-    .start() is patched so that the compute method runs sequentially.
     This test recreates a bug, where the pushed-out piece is not updated correctly, leading
     to exceptions thrown when bot makes a move.
     """
@@ -0,0 +1,62 @@
+""" Tests for module model.candidates. The results are compared with shifts on copies of the board. """
+import copy
+
+import pytest
+
+import labyrinth.model.factories as factory
+from labyrinth.model.candidates import reachable_locations_by_shift
+from labyrinth.model.game import Board, BoardLocation, MazeCard
+from labyrinth.model.reachable import Graph
+
+
+def _expected_reachable_locations(board, piece, shift_location, rotation):
+    board = copy.deepcopy(board)
+    piece = next(board_piece for board_piece in board.pieces
+                 if board_piece.maze_card.identifier == piece.maze_card.identifier)
+    board.shift(shift_location, rotation)
+    piece_location = board.maze.maze_card_location(piece.maze_card)
+    return Graph(board.maze).reachable_locations(piece_location)
+
+
+@pytest.mark.parametrize("maze_size", [5, 7, 9])
+def test_reachable_locations_by_shift__equal_to_shifted_copies(maze_size):
+    """ Tests reachable_locations_by_shift for all shifts of a random board """
+    board = factory.create_board(maze_size=maze_size)
+    piece = board.create_piece()
+    result = reachable_locations_by_shift(board, piece)
+    for (shift_location, rotation), reachable_locations in result.items():
+        assert reachable_locations == _expected_reachable_locations(board, piece, shift_location, rotation)
+
+
+def test_reachable_locations_by_shift__piece_on_pushed_out_card():
+    """ Tests reachable_locations_by_shift with a piece which is pushed out of the maze """
+    board = factory.create_board()
+    piece = board.create_piece()
+    piece.maze_card = board.maze[BoardLocation(6, 1)]
+    result = reachable_locations_by_shift(board, piece)
+    shift_location = BoardLocation(0, 1)
+    for rotation in [0, 90, 180, 270]:
+        if (shift_location, rotation) in result:
+            expected = _expected_reachable_locations(board, piece, shift_location, rotation)
+            assert result[(shift_location, rotation)] == expected
+            assert BoardLocation(0, 1) in expected
+
+
+def test_reachable_locations_by_shift__omits_pushback():
+    """ Tests that the shift location opposing the previous shift location is omitted """
+    board = factory.create_board()
+    piece = board.create_piece()
+    result = reachable_locations_by_shift(board, piece, previous_shift_location=BoardLocation(0, 3))
+    shift_locations = {shift_location for shift_location, _ in result}
+    assert shift_locations == board.shift_locations.difference({BoardLocation(6, 3)})
+
+
+@pytest.mark.parametrize("out_paths, num_rotations", [(MazeCard.STRAIGHT, 2), (MazeCard.CORNER, 4),
+                                                      (MazeCard.T_JUNCT, 4), (MazeCard.CROSS, 1)])
+def test_reachable_locations_by_shift__omits_symmetric_rotations(out_paths, num_rotations):
+    """ Tests that rotations of the leftover which result in identical mazes are only evaluated once """
+    maze, _ = factory.create_maze_and_leftover()
+    board = Board(maze=maze, leftover_card=MazeCard(1000, out_paths, 0))
+    piece = board.create_piece()
+    result = reachable_locations_by_shift(board, piece)
+    assert len(result) == len(board.shift_locations) * num_rotations
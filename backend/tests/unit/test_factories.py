@@ -1,7 +1,11 @@
 """ Tests for module model.factories """
 import math
 from collections import Counter
-from labyrinth.model.factories import create_maze_and_leftover, create_maze
+
+import pytest
+
+from labyrinth.model.exceptions import InvalidSizeException
+from labyrinth.model.factories import create_maze_and_leftover, create_maze, MAX_MAZE_SIZE
 from labyrinth.model.game import BoardLocation, MazeCard
 
 
@@ -31,6 +35,20 @@ def test_create_maze_and_leftover_no_cross_for_size_11():
         assert maze[location].out_paths != MazeCard.CROSS
 
 
+def test_create_maze_and_leftover_for_max_size():
+    """ Tests create_maze_and_leftover for the largest admissible size """
+    maze, leftover = create_maze_and_leftover(size=MAX_MAZE_SIZE)
+    assert maze.maze_size == 101
+    assert len({maze[location] for location in maze.maze_locations} | {leftover}) == 101 * 101 + 1
+    _assert_corners(maze)
+
+
+def test_create_maze_and_leftover_raises_for_size_above_max_size():
+    """ Tests create_maze_and_leftover """
+    with pytest.raises(InvalidSizeException):
+        create_maze_and_leftover(size=MAX_MAZE_SIZE + 2)
+
+
 def test_create_maze_and_leftover_unique_ids_for_size_7():
     """ Tests create_maze_and_leftover.
     Checks unique ids. """
@@ -0,0 +1,42 @@
+""" Tests for LibraryRegistry of module model.external_library """
+import glob
+import os
+from unittest.mock import patch
+
+from labyrinth.model.external_library import LibraryRegistry
+
+
+def test_load__loads_each_library_once():
+    registry = LibraryRegistry()
+    with patch("ctypes.cdll.LoadLibrary") as load_library:
+        first = registry.load("lib.so")
+        second = registry.load("lib.so")
+        registry.load("other.so")
+    assert first is second
+    assert load_library.call_count == 2
+
+
+def test_library_filenames__with_unchanged_folder__does_not_scan_again(tmp_path):
+    (tmp_path / "a.so").touch()
+    registry = LibraryRegistry()
+    with patch("glob.glob", wraps=glob.glob) as glob_mock:
+        first = registry.library_filenames(str(tmp_path), ".so")
+        second = registry.library_filenames(str(tmp_path), ".so")
+    assert first == second == [os.path.join(str(tmp_path), "a.so")]
+    assert glob_mock.call_count == 1
+
+
+def test_library_filenames__when_library_is_added__scans_again(tmp_path):
+    registry = LibraryRegistry()
+    registry.library_filenames(str(tmp_path), ".so")
+    (tmp_path / "b.so").touch()
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+    assert registry.library_filenames(str(tmp_path), ".so") == [os.path.join(str(tmp_path), "b.so")]
+
+
+def test_library_filenames__without_rescan__keeps_cached_filenames(tmp_path):
+    registry = LibraryRegistry(rescan=False)
+    registry.library_filenames(str(tmp_path), ".so")
+    (tmp_path / "b.so").touch()
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+    assert registry.library_filenames(str(tmp_path), ".so") == []
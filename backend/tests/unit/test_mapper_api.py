@@ -103,6 +103,14 @@ def test_mapping_enabled_shift_loctions():
         assert keys.COLUMN in enabled_shift_location
 
 
+def test_mapping_previous_move_path():
+    """ Tests correct mapping of the previous move path """
+    game = _create_test_game()
+    game.board.previous_move_path = [BoardLocation(0, 0), BoardLocation(0, 1)]
+    game_dto = mapper.game_state_to_dto(game, timedelta(0))
+    assert game_dto[keys.PREVIOUS_MOVE_PATH] == [{keys.ROW: 0, keys.COLUMN: 0}, {keys.ROW: 0, keys.COLUMN: 1}]
+
+
 def test_mapping_identifier():
     """ Tests correct mapping of game's identifier """
     game = _create_test_game()
@@ -4,11 +4,12 @@ the methods used to persist a Game instance.
 The tests are performed by creating a Game instance by hand, mapping it to DTO,
 mapping the DTO back to a Game and then asserting the structure of the result """
 from datetime import timedelta
+import threading
 import time
 
 import labyrinth.mapper.persistence as mapper
 from labyrinth.model.game import Game, MazeCard, BoardLocation, Turns, Player, PlayerAction, Board
-from labyrinth.model.bots import create_bot
+from labyrinth.model.bots import create_bot, Bot
 from labyrinth.model.factories import MazeCardFactory
 
 DELAY = timedelta(milliseconds=10)
@@ -32,7 +33,7 @@ def _create_test_game(with_bot=False):
     players = [Player(identifier=player_id, game=None) for player_id in player_ids]
     if with_bot:
         player_ids.append(42)
-        players.append(create_bot(player_id=42, compute_method="dynamic-foo",
+        players.append(create_bot(player_id=42, compute_method="dynamic-foo", full_path="lib/dynamic-foo.so",
                                   shift_url="shift-url", move_url="move-url"))
     board._objective_maze_card = board.maze[BoardLocation(1, 4)]
     turns = Turns(prepare_delay=DELAY, players=players,
@@ -63,6 +64,19 @@ def test_mapping_for_player():
                                  lambda g: g.get_player(player_ids[1]).piece.maze_card.identifier)
 
 
+def test_mapping_for_bot__does_not_start_threads():
+    """ Tests mapping of a bot, and that rehydrating a game with a bot does not start any thread """
+    created_game, player_ids = _create_test_game(with_bot=True)
+    game_dto = mapper.game_to_dto(created_game)
+    threads_before = threading.active_count()
+    game = mapper.dto_to_game(game_dto)
+    assert threading.active_count() == threads_before
+    bot = game.get_player(42)
+    assert type(bot) is Bot
+    assert bot.compute_method_factory.FULL_PATH == "lib/dynamic-foo.so"
+    assert bot.shift_url == "shift-url"
+
+
 def test_mapping_for_leftover():
     """ Tests correct mapping of leftover maze card """
     created_game, _ = _create_test_game()
@@ -117,6 +131,24 @@ def test_mapping_previous_shift_location():
     assert game.previous_shift_location == BoardLocation(0, 3)
 
 
+def test_mapping_previous_move_path():
+    """ Tests correct mapping of previous move path """
+    created_game, _ = _create_test_game()
+    created_game.board.previous_move_path = [BoardLocation(3, 3), BoardLocation(3, 4)]
+    game_dto = mapper.game_to_dto(created_game)
+    game = mapper.dto_to_game(game_dto)
+    assert game.board.previous_move_path == [BoardLocation(3, 3), BoardLocation(3, 4)]
+
+
+def test_mapping_without_previous_move_path():
+    """ Tests that a DTO without previous move path is mapped to a board without path """
+    created_game, _ = _create_test_game()
+    game_dto = mapper.game_to_dto(created_game)
+    del game_dto["previousMovePath"]
+    game = mapper.dto_to_game(game_dto)
+    assert game.board.previous_move_path is None
+
+
 def test_mapping_score():
     """ Tests correct mapping of player's score """
     created_game, player_ids = _create_test_game()
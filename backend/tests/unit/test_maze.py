@@ -1,5 +1,8 @@
 """ Tests for Maze of game.py """
-from labyrinth.model.game import Maze, MazeCard, BoardLocation
+import pytest
+
+from labyrinth.model.exceptions import InvalidShiftLocationException
+from labyrinth.model.game import Maze, MazeCard, BoardLocation, get_topology
 from tests.unit.factories import create_random_maze, MazeCardFactory
 
 
@@ -86,6 +89,65 @@ def test_shift_does_not_alter_rest_of_maze():
         assert difference[0] == 5
 
 
+def test_fork_is_not_altered_by_shift_of_original():
+    """ Tests fork """
+    card_factory = MazeCardFactory()
+    maze = create_random_maze(card_factory)
+    forked = maze.fork()
+    old_id_matrix = _get_id_matrix(forked)
+    maze.shift(BoardLocation(0, 3), card_factory.create_random_maze_card())
+    assert _get_id_matrix(forked) == old_id_matrix
+
+
+def test_original_is_not_altered_by_shift_of_fork():
+    """ Tests fork """
+    card_factory = MazeCardFactory()
+    maze = create_random_maze(card_factory)
+    forked = maze.fork()
+    old_id_matrix = _get_id_matrix(maze)
+    forked.shift(BoardLocation(3, 6), card_factory.create_random_maze_card())
+    forked[BoardLocation(1, 1)] = card_factory.create_random_maze_card()
+    assert _get_id_matrix(maze) == old_id_matrix
+    assert len(_compare_id_matrices(_get_id_matrix(forked), old_id_matrix)) == 8
+
+
+def test_topology_is_shared_by_mazes_of_same_size():
+    """ Tests topology """
+    assert Maze(maze_size=9).topology is Maze(maze_size=9).topology
+    assert Maze(maze_size=9).topology is get_topology(9)
+    assert Maze(maze_size=9).topology is not Maze(maze_size=7).topology
+
+
+def test_topology_tables_are_read_only():
+    """ Tests topology """
+    topology = get_topology(5)
+    with pytest.raises(TypeError):
+        topology.shift_lines[BoardLocation(0, 1)] = ()
+    with pytest.raises(TypeError):
+        topology.opposing_border_locations[BoardLocation(0, 1)] = BoardLocation(0, 1)
+
+
+def test_shift_line_locations_for_western_shift_location():
+    """ Tests shift_line_locations """
+    maze = Maze(maze_size=5)
+    expected = tuple(BoardLocation(3, column) for column in range(5))
+    assert maze.shift_line_locations(BoardLocation(3, 0)) == expected
+
+
+def test_shift_line_locations_for_southern_shift_location():
+    """ Tests shift_line_locations """
+    maze = Maze(maze_size=5)
+    expected = tuple(BoardLocation(row, 1) for row in [4, 3, 2, 1, 0])
+    assert maze.shift_line_locations(BoardLocation(4, 1)) == expected
+
+
+def test_shift_line_locations_raises_for_inner_location():
+    """ Tests shift_line_locations """
+    maze = Maze(maze_size=5)
+    with pytest.raises(InvalidShiftLocationException):
+        maze.shift_line_locations(BoardLocation(2, 2))
+
+
 def test_maze_locations_returns_list_of_correct_size_for_size_7():
     """ Test maze_locations """
     maze = Maze(maze_size=7)
@@ -139,6 +201,31 @@ def test_maze_card_location_returns_correct_location_for_all_cards():
         assert maze.maze_card_location(maze[location]) == location
 
 
+def test_maze_card_location_after_shift__returns_new_locations():
+    """ Test maze_card_location """
+    card_factory = MazeCardFactory()
+    maze = create_random_maze(card_factory)
+    maze.maze_card_location(maze[BoardLocation(0, 0)])
+    inserted = card_factory.create_random_maze_card()
+    pushed_out = maze.shift(BoardLocation(1, 0), inserted)
+    assert maze.maze_card_location(inserted) == BoardLocation(1, 0)
+    assert maze.maze_card_location(pushed_out) is None
+    for location in maze.maze_locations:
+        assert maze.maze_card_location(maze[location]) == location
+
+
+def test_maze_card_location_of_fork__is_not_altered_by_shift_of_original():
+    """ Test maze_card_location """
+    card_factory = MazeCardFactory()
+    maze = create_random_maze(card_factory)
+    maze_card = maze[BoardLocation(1, 6)]
+    maze.maze_card_location(maze_card)
+    forked = maze.fork()
+    maze.shift(BoardLocation(1, 0), card_factory.create_random_maze_card())
+    assert maze.maze_card_location(maze_card) is None
+    assert forked.maze_card_location(maze_card) == BoardLocation(1, 6)
+
+
 def test_is_inside_returns_true_for_inside_location():
     """ Test is_inside """
     maze = Maze(maze_size=7)
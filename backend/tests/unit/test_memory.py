@@ -0,0 +1,67 @@
+""" Tests the memory footprint of games.
+
+Memory is measured with tracemalloc. Objects shared between games of the same maze size,
+such as the maze topology and the fixed card layout, are created before measuring.
+Absolute numbers depend on the interpreter and platform. Hence, allocations are compared with those of
+dict-backed reference objects, or of a full copy, measured on the same interpreter.
+"""
+import copy
+import gc
+import tracemalloc
+
+import labyrinth.model.factories as factory
+from labyrinth.model.game import MazeCard, Player
+
+
+class _DictBackedObject:
+    """ A reference object with an instance dict, holding three attributes like a MazeCard or a PlayerAction """
+
+    def __init__(self, first, second, third):
+        self.first = first
+        self.second = second
+        self.third = third
+
+
+def _allocated_bytes(create):
+    """ Returns the number of bytes allocated by create(), which remain allocated while its result is alive """
+    create()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        created = create()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del created
+    return after - before
+
+
+def _create_game(maze_size, num_players):
+    game = factory.create_game(maze_size=maze_size, with_delay=False)
+    for player_id in range(num_players):
+        game.add_player(Player(player_id))
+    return game
+
+
+def test_maze_cards__allocate_less_than_dict_backed_objects():
+    maze_cards = _allocated_bytes(lambda: [MazeCard(identifier, MazeCard.CORNER, 90) for identifier in range(1000)])
+    references = _allocated_bytes(lambda: [_DictBackedObject(identifier, MazeCard.CORNER, 90)
+                                           for identifier in range(1000)])
+    assert maze_cards < references
+
+
+def test_game_with_four_players__allocates_less_for_turns_than_four_actions_per_player():
+    without_players = _allocated_bytes(lambda: _create_game(maze_size=7, num_players=0))
+    with_players = _allocated_bytes(lambda: _create_game(maze_size=7, num_players=4))
+    player_actions = _allocated_bytes(lambda: [_DictBackedObject(player_id, action, None)
+                                               for player_id in range(4) for action in range(4)])
+    assert with_players - without_players < player_actions
+
+
+def test_board_fork__of_size_31__allocates_small_fraction_of_deepcopy():
+    board = _create_game(maze_size=31, num_players=4).board
+    fork = _allocated_bytes(board.fork)
+    deepcopy = _allocated_bytes(lambda: copy.deepcopy(board))
+    assert fork < deepcopy / 10
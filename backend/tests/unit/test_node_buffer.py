@@ -0,0 +1,51 @@
+""" Tests for module model.node_buffer, and its use by Board """
+import ctypes
+
+import numpy as np
+
+import labyrinth.model.factories as factory
+from labyrinth.model.external_library import NODE
+from labyrinth.model.game import BoardLocation
+from labyrinth.model.node_buffer import NODE_DTYPE, NodeBuffer, out_paths_bitmask
+
+
+def test_node_dtype__has_layout_of_cnode():
+    assert NODE_DTYPE.itemsize == ctypes.sizeof(NODE) == 8
+    for name, _ in NODE._fields_:
+        assert NODE_DTYPE.fields[name][1] == getattr(NODE, name).offset
+
+
+def test_out_paths_bitmask():
+    assert out_paths_bitmask("NS") == 5
+    assert out_paths_bitmask("NESW") == 15
+
+
+def test_node_buffer__contains_maze_cards_row_wise_and_leftover():
+    board = factory.create_board(maze_size=9)
+    buffer = NodeBuffer(board)
+
+    assert len(buffer.nodes) == 9 * 9 + 1
+    card = board.maze[BoardLocation(2, 5)]
+    assert tuple(buffer.nodes[2 * 9 + 5]) == (card.identifier, out_paths_bitmask(card.out_paths), card.rotation)
+    assert buffer.nodes[-1]["node_id"] == board.leftover_card.identifier
+
+
+def test_board_node_buffer__after_shifts__is_updated_in_place_and_equals_new_buffer():
+    board = factory.create_board(maze_size=7)
+    buffer = board.node_buffer()
+
+    for shift_location, rotation in [(BoardLocation(0, 1), 90), (BoardLocation(3, 6), 180), (BoardLocation(6, 5), 0)]:
+        board.shift(shift_location, rotation)
+        assert board.node_buffer() is buffer
+        assert np.array_equal(buffer.nodes, NodeBuffer(board).nodes)
+
+
+def test_board_node_buffer__of_fork__is_not_altered_by_shift_of_original():
+    board = factory.create_board(maze_size=7)
+    board.node_buffer()
+    forked = board.fork()
+    nodes_before = forked.node_buffer().nodes.copy()
+
+    board.shift(BoardLocation(0, 1), 90)
+
+    assert np.array_equal(forked.node_buffer().nodes, nodes_before)
@@ -1,7 +1,7 @@
 """ Tests for Graph. A Board instance is created from a string representation of a labyrinth.
 Several validation tests are performed on this instance """
-from labyrinth.model.game import BoardLocation
-from labyrinth.model.reachable import Graph
+from labyrinth.model.game import BoardLocation, MazeCard
+from labyrinth.model.reachable import Graph, ConnectedComponents
 from labyrinth.model.factories import create_maze
 
 
@@ -90,6 +90,86 @@ def test_reachable_locations():
     assert set(reachable) == expected
 
 
+def test_find_path_returns_shortest_path():
+    """ Tests find_path """
+    maze = create_maze(MAZE_STRING)
+    graph = Graph(maze)
+    path = graph.find_path(BoardLocation(0, 1), BoardLocation(1, 3))
+    assert path == [BoardLocation(0, 1), BoardLocation(0, 2), BoardLocation(0, 3), BoardLocation(1, 3)]
+
+
+def test_find_path_for_same_location():
+    """ Tests find_path """
+    maze = create_maze(MAZE_STRING)
+    assert Graph(maze).find_path(BoardLocation(3, 3), BoardLocation(3, 3)) == [BoardLocation(3, 3)]
+
+
+def test_find_path_returns_connected_path_for_distant_cards():
+    """ Tests find_path. Each consecutive pair of locations on the path has to be connected neighbors,
+    and the length has to equal the BFS distance """
+    maze = create_maze(MAZE_STRING)
+    path = Graph(maze).find_path(BoardLocation(5, 0), BoardLocation(1, 4))
+    assert path[0] == BoardLocation(5, 0)
+    assert path[-1] == BoardLocation(1, 4)
+    for location, next_location in zip(path, path[1:]):
+        assert abs(location.row - next_location.row) + abs(location.column - next_location.column) == 1
+        assert next_location in set(Graph(maze)._neighbors(location))
+    assert len(path) == len(set(path))
+    assert len(path) - 1 == _bfs_distance(Graph(maze), BoardLocation(5, 0), BoardLocation(1, 4))
+
+
+def _bfs_distance(graph, source, target):
+    """ Returns the number of steps of a shortest path from source to target, by breadth-first search """
+    distances = {source: 0}
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for location in frontier:
+            for neighbor in graph._neighbors(location):
+                if neighbor not in distances:
+                    distances[neighbor] = distances[location] + 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distances.get(target)
+
+
+def test_find_path_returns_none_for_unconnected_cards():
+    """ Tests find_path """
+    maze = create_maze(MAZE_STRING)
+    assert Graph(maze).find_path(BoardLocation(1, 0), BoardLocation(4, 4)) is None
+
+
+def test_component_of_equals_reachable_locations():
+    """ Tests ConnectedComponents.component_of """
+    maze = create_maze(MAZE_STRING)
+    components = ConnectedComponents(maze)
+    for location in maze.maze_locations:
+        assert components.component_of(location) == Graph(maze).reachable_locations(location)
+
+
+def test_same_component():
+    """ Tests ConnectedComponents.same_component """
+    maze = create_maze(MAZE_STRING)
+    components = ConnectedComponents(maze)
+    assert components.same_component(BoardLocation(1, 4), BoardLocation(5, 0))
+    assert components.same_component(BoardLocation(0, 0), BoardLocation(0, 0))
+    assert not components.same_component(BoardLocation(1, 0), BoardLocation(4, 4))
+
+
+def test_update_after_replacing_maze_card():
+    """ Tests ConnectedComponents.update. Replaces the card at (2, 2) by a horizontal straight,
+    which disconnects it from (1, 2) """
+    maze = create_maze(MAZE_STRING)
+    components = ConnectedComponents(maze)
+    assert components.same_component(BoardLocation(2, 2), BoardLocation(1, 2))
+    maze[BoardLocation(2, 2)] = MazeCard(100, MazeCard.STRAIGHT, 90)
+    components.update([BoardLocation(2, 2)])
+    assert not components.same_component(BoardLocation(2, 2), BoardLocation(1, 2))
+    assert components.same_component(BoardLocation(2, 2), BoardLocation(2, 1))
+    for location in maze.maze_locations:
+        assert components.component_of(location) == Graph(maze).reachable_locations(location)
+
+
 MAZE_STRING = """
 ###|#.#|#.#|###|#.#|#.#|###|
 #..|#..|...|...|#..|..#|..#|
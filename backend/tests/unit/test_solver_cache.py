@@ -0,0 +1,91 @@
+""" Tests for module model.solver_cache """
+from unittest.mock import patch
+
+import labyrinth.model.factories as factory
+from labyrinth.model.game import BoardLocation
+from labyrinth.model.solver_cache import SolverCache
+from labyrinth.model.symmetry import Transform
+
+ACTION = (BoardLocation(0, 1), 90), BoardLocation(2, 3)
+
+
+def test_get__after_put__returns_action_and_counts_hit():
+    cache = SolverCache()
+    cache.put(("lib", 1, 0, None), ACTION)
+
+    assert cache.get(("lib", 1, 0, None)) == ACTION
+    assert cache.get(("lib", 2, 0, None)) is None
+    assert cache.metrics() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+
+def test_put__beyond_capacity__evicts_least_recently_used_entry():
+    cache = SolverCache(capacity=2)
+    cache.put("a", ACTION)
+    cache.put("b", ACTION)
+    cache.get("a")
+    cache.put("c", ACTION)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ACTION
+    assert cache.get("c") == ACTION
+
+
+def test_get__with_database__returns_action_put_into_other_cache(tmp_path):
+    database_path = str(tmp_path / "cache.sqlite")
+    key = ("lib", 12345, 1, (0, 3))
+    writing_cache = SolverCache(database_path=database_path)
+    writing_cache.put(key, ACTION)
+    writing_cache.close()
+
+    reading_cache = SolverCache(database_path=database_path)
+    assert reading_cache.get(key) == ACTION
+    reading_cache.close()
+
+
+def test_search_key__differs_by_method_piece_and_previous_shift_location():
+    board = factory.create_board()
+    pieces = [board.create_piece(), board.create_piece()]
+    keys = {SolverCache.search_key("exhsearch", board, pieces[0], None).key,
+            SolverCache.search_key("minimax", board, pieces[0], None).key,
+            SolverCache.search_key("exhsearch", board, pieces[1], None).key,
+            SolverCache.search_key("exhsearch", board, pieces[0], BoardLocation(0, 1)).key}
+    assert len(keys) == 4
+
+
+def test_search_key__after_shift__differs():
+    board = factory.create_board()
+    piece = board.create_piece()
+    search_key = SolverCache.search_key("exhsearch", board, piece, None)
+    board.shift(BoardLocation(0, 1), 90)
+    assert SolverCache.search_key("exhsearch", board, piece, None).key != search_key.key
+
+
+def test_lookup__of_rotated_board__returns_rotated_action():
+    board = factory.create_board()
+    piece = board.create_piece()
+    transform = Transform(quarter_turns=1)
+    rotated = transform.map_board(board)
+    cache = SolverCache()
+    cache.store(SolverCache.search_key("exhsearch", board, piece, None), ACTION)
+
+    action = cache.lookup(SolverCache.search_key("exhsearch", rotated, rotated.pieces[0], None))
+
+    assert action == transform.map_action(ACTION, 7, board.leftover_card.out_paths)
+
+
+def test_search_key__of_large_maze__uses_state_hash_without_canonical_form():
+    board = factory.create_board(maze_size=SolverCache.CANONICAL_MAX_MAZE_SIZE + 2)
+    piece = board.create_piece()
+    with patch("labyrinth.model.solver_cache.canonical_form") as canonical_form:
+        search_key = SolverCache.search_key("exhsearch", board, piece, None)
+    canonical_form.assert_not_called()
+    assert search_key.key == ("exhsearch", board.state_hash, piece.piece_index)
+
+
+def test_search_key__of_large_maze__differs_by_previous_shift_location():
+    board = factory.create_board(maze_size=SolverCache.CANONICAL_MAX_MAZE_SIZE + 2)
+    piece = board.create_piece()
+    search_key = SolverCache.search_key("exhsearch", board, piece, BoardLocation(0, 1))
+    assert search_key.key != SolverCache.search_key("exhsearch", board, piece, None).key
+    board.previous_shift_location = BoardLocation(0, 1)
+    assert search_key.key == SolverCache.search_key("exhsearch", board, piece, None).key
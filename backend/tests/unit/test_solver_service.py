@@ -0,0 +1,145 @@
+""" Tests for module model.solver_service. The process pool is replaced by an executor whose futures are
+resolved by the tests. """
+import pickle
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+import labyrinth.model.factories as factory
+from labyrinth.model.external_library import SearchInstance
+from labyrinth.model.solver_service import SolverService
+
+
+class ManualExecutor:
+    def __init__(self, *args, **kwargs):
+        self.submitted = []
+
+    def submit(self, function, *args):
+        future = Future()
+        self.submitted.append((future, function, args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@patch("labyrinth.model.solver_service.ProcessPoolExecutor", ManualExecutor)
+def test_submit__passes_library_instance_and_deadline_after_time_budget():
+    service = SolverService(["lib.so"], max_workers=2, time_budget=timedelta(seconds=3))
+    instance = Mock()
+
+    try:
+        before = time.time()
+        service.submit("lib.so", instance)
+        service.submit("lib.so", instance, time_budget=timedelta(milliseconds=500))
+        after = time.time()
+        submitted = service._executor.submitted
+    finally:
+        service.shutdown()
+
+    assert [args[:2] + args[3:4] for _, _, args in submitted] == [("lib.so", instance, 1), ("lib.so", instance, 1)]
+    assert before + 3 <= submitted[0][2][2] <= after + 3
+    assert before + 0.5 <= submitted[1][2][2] <= after + 0.5
+
+
+@patch("labyrinth.model.solver_service.ProcessPoolExecutor", ManualExecutor)
+def test_abort__of_running_search__sets_its_abort_event():
+    service = SolverService(max_workers=1)
+
+    try:
+        waiting, running = service.submit("lib.so", Mock()), service.submit("lib.so", Mock())
+        running.set_running_or_notify_cancel()
+        service.abort(waiting)
+        service.abort(running)
+        abort_events = [args[4] for _, _, args in service._executor.submitted]
+        aborted = [abort_event.is_set() for abort_event in abort_events]
+    finally:
+        service.shutdown()
+
+    assert waiting.cancelled()
+    assert aborted == [False, True]
+
+
+@patch("labyrinth.model.solver_service.ProcessPoolExecutor", ManualExecutor)
+def test_metrics__counts_pending_searches_beyond_workers_as_queued():
+    service = SolverService(max_workers=2)
+
+    try:
+        for _ in range(5):
+            service.submit("lib.so", Mock())
+        service._executor.submitted[0][0].set_result(None)
+        metrics = service.metrics()
+    finally:
+        service.shutdown()
+
+    assert metrics["workers"] == 2
+    assert metrics["pending"] == 4
+    assert metrics["queue_depth"] == 2
+    assert metrics["completed"] == 1
+    assert metrics["max_latency"] >= metrics["mean_latency"] >= 0
+
+
+@patch("labyrinth.model.solver_service.ProcessPoolExecutor", ManualExecutor)
+def test_submit__with_speculative_search__runs_it_on_separate_pool_without_counting_it():
+    service = SolverService(max_workers=1)
+
+    try:
+        service.submit("lib.so", Mock(), speculative=True)
+        service.submit("lib.so", Mock(), speculative=True)
+        metrics = service.metrics()
+        searches, speculations = service._executor, service._speculation_executor
+    finally:
+        service.shutdown()
+
+    assert searches is None
+    assert len(speculations.submitted) == 2
+    assert metrics["pending"] == 0
+    assert metrics["queue_depth"] == 0
+
+
+@patch("labyrinth.model.solver_service.ProcessPoolExecutor", ManualExecutor)
+def test_submit__with_speculative_search_without_time_budget__passes_no_deadline():
+    service = SolverService(max_workers=1, time_budget=timedelta(seconds=3))
+
+    try:
+        service.submit("lib.so", Mock(), speculative=True)
+        deadline = service._speculation_executor.submitted[0][2][2]
+    finally:
+        service.shutdown()
+
+    assert deadline is None
+
+
+@patch("labyrinth.model.solver_service.ProcessPoolExecutor", ManualExecutor)
+def test_abort__of_speculative_search__sets_its_abort_event():
+    service = SolverService(max_workers=1)
+
+    try:
+        future = service.submit("lib.so", Mock(), speculative=True)
+        future.set_running_or_notify_cancel()
+        service.abort(future)
+        aborted = service._speculation_executor.submitted[0][2][4].is_set()
+    finally:
+        service.shutdown()
+
+    assert aborted
+
+
+def test_max_workers__defaults_to_available_cores():
+    assert SolverService().max_workers >= 1
+
+
+def test_search_instance__survives_pickling():
+    board = factory.create_board(maze_size=7)
+    instance = SearchInstance.from_board(board, board.create_piece())
+
+    copied = pickle.loads(pickle.dumps(instance))
+
+    assert np.array_equal(copied.nodes, instance.nodes)
+    assert len(copied.nodes) == 7 * 7 + 1
+    assert copied.player_locations == instance.player_locations
+    assert copied.objective_id == board.objective_maze_card.identifier
+    assert copied.previous_shift_location == (-1, -1)
@@ -0,0 +1,67 @@
+""" Tests for module model.symmetry """
+import pytest
+
+import labyrinth.model.factories as factory
+from labyrinth.model.game import BoardLocation
+from labyrinth.model.reachable import Graph
+from labyrinth.model.symmetry import TRANSFORMS, Transform, canonical_form
+
+
+def _create_board(maze_size=7):
+    board = factory.create_board(maze_size=maze_size)
+    board.create_piece()
+    board.create_piece()
+    return board
+
+
+def test_map_location__rotation__turns_clockwise():
+    assert Transform(1).map_location(BoardLocation(0, 1), 7) == BoardLocation(1, 6)
+    assert Transform(0, True).map_location(BoardLocation(0, 1), 7) == BoardLocation(0, 5)
+
+
+@pytest.mark.parametrize("transform", TRANSFORMS)
+def test_inverse__undoes_transform(transform):
+    for location in [BoardLocation(0, 1), BoardLocation(2, 5), BoardLocation(6, 3)]:
+        assert transform.inverse().map_location(transform.map_location(location, 7), 7) == location
+
+
+@pytest.mark.parametrize("transform", TRANSFORMS)
+def test_map_board__maps_shift_locations_to_shift_locations(transform):
+    board = _create_board()
+    assert {transform.map_location(location, 7) for location in board.shift_locations} == board.shift_locations
+
+
+@pytest.mark.parametrize("transform", TRANSFORMS)
+def test_canonical_form__is_equal_for_all_orientations(transform):
+    board = _create_board()
+    board.previous_shift_location = BoardLocation(0, 3)
+    canonical_hash, _ = canonical_form(board)
+    assert canonical_form(transform.map_board(board))[0] == canonical_hash
+
+
+def test_canonical_form__differs_for_different_boards():
+    assert canonical_form(_create_board())[0] != canonical_form(_create_board())[0]
+
+
+@pytest.mark.parametrize("transform", TRANSFORMS)
+def test_unmap_action__of_action_on_mapped_board__yields_equivalent_action_on_original(transform):
+    """ Performs an action on the mapped board, maps it back, and performs it on the original board.
+    Both boards are expected to be images of each other afterwards """
+    board = _create_board()
+    mapped = transform.map_board(board)
+    piece = mapped.pieces[0]
+    mapped.shift(BoardLocation(0, 1), 90)
+    piece_location = mapped.maze.maze_card_location(piece.maze_card)
+    move_location = max(Graph(mapped.maze).reachable_locations(piece_location), key=lambda loc: (loc.row, loc.column))
+    mapped.move(piece, move_location)
+
+    (shift_location, rotation), original_move = transform.unmap_action(((BoardLocation(0, 1), 90), move_location), 7,
+                                                                       board.leftover_card.out_paths)
+    board.shift(shift_location, rotation)
+    board.move(board.pieces[0], original_move)
+
+    remapped = transform.map_board(board)
+    for location in board.maze.maze_locations:
+        assert remapped.maze[location].identifier == mapped.maze[location].identifier
+        assert remapped.maze[location].rotated_out_paths() == mapped.maze[location].rotated_out_paths()
+    assert remapped.maze.maze_card_location(remapped.pieces[0].maze_card) == move_location
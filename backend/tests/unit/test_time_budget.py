@@ -0,0 +1,87 @@
+""" Tests for module model.time_budget """
+from datetime import timedelta
+
+from labyrinth.model.time_budget import TimeBudgetManager
+
+
+def _status(depth, terminated=False):
+    return {"current_search_depth": depth, "search_terminated": terminated}
+
+
+def _record_doubling_times(manager, maze_size=7):
+    """ Records searches whose depth d has taken 0.1 * 2 ** (d - 1) seconds """
+    for depth in range(1, 6):
+        manager.record("exh", maze_size, timedelta(seconds=0.1 * 2 ** (depth - 1)), _status(depth, terminated=True))
+
+
+def test_budget__without_observations__scales_default_budget_with_maze_size():
+    manager = TimeBudgetManager(default_budget=timedelta(seconds=2))
+
+    assert manager.budget("exh", 7) == timedelta(seconds=2)
+    assert manager.budget("exh", 9) > timedelta(seconds=3)
+    assert manager.budget("exh", 3) == timedelta(milliseconds=500)
+
+
+def test_budget__is_at_most_player_timeout():
+    manager = TimeBudgetManager(default_budget=timedelta(seconds=8), player_timeout=timedelta(seconds=5))
+
+    assert manager.budget("exh", 7) == timedelta(seconds=5)
+
+
+def test_budget__is_at_most_remaining_time():
+    manager = TimeBudgetManager(default_budget=timedelta(seconds=8), player_timeout=timedelta(seconds=30))
+
+    assert manager.budget("exh", 7, remaining_time=timedelta(seconds=4)) == timedelta(seconds=4)
+    assert manager.budget("exh", 7, remaining_time=timedelta(milliseconds=200)) == timedelta(milliseconds=200)
+    assert manager.budget("exh", 7, remaining_time=-timedelta(seconds=1)) == timedelta(0)
+
+
+def test_budget__with_observations__ends_after_deepest_depth_which_can_be_completed():
+    manager = TimeBudgetManager(max_budget=timedelta(seconds=3))
+    _record_doubling_times(manager)
+
+    budget = manager.budget("exh", 7)
+
+    assert timedelta(seconds=1.6) * TimeBudgetManager.MARGIN - timedelta(milliseconds=10) < budget
+    assert budget < timedelta(seconds=1.6) * TimeBudgetManager.MARGIN + timedelta(milliseconds=10)
+
+
+def test_budget__with_observations__does_not_affect_other_maze_sizes_and_methods():
+    manager = TimeBudgetManager(default_budget=timedelta(seconds=3))
+    _record_doubling_times(manager)
+
+    assert manager.budget("exh", 9) == timedelta(seconds=3) * (9 / 7) ** 2
+    assert manager.budget("minimax", 7) == timedelta(seconds=3)
+
+
+def test_budget__with_waiting_searches__shrinks_available_time():
+    queue_depth = 0
+    manager = TimeBudgetManager(default_budget=timedelta(seconds=6), max_budget=timedelta(seconds=8),
+                                queue_depth=lambda: queue_depth)
+    assert manager.budget("exh", 7) == timedelta(seconds=6)
+
+    queue_depth = 3
+    assert manager.budget("exh", 7) == timedelta(seconds=2)
+
+    queue_depth = 100
+    assert manager.budget("exh", 7) == timedelta(milliseconds=500)
+
+
+def test_record__with_aborted_searches__records_completed_depth():
+    manager = TimeBudgetManager(max_budget=timedelta(seconds=3))
+    for depth in range(1, 6):
+        manager.record("exh", 7, timedelta(seconds=0.1 * 2 ** (depth - 1)), _status(depth + 1))
+
+    budget = manager.budget("exh", 7)
+
+    assert timedelta(seconds=1.6) * TimeBudgetManager.MARGIN - timedelta(milliseconds=10) < budget
+    assert budget < timedelta(seconds=1.6) * TimeBudgetManager.MARGIN + timedelta(milliseconds=10)
+
+
+def test_record__without_completed_depth__is_ignored():
+    manager = TimeBudgetManager(default_budget=timedelta(seconds=3))
+    for _ in range(TimeBudgetManager.MIN_OBSERVATIONS):
+        manager.record("exh", 7, timedelta(seconds=3), _status(1))
+        manager.record("exh", 7, timedelta(seconds=1), _status(0, terminated=True))
+
+    assert manager.budget("exh", 7) == timedelta(seconds=3)
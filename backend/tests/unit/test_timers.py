@@ -0,0 +1,97 @@
+""" Tests for module model.timers """
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import Mock
+
+from labyrinth.model.timers import DelayScheduler
+
+
+def test_call_later__executes_calls_in_order_of_due_time():
+    scheduler = DelayScheduler()
+    calls = []
+    done = threading.Event()
+    scheduler.call_later(0.04, lambda: (calls.append("late"), done.set()))
+    scheduler.call_later(0.01, calls.append, "early")
+    assert done.wait(timeout=1)
+    assert calls == ["early", "late"]
+
+
+def test_call_later__accepts_timedelta():
+    scheduler = DelayScheduler()
+    done = threading.Event()
+    scheduler.call_later(timedelta(milliseconds=5), done.set)
+    assert done.wait(timeout=1)
+
+
+def test_call_later__does_not_execute_before_delay():
+    scheduler = DelayScheduler()
+    callback = Mock()
+    scheduler.call_later(0.2, callback)
+    time.sleep(0.05)
+    callback.assert_not_called()
+
+
+def test_cancel__prevents_execution():
+    scheduler = DelayScheduler()
+    callback = Mock()
+    done = threading.Event()
+    delayed_call = scheduler.call_later(0.01, callback)
+    scheduler.call_later(0.03, done.set)
+    delayed_call.cancel()
+    assert done.wait(timeout=1)
+    callback.assert_not_called()
+    assert scheduler.pending() == 0
+
+
+def test_call_later__with_many_calls__uses_one_thread():
+    scheduler = DelayScheduler()
+    threads_before = threading.active_count()
+    done = threading.Event()
+    for _ in range(100):
+        scheduler.call_later(0.01, lambda: None)
+    scheduler.call_later(0.02, done.set)
+    assert threading.active_count() <= threads_before + 1
+    assert done.wait(timeout=1)
+
+
+def test_call_later__when_callback_raises__executes_later_calls():
+    scheduler = DelayScheduler()
+    done = threading.Event()
+    scheduler.call_later(0.01, Mock(side_effect=ValueError()))
+    scheduler.call_later(0.02, done.set)
+    assert done.wait(timeout=1)
+
+
+def test_call_later_on_worker__does_not_execute_on_timer_thread():
+    scheduler = DelayScheduler()
+    timer_thread_names = []
+    worker_thread_names = []
+    done = threading.Event()
+    scheduler.call_later(0.01, lambda: timer_thread_names.append(threading.current_thread().name))
+    scheduler.call_later_on_worker(0.01, lambda: (worker_thread_names.append(threading.current_thread().name),
+                                                  done.set()))
+    assert done.wait(timeout=1)
+    assert timer_thread_names == ["delay-scheduler"]
+    assert worker_thread_names[0] != "delay-scheduler"
+
+
+def test_call_later_on_worker__when_callback_blocks__executes_later_calls():
+    scheduler = DelayScheduler()
+    release = threading.Event()
+    done = threading.Event()
+    scheduler.call_later_on_worker(0.01, release.wait, 1)
+    scheduler.call_later(0.02, done.set)
+    assert done.wait(timeout=0.5)
+    release.set()
+
+
+def test_call_later_on_worker__cancel__prevents_execution():
+    scheduler = DelayScheduler()
+    callback = Mock()
+    done = threading.Event()
+    delayed_call = scheduler.call_later_on_worker(0.01, callback)
+    scheduler.call_later_on_worker(0.03, done.set)
+    delayed_call.cancel()
+    assert done.wait(timeout=1)
+    callback.assert_not_called()
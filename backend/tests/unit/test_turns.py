@@ -177,6 +177,16 @@ def test_remove_second_player_next_player_action_should_be_remaining_player():
     player1.callback.assert_called_once()
 
 
+def test_remove_preceding_player__keeps_next_player_action():
+    """ Tests that removing a player before the next player in the progression keeps the next action """
+    player1, player2, player3 = Player(1, 0), Player(2, 0), Player(3, 0)
+    turns = Turns(players=[player1, player2, player3])
+    turns.set_next(PlayerAction(player3, PlayerAction.MOVE_ACTION))
+    turns.remove_player(player1)
+    assert turns.next_player_action() == PlayerAction(player3, PlayerAction.MOVE_ACTION)
+    assert turns.is_action_possible(player3, PlayerAction.MOVE_ACTION)
+
+
 def test_remove_player__with_only_one_player__no_callback_called():
     turns = Turns()
     player = Mock()
@@ -289,3 +299,40 @@ def test_given_delay_with_two_players__when_player1_leaves_during_wait__player1_
     time.sleep(timedelta(milliseconds=50).total_seconds())
 
     player1.callback.assert_not_called()
+
+
+def test_given_delay__schedules_transition_on_delay_scheduler():
+    delay_scheduler = Mock()
+    turns = Turns(prepare_delay=timedelta(milliseconds=30), delay_scheduler=delay_scheduler)
+    player = Player(1)
+    turns.add_player(player)
+    turns.start()
+
+    delay_scheduler.call_later_on_worker.assert_called_once()
+    delay, callback, player_action = delay_scheduler.call_later_on_worker.call_args[0]
+    assert delay == timedelta(milliseconds=30)
+    assert player_action == PlayerAction(player, PlayerAction.PREPARE_SHIFT)
+    callback(player_action)
+    assert turns.next_player_action() == PlayerAction(player, PlayerAction.SHIFT_ACTION)
+
+
+def test_given_delay__when_next_player_is_removed__cancels_delayed_transition():
+    delay_scheduler = Mock()
+    turns = Turns(prepare_delay=timedelta(milliseconds=30), delay_scheduler=delay_scheduler)
+    player1, player2 = Player(1), Player(2)
+    turns.add_player(player1)
+    turns.add_player(player2)
+    turns.start()
+    delayed_transition = delay_scheduler.call_later_on_worker.return_value
+
+    turns.remove_player(player1)
+
+    delayed_transition.cancel.assert_called()
+    assert delay_scheduler.call_later_on_worker.call_count == 2
+
+
+def test_player_after__returns_players_in_turn_order():
+    player1, player2, player3 = Player(1), Player(2), Player(3)
+    turns = Turns(players=[player1, player2, player3])
+
+    assert [turns.player_after(player) for player in (player1, player2, player3)] == [player2, player3, player1]
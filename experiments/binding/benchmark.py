@@ -0,0 +1,85 @@
+""" This module benchmarks the binding to a solver library, separating the marshalling of the board from the search.
+
+For each maze size, it measures
+- the marshalling of the board into a freshly built NodeBuffer, as done for a board without an up-to-date buffer,
+- the marshalling after a shift, i.e. the in-place update of a NodeBuffer. The shift itself is not measured, and
+- the search itself, for an instance whose nodes are already marshalled.
+Invoke e.g. with
+
+    python benchmark.py --library path/to/libexhsearch.so --outfile binding.csv --sizes 7,9,11
+"""
+import csv
+from datetime import timedelta
+import random
+import timeit
+
+import click
+
+import labyrinth.model.factories as factory
+from labyrinth.model.external_library import ExternalLibraryBinding, SearchInstance
+from labyrinth.model.game import Player
+from labyrinth.model.node_buffer import NodeBuffer
+
+
+@click.command()
+@click.option("--library", required=True, help="Path to the shared library.")
+@click.option("--outfile", required=True)
+@click.option("--sizes", default="7,9,11", help="Maze sizes, comma-separated.")
+@click.option("--repeats", default=20)
+@click.option("--timeout", default=1.0, help="Time budget per search in seconds.")
+def benchmark_binding(library, outfile, sizes, repeats, timeout):
+    sizes = [int(size) for size in sizes.split(",")]
+    results = {}
+    for size in sizes:
+        print(f"Running benchmark for size {size}..")
+        results[size] = benchmark_size(library, size, repeats, timeout)
+    _write_csv(results, outfile)
+
+
+def benchmark_size(library, size, repeats, timeout):
+    """ Reports the minimum of <repeat> runs in seconds for each measurement """
+    game = factory.create_game(maze_size=size, with_delay=False)
+    game.add_player(Player(0))
+    board = game.board
+    piece = board.pieces[0]
+    shift_locations = sorted(board.shift_locations, key=str)
+
+    def marshal_full():
+        NodeBuffer(board)
+        SearchInstance.from_board(board, piece, copy_nodes=False)
+
+    node_buffer = NodeBuffer(board)
+    last_shift = []
+
+    def shift():
+        shift_location = random.choice(shift_locations)
+        board.shift(shift_location, random.choice([0, 90, 180, 270]))
+        last_shift[:] = [shift_location]
+
+    def marshal_after_shift():
+        node_buffer.update(board, last_shift[0])
+
+    def solve():
+        binding = ExternalLibraryBinding(library)
+        binding.find_action(instance, time_budget=timedelta(seconds=timeout))
+
+    board.node_buffer()
+    instance = SearchInstance.from_board(board, piece)
+    return {
+        "marshal_full": min(timeit.Timer(marshal_full).repeat(repeats, 1)),
+        "marshal_after_shift": min(timeit.Timer(marshal_after_shift, setup=shift).repeat(repeats, 1)),
+        "solve": min(timeit.Timer(solve).repeat(repeats, 1)),
+    }
+
+
+def _write_csv(results, outfile):
+    with open(outfile, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        measurements = list(next(iter(results.values())).keys())
+        writer.writerow(["size"] + measurements)
+        for size, result in results.items():
+            writer.writerow([size] + [result[measurement] for measurement in measurements])
+
+
+if __name__ == "__main__":
+    benchmark_binding()
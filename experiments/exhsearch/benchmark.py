@@ -18,27 +18,49 @@ import labyrinth.model.external_library as external
               help="Name of a specific test-case. If none given, all test-cases are run.")
 @click.option("--repeats", default=5)
 @click.option("--only-min/--all-values", default=True)
-def benchmark_instances(instance_folder, outfile, library, pattern, repeats, only_min):
+@click.option("--search-threads", type=int, default=1,
+              help="Number of threads of each search (0 for one per core).")
+@click.option("--batch-threads", type=int, default=None,
+              help="Additionally solves all instances with one batch call on this many threads (0 for one per core), "
+                   "and prints the throughput.")
+def benchmark_instances(instance_folder, outfile, library, pattern, repeats, only_min, search_threads, batch_threads):
     instance_files = glob.glob(os.path.join(instance_folder, pattern))
     print(f"Running {len(instance_files)} benchmarks..")
-    benchmark_results = [benchmark(library, repeats, instance_file=filename) for filename in instance_files]
+    benchmark_results = [benchmark(library, repeats, instance_file=filename, num_threads=search_threads)
+                         for filename in instance_files]
     result = {name: value for name, value in benchmark_results}
+    if batch_threads is not None:
+        batch_time = min(benchmark_batch(library, repeats, instance_files, batch_threads))
+        print(f"Batch: {len(instance_files)} instances in {batch_time:.3f}s, "
+              f"{len(instance_files) / batch_time:.1f} instances/s")
     if only_min:
         result = {case_name: [min(values)] for case_name, values in result.items()}
     _write_csv(result, outfile)
 
 
-def benchmark(library, repeats, instance_file):
-    """ Runs the benchmark for the given test case.
+def benchmark(library, repeats, instance_file, num_threads=1):
+    """ Runs the benchmark for the given test case, with num_threads threads per search.
 
     Reports <repeat> runs in seconds.
     """
     board, piece, name = _create_board_from_instance_file(instance_file)
     print(f"Running benchmark {name}..")
-    optimizer = external.ExternalLibraryBinding(library, board, piece)
+    optimizer = external.ExternalLibraryBinding(library, board, piece, num_threads=num_threads)
     return name, timeit.Timer(optimizer.find_optimal_action).repeat(repeats, 1)
 
 
+def benchmark_batch(library, repeats, instance_files, num_threads):
+    """ Runs all test cases with one library call.
+
+    Reports <repeat> runs in seconds.
+    """
+    instances = [external.SearchInstance.from_board(board, piece)
+                 for board, piece, _ in map(_create_board_from_instance_file, instance_files)]
+    print(f"Running batch of {len(instances)} instances..")
+    optimizer = external.ExternalLibraryBinding(library)
+    return timeit.Timer(lambda: optimizer.find_actions(instances, num_threads)).repeat(repeats, 1)
+
+
 def _create_board_from_instance_file(filename):
     board, instance_name = serialization.deserialize_instance_json(filename)
     return board, board.pieces[0], instance_name
@@ -19,6 +19,7 @@ import matplotlib.pyplot as plt
 
 from labyrinth.model.game import BoardLocation, Piece
 from labyrinth.model import factories
+import labyrinth.model.external_library as external
 from exhsearch import optimizers
 
 
@@ -38,6 +39,14 @@ def determine_exhsearch_depths(board, library_path):
     return len(actions) // 2
 
 
+def determine_exhsearch_depths_batch(boards, library_path, num_threads=0):
+    """ Determines the depths of many boards with one library call, which solves the boards in parallel.
+    The depth of a board is the search depth at which the library has found a solution. """
+    binding = external.ExternalLibraryBinding(library_path)
+    instances = [external.SearchInstance.from_board(board, board.pieces[0]) for board in boards]
+    return [status["current_search_depth"] for _, status in binding.find_actions(instances, num_threads)]
+
+
 @click.group()
 def cli():
     pass
@@ -50,15 +59,19 @@ def cli():
 @click.option("--runs", default=1000, show_default=True)
 @click.option("--library", required=True)
 @click.option("--append/--newfile", "append_outfile", default=False, show_default=True)
-def count(maze_sizes, runs, outfile, library, append_outfile):
+@click.option("--threads", "num_threads", default=0, show_default=True,
+              help="Number of threads solving the boards of a batch, 0 for one per core.")
+@click.option("--batch-size", default=64, show_default=True, help="Number of boards solved with one library call.")
+def count(maze_sizes, runs, outfile, library, append_outfile, num_threads, batch_size):
     start = time.time()
     new_file = not append_outfile
     for maze_size in maze_sizes:
         result = []
         print(f"Determining {runs} depths for maze size {maze_size}.")
-        for _ in trange(runs):
-            depth = determine_exhsearch_depths(generate_board(maze_size), library)
-            result.append({"mazesize": maze_size, "depth": depth})
+        for batch_start in trange(0, runs, batch_size):
+            boards = [generate_board(maze_size) for _ in range(min(batch_size, runs - batch_start))]
+            for depth in determine_exhsearch_depths_batch(boards, library, num_threads):
+                result.append({"mazesize": maze_size, "depth": depth})
         write_csv(result, outfile, new_file)
         new_file = False
     end = time.time()
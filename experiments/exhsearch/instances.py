@@ -6,11 +6,16 @@ New instances can be generated with
 Try
     python instances.py --help
 for further instructions
+
+Boards which are symmetric to an already generated board (see labyrinth.model.symmetry) are skipped,
+as they are equally hard to solve.
 """
 
 import click
 from tqdm import tqdm
 
+from labyrinth.model.symmetry import canonical_form
+
 from exhsearch import depths as exhsearch_depths
 import serialization
 
@@ -26,17 +31,23 @@ import serialization
 @click.option("--json/--nojson", "json", default=True)
 @click.option("--text/--notext", "text", default=False,
               help="serializes instances as text. This is helpful for ecosystems without built-in json support.")
-def run(depths_by_size, num_instances, outfolder, library, json, text):
+@click.option("--threads", "num_threads", default=0, show_default=True,
+              help="Number of threads solving the boards of a batch, 0 for one per core.")
+@click.option("--batch-size", default=64, show_default=True, help="Number of boards solved with one library call.")
+def run(depths_by_size, num_instances, outfolder, library, json, text, num_threads, batch_size):
     maze_sizes = {size for size, depth in depths_by_size}
     for maze_size in maze_sizes:
         depths = {depth for size, depth in depths_by_size if size == maze_size}
         print(f"generating instances for maze size {maze_size}")
         pbar = tqdm(total=len(depths)*num_instances)
         still_required = {depth: num_instances for depth in depths}
+        generated = set()
         while still_required:
-            board = exhsearch_depths.generate_board(maze_size)
-            depth = exhsearch_depths.determine_exhsearch_depths(board, library)
-            if depth in still_required:
+            boards = _generate_distinct_boards(maze_size, batch_size, generated)
+            board_depths = exhsearch_depths.determine_exhsearch_depths_batch(boards, library, num_threads)
+            for board, depth in zip(boards, board_depths):
+                if depth not in still_required:
+                    continue
                 if json:
                     serialize_instance_json(board, depth, still_required[depth], outfolder)
                 if text:
@@ -48,6 +59,19 @@ def run(depths_by_size, num_instances, outfolder, library, json, text):
         pbar.close()
 
 
+def _generate_distinct_boards(maze_size, number, generated):
+    """ Generates boards which are not symmetric to each other, nor to boards generated before.
+    generated is the set of canonical hashes of the boards generated before, and is updated. """
+    boards = []
+    while len(boards) < number:
+        board = exhsearch_depths.generate_board(maze_size)
+        canonical_hash, _ = canonical_form(board)
+        if canonical_hash not in generated:
+            generated.add(canonical_hash)
+            boards.append(board)
+    return boards
+
+
 def serialize_instance_json(board, depth, number, outfolder):
     maze_size = board.maze.maze_size
     instance_name = f"exhsearch_s{maze_size}_d{depth}_num{number}"
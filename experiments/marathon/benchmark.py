@@ -0,0 +1,115 @@
+""" This module benchmarks per-turn costs of the backend for large maze sizes.
+
+For each maze size, it measures the model operations of a turn (shift, move validation),
+the serialization of the game state, and the latency of the state, shift and move API requests.
+Invoke e.g. with
+
+    python benchmark.py --outfile marathon.csv --sizes 31,51,101
+"""
+import csv
+import json
+import os
+import random
+import tempfile
+import timeit
+
+import click
+
+import labyrinth.model.factories as factory
+import labyrinth.mapper.api as api_mapper
+import labyrinth.mapper.persistence as persistence_mapper
+from labyrinth import create_app
+from labyrinth.model.game import Player
+
+
+@click.command()
+@click.option("--outfile", required=True)
+@click.option("--sizes", default="31,51,101", help="Maze sizes, comma-separated.")
+@click.option("--repeats", default=20)
+def benchmark_sizes(outfile, sizes, repeats):
+    sizes = [int(size) for size in sizes.split(",")]
+    results = {}
+    for size in sizes:
+        print(f"Running benchmark for size {size}..")
+        results[size] = {**benchmark_model(size, repeats), **benchmark_requests(size, repeats)}
+    _write_csv(results, outfile)
+
+
+def benchmark_model(size, repeats):
+    """ Measures model operations and serialization of a game with the given maze size.
+
+    Reports the minimum of <repeat> runs in seconds.
+    """
+    game = factory.create_game(maze_size=size, with_delay=False)
+    game.add_player(Player(0))
+    board = game.board
+    piece = board.pieces[0]
+
+    def shift():
+        board.fork().shift(random.choice(sorted(board.shift_locations, key=str)), 90)
+
+    def validate_move():
+        source = board.maze.maze_card_location(piece.maze_card)
+        target = random.choice(sorted(board.reachable_locations(source), key=str))
+        board.find_path(source, target)
+
+    def state_to_json():
+        json.dumps(api_mapper.game_state_to_dto(game, remaining=game.turns.prepare_delay))
+
+    def persist_and_load():
+        persistence_mapper.dto_to_game(json.loads(json.dumps(persistence_mapper.game_to_dto(game))))
+
+    operations = {"shift": shift, "move_validation": validate_move,
+                  "state_serialization": state_to_json, "persistence_round_trip": persist_and_load}
+    return {name: min(timeit.Timer(operation).repeat(repeats, 1)) for name, operation in operations.items()}
+
+
+def benchmark_requests(size, repeats):
+    """ Measures the latency of the state, shift and move API requests for a game with the given maze size.
+
+    Reports the minimum of <repeat> runs in seconds.
+    """
+    file_descriptor, db_path = tempfile.mkstemp()
+    app = create_app({"TESTING": True, "DATABASE": db_path, "OVERDUE_PLAYER_TIMEDELTA_S": 3600})
+    client = app.test_client()
+    try:
+        player_id = client.post("/api/games/0/players").get_json()["id"]
+        client.put("/api/games/0", data=json.dumps({"mazeSize": size}), mimetype="application/json")
+        return {
+            "get_state_request": min(timeit.Timer(lambda: client.get("/api/games/0/state")).repeat(repeats, 1)),
+            "shift_and_move_request": min(_time_turn(client, player_id) for _ in range(repeats))
+        }
+    finally:
+        os.close(file_descriptor)
+        os.unlink(db_path)
+
+
+def _time_turn(client, player_id):
+    """ Performs one shift and one move of the single player, returns the accumulated latency of both requests """
+    state = client.get("/api/games/0/state").get_json()
+    shift_location = random.choice(state["enabledShiftLocations"])
+    shift = json.dumps({"location": shift_location, "leftoverRotation": 0})
+    elapsed = timeit.Timer(lambda: client.post(f"/api/games/0/shift?p_id={player_id}", data=shift,
+                                               mimetype="application/json")).timeit(1)
+    piece_card_id = state["players"][0]["mazeCardId"]
+    location = next(card["location"] for card in client.get("/api/games/0/state").get_json()["maze"]["mazeCards"]
+                    if card["id"] == piece_card_id and card["location"])
+    move = json.dumps({"location": location})
+    elapsed += timeit.Timer(lambda: client.post(f"/api/games/0/move?p_id={player_id}", data=move,
+                                                mimetype="application/json")).timeit(1)
+    return elapsed
+
+
+def _write_csv(results, outfile):
+    with open(outfile, "w", newline='') as csvfile:
+        fieldnames = ["size"] + [f"{name}[s]" for name in next(iter(results.values()))]
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for size, timings in results.items():
+            out_dict = {f"{name}[s]": value for name, value in timings.items()}
+            out_dict["size"] = size
+            writer.writerow(out_dict)
+
+
+if __name__ == "__main__":
+    benchmark_sizes()